@@ -0,0 +1,64 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+""" Benchmarks of parsing and decoding the responses of the adapters """
+
+import numpy as np
+
+from pymeasure.adapters import FakeAdapter
+from pymeasure.adapters.adapter import parse_values
+from pymeasure.adapters.block import parse_block
+
+
+class ParseValues:
+    params = [1, 10, 1000, 100000]
+    param_names = ['count']
+
+    def setup(self, count):
+        self.response = ",".join("%e" % v for v in np.random.rand(count))
+
+    def time_parse_float(self, count):
+        parse_values(self.response)
+
+    def time_parse_array(self, count):
+        parse_values(self.response, as_array=True)
+
+    def time_adapter_values(self, count):
+        adapter = FakeAdapter()
+        adapter.values(self.response)
+
+
+class ParseBlock:
+    params = [1000, 1000000]
+    param_names = ['count']
+
+    def setup(self, count):
+        data = np.random.rand(count).astype('>f4').tobytes()
+        self.block = b"#%d%d" % (len(str(len(data))), len(data)) + data + b"\n"
+
+    def time_parse_block(self, count):
+        parse_block(self.block, np.float32, is_big_endian=True)
+
+    def peakmem_parse_block(self, count):
+        parse_block(self.block, np.float32, is_big_endian=True)
@@ -0,0 +1,58 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+""" Benchmarks of the plotting of the results, which require Qt """
+
+import os
+import tempfile
+
+from .bench_results import BenchmarkProcedure, records
+
+
+class ResultsCurveUpdate:
+    params = [1000, 100000]
+    param_names = ['count']
+    timeout = 120
+
+    def setup(self, count):
+        try:
+            from pymeasure.display.Qt import QtGui
+            from pymeasure.display.curves import ResultsCurve
+        except ImportError:
+            raise NotImplementedError("Qt and pyqtgraph are not available")
+        from pymeasure.experiment.results import Results
+        self.app = QtGui.QApplication.instance() or QtGui.QApplication([])
+        self.directory = tempfile.TemporaryDirectory()
+        filename = os.path.join(self.directory.name, "results.csv")
+        results = Results(BenchmarkProcedure(), filename)
+        with open(filename, 'a') as f:
+            f.writelines(results.format(record) + Results.LINE_BREAK
+                         for record in records(count))
+        self.curve = ResultsCurve(results, 'Voltage (V)', 'Current (A)')
+
+    def teardown(self, count):
+        self.directory.cleanup()
+
+    def time_update(self, count):
+        self.curve.update()
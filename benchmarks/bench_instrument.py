@@ -0,0 +1,120 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+""" Benchmarks of the overhead of the instrument properties, against the
+:class:`FakeAdapter<pymeasure.adapters.FakeAdapter>`, which echoes the
+value that is set when it is read
+"""
+
+import numpy as np
+
+from pymeasure.adapters import FakeAdapter
+from pymeasure.instruments import Instrument
+from pymeasure.instruments.validators import (strict_discrete_set,
+                                              strict_range,
+                                              truncated_discrete_set)
+
+
+class FakeSource(Instrument):
+    voltage = Instrument.control(
+        "", "%g", "Voltage",
+        validator=strict_range, values=[-10, 10]
+    )
+    mode = Instrument.control(
+        "", "%s", "Mode",
+        validator=strict_discrete_set,
+        values={'voltage': 'VOLT', 'current': 'CURR'}, map_values=True
+    )
+
+    def __init__(self):
+        super().__init__(FakeAdapter(), "Fake source", includeSCPI=False)
+
+
+class Control:
+
+    def setup(self):
+        self.source = FakeSource()
+
+    def time_set_get(self):
+        self.source.voltage = 1.5
+        self.source.voltage
+
+    def time_set_get_mapped(self):
+        self.source.mode = 'current'
+        self.source.mode
+
+    def time_write(self):
+        self.source.write("VOLT 1")
+        self.source.read()
+
+
+class ConstantSource(FakeSource):
+    """ Returns a constant response without an adapter, so that only the
+    overhead of the properties is measured
+    """
+
+    def values(self, command, **kwargs):
+        return ['VOLT']
+
+    def write(self, command):
+        pass
+
+
+class PropertyOverhead:
+
+    def setup(self):
+        self.source = ConstantSource()
+
+    def time_get(self):
+        self.source.voltage
+
+    def time_get_mapped(self):
+        self.source.mode
+
+    def time_set(self):
+        self.source.voltage = 1.5
+
+    def time_set_mapped(self):
+        self.source.mode = 'current'
+
+
+class LargeDiscreteSet:
+    """ Setting a property of 650 discrete values, as the delay time of
+    the Agilent 4156
+    """
+
+    def setup(self):
+        class Source(ConstantSource):
+            delay = Instrument.control(
+                "", "%g", "Delay",
+                validator=truncated_discrete_set,
+                values=np.arange(0, 65.1, 0.1)
+            )
+        self.source = Source()
+
+    def time_set(self):
+        self.source.delay = 12.34
+
+    def time_validator(self):
+        truncated_discrete_set(12.34, self.source.__class__.delay.values)
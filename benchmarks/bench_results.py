@@ -0,0 +1,88 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+""" Benchmarks of writing, appending and reloading the results """
+
+import os
+import tempfile
+
+import numpy as np
+
+from pymeasure.experiment import Procedure, IntegerParameter
+from pymeasure.experiment.results import Results, CSVFormatter
+
+
+class BenchmarkProcedure(Procedure):
+    iterations = IntegerParameter("Iterations", default=100)
+    DATA_COLUMNS = ['Iteration', 'Voltage (V)', 'Current (A)', 'Resistance (Ohm)']
+
+
+def records(count):
+    values = np.random.rand(count, 3)
+    return [dict(zip(BenchmarkProcedure.DATA_COLUMNS, [i] + list(v)))
+            for i, v in enumerate(values)]
+
+
+class Formatter:
+
+    def setup(self):
+        self.formatter = CSVFormatter(BenchmarkProcedure.DATA_COLUMNS)
+        self.records = records(1000)
+
+    def time_format(self):
+        for record in self.records:
+            self.formatter.format(record)
+
+
+class ResultsFile:
+    params = [1000, 100000]
+    param_names = ['count']
+    timeout = 120
+    number = 1  # The file is prepared again for each sample
+
+    def setup(self, count):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "results.csv")
+        self.results = Results(BenchmarkProcedure(), self.filename)
+        self.lines = [self.results.format(record) + Results.LINE_BREAK
+                      for record in records(count)]
+        half = count // 2
+        with open(self.filename, 'a') as f:
+            f.writelines(self.lines[:half])
+        self.results.data  # Loads the first half
+        self.remainder = self.lines[half:]
+
+    def teardown(self, count):
+        self.directory.cleanup()
+
+    def time_append(self, count):
+        with open(self.filename, 'a') as f:
+            f.writelines(self.remainder)
+        self.results.data
+
+    def time_reload(self, count):
+        self.results.reload()
+
+    def time_load(self, count):
+        Results.load(self.filename, BenchmarkProcedure)
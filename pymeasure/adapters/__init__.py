@@ -22,24 +22,56 @@
 # THE SOFTWARE.
 #
 import logging
+import sys
+from importlib import import_module
 
 from .adapter import Adapter, FakeAdapter
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-try:
-    from pymeasure.adapters.visa import VISAAdapter
-except ImportError:
-    log.warning("PyVISA library could not be loaded")
-
-try:
-    from pymeasure.adapters.serial import SerialAdapter
-    from pymeasure.adapters.prologix import PrologixAdapter
-except ImportError:
-    log.warning("PySerial library could not be loaded")
-
-try:
-    from pymeasure.adapters.vxi11 import VXI11Adapter
-except ImportError:
-    log.warning("VXI-11 library could not be loaded")
+# Modules of the adapters, which are imported on first use, since their
+# backends are optional and slow to import
+_modules = {
+    'SocketAdapter': '.socket',
+    'RecordingAdapter': '.replay',
+    'ReplayAdapter': '.replay',
+    'AsyncAdapter': '.aio',
+    'AsyncAdapterError': '.aio',
+    'ThreadedAsyncAdapter': '.aio',
+    'AsyncSocketAdapter': '.aio',
+    'AsyncSerialAdapter': '.aio',
+    'AsyncVISAAdapter': '.aio',
+    'VISAAdapter': '.visa',
+    'SerialAdapter': '.serial',
+    'PrologixAdapter': '.prologix',
+    'VXI11Adapter': '.vxi11',
+}
+
+
+def __getattr__(name):
+    if name not in _modules:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    try:
+        module = import_module(_modules[name], __name__)
+    except ImportError as error:
+        # An AttributeError lets hasattr and getattr with a default work,
+        # when the backend of the adapter is not installed
+        raise AttributeError("module %r has no attribute %r, since %s" % (
+            __name__, name, error)) from error
+    adapter = getattr(module, name)
+    globals()[name] = adapter
+    return adapter
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_modules))
+
+
+if sys.version_info < (3, 7):
+    # Module attributes can only be loaded on demand since Python 3.7
+    for _name in _modules:
+        try:
+            __getattr__(_name)
+        except AttributeError:
+            log.warning("%s could not be loaded", _name)
@@ -22,8 +22,95 @@
 # THE SOFTWARE.
 #
 
+import threading
+import time
+from contextlib import contextmanager
+from weakref import WeakKeyDictionary
+
 import numpy as np
-from copy import copy
+
+from . import stats as _stats
+
+
+# Responses with fewer separators are faster to parse element by element
+VECTORIZED_THRESHOLD = 16
+
+# Reentrant locks of the connections, which may be shared by several adapters
+_locks = WeakKeyDictionary()
+_locks_lock = threading.Lock()
+
+
+def parse_values(response, separator=',', cast=float, as_array=False):
+    """ Splits an ASCII response into a list of formatted values, which
+    is shared by the adapters that implement :meth:`Adapter.values`
+
+    When :code:`cast` is float, long responses are parsed by NumPy in a
+    single pass. The values are parsed element by element only if one of
+    them can not be cast. Integers are always parsed element by element,
+    since NumPy would clamp those that exceed 64 bits.
+
+    :param response: String ASCII response of the instrument
+    :param separator: A separator character to split the string into a list
+    :param cast: A type to cast the result
+    :param as_array: If True, a NumPy array is returned when all the values
+                     could be cast
+    :returns: A list of the desired type, or strings where the casting fails
+    """
+    if cast is float and separator and not separator.isspace():
+        count = response.count(separator) + 1
+        if as_array or count > VECTORIZED_THRESHOLD:
+            try:
+                results = np.fromstring(response, dtype=np.float64, sep=separator)
+            except ValueError:
+                results = None  # A token could not be parsed
+            # Older NumPy versions return the values up to a failing token
+            if results is not None and len(results) == count:
+                return results if as_array else results.tolist()
+    results = response.split(separator)
+    cast_all = True
+    for i, result in enumerate(results):
+        try:
+            if cast == bool:
+                # Need to cast to float first since results are usually
+                # strings and bool of a non-empty string is always True
+                results[i] = bool(float(result))
+            else:
+                results[i] = cast(result)
+        except Exception:
+            cast_all = False  # Keep as string
+    if as_array and cast_all and cast is int:
+        # Integers beyond 64 bits are kept in an array of objects
+        return np.array(results)
+    return results
+
+
+def wait_until(check, timeout=60, should_stop=lambda: False,
+               interval=0.001, max_interval=0.1):
+    """ Calls a function until it returns a true value, with an interval
+    that starts short and doubles up to a maximum, so that quick events
+    are detected with a low latency while long waits query rarely.
+
+    :param check: A function that returns a true value when the wait is over
+    :param timeout: A time in seconds after which a TimeoutError is raised
+    :param should_stop: A function that returns True when this function
+                        should return early
+    :param interval: The first interval in seconds between the calls
+    :param max_interval: The longest interval in seconds between the calls
+    :returns: The true value of the check, or None if stopped early
+    :raises: TimeoutError if the timeout is reached
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        result = check()
+        if result:
+            return result
+        if should_stop():
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Timed out after %g s" % timeout)
+        time.sleep(min(interval, remaining))
+        interval = min(2 * interval, max_interval)
 
 
 class Adapter(object):
@@ -32,8 +119,64 @@ class Adapter(object):
     techniques.
 
     This class should only be inhereted from.
+
+    Queries are atomic across threads, since :meth:`ask`, :meth:`values` and
+    :meth:`binary_values` hold the :attr:`lock` of the connection. Several
+    commands are made atomic with :meth:`locked`.
     """
 
+    stats = None
+
+    @property
+    def lock(self):
+        """ Reentrant lock of the connection, which is shared by the adapters
+        of the same :code:`connection` object
+        """
+        lock = self.__dict__.get('_lock')
+        if lock is None:
+            with _locks_lock:
+                lock = self.__dict__.get('_lock')
+                if lock is None:
+                    connection = getattr(self, 'connection', None)
+                    try:
+                        lock = _locks.setdefault(connection, threading.RLock())
+                    except TypeError:
+                        # Without a connection that can be shared
+                        lock = threading.RLock()
+                    self._lock = lock
+        return lock
+
+    @contextmanager
+    def locked(self):
+        """ Holds the lock of the connection, so that the commands in the
+        block are not interleaved with those of other threads
+
+        .. code-block:: python
+
+            with adapter.locked():
+                adapter.write("TRIG")
+                data = adapter.values("FETCH?")
+        """
+        with self.lock:
+            yield self
+
+    def enable_stats(self):
+        """ Starts recording the call count, bytes and latency of each
+        command, and returns the :class:`AdapterStats
+        <pymeasure.adapters.stats.AdapterStats>`, which is also available
+        as :attr:`stats`. Recording continues until :meth:`disable_stats`.
+
+        :returns: AdapterStats of this adapter
+        """
+        if self.stats is None:
+            self.stats = _stats.AdapterStats(self)
+        return self.stats
+
+    def disable_stats(self):
+        """ Stops recording the I/O statistics """
+        _stats.disable_stats(self)
+        self.stats = None
+
     def write(self, command):
         """ Writes a command to the instrument
 
@@ -48,8 +191,9 @@ class Adapter(object):
         :param command: SCPI command string to be sent to the instrument
         :returns: String ASCII response of the instrument
         """
-        self.write(command)
-        return self.read()
+        with self.lock:
+            self.write(command)
+            return self.read()
 
     def read(self):
         """ Reads until the buffer is empty and returns the resulting
@@ -59,36 +203,66 @@ class Adapter(object):
         """
         raise NameError("Adapter (sub)class has not implemented reading")
 
-    def values(self, command, separator=',', cast=float):
+    def read_stb(self):
+        """ Returns the status byte of the instrument, which is queried with
+        :code:`*STB?` unless the connection supports a serial poll
+        """
+        return int(self.ask("*STB?"))
+
+    def wait_for_event(self, mask, timeout=60, should_stop=lambda: False,
+                       register=None, max_interval=0.1):
+        """ Blocks until any bit of the mask is set in the status byte, or in
+        another register of the instrument. Adapters use service requests
+        where the connection supports them, so that the bits of the mask must
+        be enabled with :code:`*SRE`. Otherwise the register is polled, with
+        an interval that starts at 1 ms and doubles up to :code:`max_interval`.
+
+        :param mask: Integer mask of the bits that signal the event
+        :param timeout: A time in seconds after which a TimeoutError is raised
+        :param should_stop: A function that returns True when this function
+                            should return early
+        :param register: A function that returns the value of the register,
+                         or None for the status byte
+        :param max_interval: The longest time in seconds between two polls
+        :returns: The value of the register, or None if stopped early
+        :raises: TimeoutError if the timeout is reached
+        """
+        read = register or self.read_stb
+
+        def check():
+            value = read()
+            return value if value & mask else None
+
+        return wait_until(check, timeout, should_stop, max_interval=max_interval)
+
+    def values(self, command, separator=',', cast=float, as_array=False):
         """ Writes a command to the instrument and returns a list of formatted
         values from the result 
 
         :param command: SCPI command to be sent to the instrument
         :param separator: A separator character to split the string into a list
         :param cast: A type to cast the result
+        :param as_array: If True, a NumPy array is returned when all the values
+                         could be cast
         :returns: A list of the desired type, or strings where the casting fails
         """
-        results = str(self.ask(command)).strip()
-        results = results.split(separator)
-        for i, result in enumerate(results):
-            try:
-                if cast == bool:
-                    # Need to cast to float first since results are usually
-                    # strings and bool of a non-empty string is always True
-                    results[i] = bool(float(result))
-                else:
-                    results[i] = cast(result)
-            except Exception:
-                pass  # Keep as string
-        return results
-
-    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+        with self.lock:
+            results = str(self.ask(command)).strip()
+        return parse_values(results, separator, cast, as_array)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
         """ Returns a numpy array from a query for binary data 
 
         :param command: SCPI command to be sent to the instrument
         :param header_bytes: Integer number of bytes to ignore in header
         :param dtype: The NumPy data type to format the values with
-        :returns: NumPy array of values
+        :param ieee_header: If True, the response is parsed as an IEEE 488.2
+                            block (:code:`#<n><length>` or :code:`#0`), so that
+                            :code:`header_bytes` is not required
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: NumPy array of values, which references the received data
         """
         raise NameError("Adapter (sub)class has not implemented the "
                         "binary_values method")
@@ -111,22 +285,27 @@ class FakeAdapter(Adapter):
 
     """
 
-    _buffer = ""
+    # Commands are joined when read, so that long sessions stay linear. The
+    # list is created by the first write, also in subclasses that do not
+    # call this constructor.
+    _buffer = ()
 
     def read(self):
         """ Returns the last commands given after the
         last read call.
         """
-        result = copy(self._buffer)
+        result = "".join(self._buffer)
         # Reset the buffer
-        self._buffer = ""
+        self._buffer = []
         return result
 
     def write(self, command):
         """ Writes the command to a buffer, so that it can
         be read back.
         """
-        self._buffer += command
+        if not self._buffer:
+            self._buffer = []
+        self._buffer.append(command)
 
     def __repr__(self):
         return "<FakeAdapter>"
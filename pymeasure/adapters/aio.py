@@ -0,0 +1,423 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import asyncio
+import logging
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .adapter import Adapter, parse_values
+from .block import (block_dtype, block_header_size, parse_block_header,
+                    parse_block)
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class AsyncAdapterError(Exception):
+    """ Raised by :meth:`AsyncAdapter.flush` if several of the scheduled
+    operations failed, which are listed in :attr:`errors` """
+
+    def __init__(self, errors):
+        super().__init__("%d operations failed: %s" % (
+            len(errors), "; ".join(repr(e) for e in errors)))
+        self.errors = errors
+
+
+class AsyncAdapter(object):
+    """ Base class for asynchronous adapters, which allow the I/O of
+    several instruments to overlap in an :mod:`asyncio` event loop.
+
+    Each method schedules the operation and immediately returns an
+    :class:`asyncio.Task`, which can be awaited for the result. Operations
+    on the same adapter are always performed in the order in which they
+    were called, so that a write does not need to be awaited before
+    the following query.
+
+    .. code-block:: python
+
+        async def measure(adapters):
+            return await asyncio.gather(*(a.values("READ?") for a in adapters))
+
+    Child classes implement the :code:`_write` and :code:`_read` coroutines,
+    and optionally :code:`_ask`, :code:`_values` and :code:`_binary_values`.
+    """
+
+    _pending = None
+    # Failed tasks and their exceptions since the last flush
+    _failures = ()
+    # Tasks that are scheduled and not yet complete
+    _running = frozenset()
+
+    def write(self, command):
+        """ Schedules a command to be written to the instrument
+
+        :param command: SCPI command string to be sent to the instrument
+        :returns: Task that completes once the command is written
+        """
+        return self._submit(self._write, command)
+
+    def read(self):
+        """ Schedules a read of the instrument response
+
+        :returns: Task resulting in the String ASCII response of the instrument
+        """
+        return self._submit(self._read)
+
+    def ask(self, command):
+        """ Schedules a write of the command followed by a read of the
+        ASCII response
+
+        :param command: SCPI command string to be sent to the instrument
+        :returns: Task resulting in the String ASCII response of the instrument
+        """
+        return self._submit(self._ask, command)
+
+    def values(self, command, separator=',', cast=float, as_array=False):
+        """ Schedules a query and formats the values of the result
+
+        :param command: SCPI command to be sent to the instrument
+        :param separator: A separator character to split the string into a list
+        :param cast: A type to cast the result
+        :param as_array: If True, a NumPy array is returned when all the values
+                         could be cast
+        :returns: Task resulting in a list of the desired type, or strings
+                  where the casting fails
+        """
+        return self._submit(self._values, command, separator, cast, as_array)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
+        """ Schedules a query for binary data
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore in header
+        :param dtype: The NumPy data type to format the values with
+        :param ieee_header: If True, the response is parsed as an IEEE 488.2
+                            block, so that :code:`header_bytes` is not required
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: Task resulting in a NumPy array of values
+        """
+        return self._submit(self._binary_values, command, header_bytes, dtype,
+                            ieee_header, is_big_endian)
+
+    async def flush(self):
+        """ Waits until all the scheduled operations are complete, and
+        raises the errors of the operations that failed since the previous
+        flush and were never awaited.
+
+        :raises: The exception of the failed operation, or an
+                 :class:`AsyncAdapterError` listing them if several failed
+        """
+        while self._running:
+            await asyncio.wait(list(self._running))
+        failures, self._failures = self._failures, ()
+        errors = []
+        for task, error in failures:
+            # asyncio clears this flag once the exception of a task is
+            # retrieved, by awaiting it or by calling result or exception
+            if getattr(task, '_log_traceback', True):
+                task.exception()  # Reported here instead
+                errors.append(error)
+        if len(errors) == 1:
+            raise errors[0]
+        if errors:
+            raise AsyncAdapterError(errors) from errors[0]
+
+    async def close(self):
+        """ Waits for the scheduled operations and closes the connection """
+        if self._pending is not None:
+            await asyncio.wait([self._pending])
+
+    def track(self, coroutine):
+        """ Schedules a coroutine that uses the adapter, such as the error
+        check of an instrument. If it fails and is never awaited, its
+        exception is raised by :meth:`flush`.
+
+        :param coroutine: The coroutine to schedule
+        :returns: Task of the coroutine
+        """
+        task = None
+
+        async def run():
+            try:
+                return await coroutine
+            except Exception as e:
+                self._failures += ((task, e),)
+                raise
+            finally:
+                self._running = self._running - {task}
+
+        task = asyncio.ensure_future(run())
+        self._running = self._running | {task}
+        return task
+
+    def _submit(self, function, *args):
+        previous = self._pending
+
+        async def run():
+            if previous is not None and not previous.done():
+                # Wait for the preceding operation, regardless of its outcome
+                await asyncio.wait([previous])
+            return await function(*args)
+
+        self._pending = self.track(run())
+        return self._pending
+
+    async def run_blocking(self, function):
+        """ Runs a synchronous function in a worker thread, which receives
+        a blocking adapter whose operations are scheduled on this adapter.
+        This lets synchronous driver code, such as the error check of an
+        instrument, communicate in order with the asynchronous operations.
+
+        :param function: A function of a synchronous adapter
+        :returns: The result of the function
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, function, BlockingAdapter(self, loop))
+
+    async def _write(self, command):
+        raise NameError("AsyncAdapter (sub)class has not implemented writing")
+
+    async def _read(self):
+        raise NameError("AsyncAdapter (sub)class has not implemented reading")
+
+    async def _ask(self, command):
+        await self._write(command)
+        return await self._read()
+
+    async def _values(self, command, separator, cast, as_array):
+        results = str(await self._ask(command)).strip()
+        return parse_values(results, separator, cast, as_array)
+
+    async def _binary_values(self, command, header_bytes, dtype,
+                             ieee_header, is_big_endian):
+        raise NameError("AsyncAdapter (sub)class has not implemented the "
+                        "binary_values method")
+
+
+class BlockingAdapter(Adapter):
+    """ Synchronous view of an :class:`AsyncAdapter` for another thread than
+    that of the event loop, which schedules each operation on the
+    asynchronous adapter and waits for its result.
+    This is used by :meth:`AsyncAdapter.run_blocking`.
+
+    :param adapter: The asynchronous adapter
+    :param loop: The event loop of the adapter
+    """
+
+    def __init__(self, adapter, loop):
+        self.adapter = adapter
+        self.loop = loop
+
+    def __repr__(self):
+        return "<BlockingAdapter(adapter=%r)>" % self.adapter
+
+    def _call(self, name, *args):
+        async def call():
+            return await getattr(self.adapter, name)(*args)
+        return asyncio.run_coroutine_threadsafe(call(), self.loop).result()
+
+    def write(self, command):
+        self._call('write', command)
+
+    def read(self):
+        return self._call('read')
+
+    def ask(self, command):
+        return self._call('ask', command)
+
+    def values(self, command, separator=',', cast=float, as_array=False):
+        return self._call('values', command, separator, cast, as_array)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
+        return self._call('binary_values', command, header_bytes, dtype,
+                          ieee_header, is_big_endian)
+
+
+class ThreadedAsyncAdapter(AsyncAdapter):
+    """ Provides an :class:`AsyncAdapter` for a blocking
+    :class:`Adapter<pymeasure.adapters.Adapter>`, by performing its calls
+    in a worker thread dedicated to that adapter. This is used for
+    backends that do not provide non-blocking I/O, such as PySerial
+    and PyVISA.
+
+    :param adapter: The blocking :class:`Adapter<pymeasure.adapters.Adapter>`
+    """
+
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def __repr__(self):
+        return "<ThreadedAsyncAdapter(adapter=%r)>" % self.adapter
+
+    async def close(self):
+        """ Waits for the scheduled operations and stops the worker thread """
+        await super().close()
+        self.executor.shutdown(wait=False)
+
+    def _call(self, function, *args):
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(self.executor, function, *args)
+
+    async def _write(self, command):
+        await self._call(self.adapter.write, command)
+
+    async def _read(self):
+        return await self._call(self.adapter.read)
+
+    async def _ask(self, command):
+        return await self._call(self.adapter.ask, command)
+
+    async def _values(self, command, separator, cast, as_array):
+        return await self._call(self.adapter.values, command, separator, cast,
+                                as_array)
+
+    async def _binary_values(self, command, header_bytes, dtype,
+                             ieee_header, is_big_endian):
+        return await self._call(self.adapter.binary_values, command,
+                                header_bytes, dtype, ieee_header, is_big_endian)
+
+
+class AsyncSerialAdapter(ThreadedAsyncAdapter):
+    """ Asynchronous version of the
+    :class:`SerialAdapter<pymeasure.adapters.SerialAdapter>`
+
+    :param port: Serial port
+    :param kwargs: Any valid key-word argument for serial.Serial
+    """
+
+    def __init__(self, port, **kwargs):
+        from .serial import SerialAdapter
+        super().__init__(SerialAdapter(port, **kwargs))
+
+    def __repr__(self):
+        return "<AsyncSerialAdapter(port='%s')>" % self.adapter.connection.port
+
+
+class AsyncVISAAdapter(ThreadedAsyncAdapter):
+    """ Asynchronous version of the
+    :class:`VISAAdapter<pymeasure.adapters.VISAAdapter>`
+
+    :param resourceName: VISA resource name that identifies the address
+    :param kwargs: Any valid key-word arguments for the VISAAdapter
+    """
+
+    def __init__(self, resourceName, **kwargs):
+        from .visa import VISAAdapter
+        super().__init__(VISAAdapter(resourceName, **kwargs))
+
+    def __repr__(self):
+        return "<AsyncVISAAdapter(resource='%s')>" % self.adapter.resource_name
+
+
+class AsyncSocketAdapter(AsyncAdapter):
+    """ Asynchronous adapter for instruments that accept SCPI commands
+    over a raw TCP socket, using :mod:`asyncio` streams. The connection
+    is opened by the first operation.
+
+    :param host: Host name or IP address of the instrument
+    :param port: TCP port of the instrument
+    :param read_termination: String that terminates the instrument responses
+    :param write_termination: String appended to each command
+    :param timeout: Timeout in seconds for connecting and reading
+    """
+
+    def __init__(self, host, port=5025, read_termination="\n",
+                 write_termination="\n", timeout=10):
+        self.host = host
+        self.port = port
+        self.read_termination = read_termination
+        self.write_termination = write_termination
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+
+    def __repr__(self):
+        return "<AsyncSocketAdapter(host='%s',port=%d)>" % (self.host, self.port)
+
+    async def close(self):
+        """ Waits for the scheduled operations and closes the connection """
+        await super().close()
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+    async def _connect(self):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout)
+            connection = self._writer.get_extra_info('socket')
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    async def _write(self, command):
+        await self._connect()
+        self._writer.write((command + self.write_termination).encode())
+        await self._writer.drain()
+
+    async def _read(self):
+        termination = self.read_termination.encode()
+        response = await self._read_until(termination)
+        return response[:-len(termination)].decode()
+
+    async def _read_until(self, termination):
+        await self._connect()
+        return await asyncio.wait_for(
+            self._reader.readuntil(termination), self.timeout)
+
+    async def _read_bytes(self, size):
+        await self._connect()
+        return await asyncio.wait_for(
+            self._reader.readexactly(size), self.timeout)
+
+    async def _binary_values(self, command, header_bytes, dtype,
+                             ieee_header, is_big_endian):
+        await self._write(command)
+        dtype = block_dtype(dtype, is_big_endian)
+        if not ieee_header:
+            termination = self.read_termination.encode()
+            response = await self._read_until(termination)
+            size = len(response) - len(termination) - header_bytes
+            while size <= 0 or size % dtype.itemsize:
+                # The termination was part of the data, which continues
+                response += await self._read_until(termination)
+                size = len(response) - len(termination) - header_bytes
+            return np.frombuffer(response, dtype=dtype, offset=header_bytes,
+                                 count=size // dtype.itemsize)
+        prefix = await self._read_bytes(2)
+        size = block_header_size(prefix)
+        if size == 2:
+            data = await self._read_until(self.read_termination.encode())
+            return parse_block(b"#0" + data, dtype,
+                               termination=self.read_termination)
+        _, length = parse_block_header(prefix + await self._read_bytes(size - 2))
+        data = await self._read_bytes(length)
+        await self._read_bytes(len(self.read_termination))
+        return np.frombuffer(data, dtype=dtype)
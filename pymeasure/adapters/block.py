@@ -0,0 +1,163 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+""" Decoding of IEEE 488.2 binary blocks, which is shared by the adapters.
+
+A definite length block starts with :code:`#`, a digit *n* and *n* digits
+that give the number of data bytes, for example :code:`#3512` for 512 bytes.
+An indefinite length block starts with :code:`#0` and ends with the message
+termination. The data is returned as a NumPy array that references the
+received bytes, without copying them.
+"""
+
+import numpy as np
+
+
+def block_dtype(dtype, is_big_endian=None):
+    """ Returns the NumPy data type with the requested byte order
+
+    :param dtype: The NumPy data type to format the values with
+    :param is_big_endian: True for big endian, False for little endian,
+                          or None to keep the byte order of the dtype
+    """
+    dtype = np.dtype(dtype)
+    if is_big_endian is None:
+        return dtype
+    return dtype.newbyteorder('>' if is_big_endian else '<')
+
+
+def _as_bytes(termination):
+    if termination is None or isinstance(termination, bytes):
+        return termination
+    return termination.encode()
+
+
+def block_header_size(prefix):
+    """ Returns the number of bytes in the header of an IEEE 488.2 block
+
+    :param prefix: The first two bytes of the block
+    :raises: ValueError if the bytes do not start a block
+    """
+    prefix = bytes(prefix[:2])
+    if len(prefix) < 2 or prefix[:1] != b"#" or not prefix[1:].isdigit():
+        raise ValueError("Invalid IEEE 488.2 block header %r" % prefix)
+    return 2 + int(prefix[1:])
+
+
+def parse_block_header(data):
+    """ Parses the header at the start of an IEEE 488.2 block
+
+    :param data: Bytes that start with the complete block header
+    :returns: A tuple of the header size and the number of data bytes,
+              which is None for an indefinite length block
+    :raises: ValueError if the header is invalid
+    """
+    size = block_header_size(data)
+    if size == 2:
+        return size, None
+    digits = bytes(data[2:size])
+    if len(digits) < size - 2 or not digits.isdigit():
+        raise ValueError("Invalid IEEE 488.2 block length %r" % digits)
+    return size, int(digits)
+
+
+def _decode(data, offset, length, dtype):
+    if length % dtype.itemsize:
+        raise ValueError("IEEE 488.2 block of %d bytes is not a multiple of "
+                         "the %d byte data type" % (length, dtype.itemsize))
+    return np.frombuffer(data, dtype=dtype, count=length // dtype.itemsize,
+                         offset=offset)
+
+
+def _decode_indefinite(data, offset, dtype, termination):
+    # Indefinite length blocks end with a line feed, unless specified
+    termination = termination or b"\n"
+    end = len(data)
+    if bytes(data[end - len(termination):]) == termination:
+        end -= len(termination)
+    return _decode(data, offset, end - offset, dtype)
+
+
+def parse_block(data, dtype=np.float32, is_big_endian=None, termination=None):
+    """ Returns a NumPy array from a complete IEEE 488.2 block, without
+    copying the data. The array is read-only if :code:`data` is immutable.
+
+    :param data: Bytes-like object containing the block
+    :param dtype: The NumPy data type to format the values with
+    :param is_big_endian: True for big endian, False for little endian,
+                          or None to keep the byte order of the dtype
+    :param termination: Termination that follows the block, where line
+                        feeds and carriage returns are accepted by default
+    :returns: NumPy array of values
+    :raises: ValueError if the header is invalid or the length is wrong
+    """
+    dtype = block_dtype(dtype, is_big_endian)
+    termination = _as_bytes(termination)
+    offset, length = parse_block_header(data)
+    if length is None:
+        return _decode_indefinite(data, offset, dtype, termination)
+    if len(data) < offset + length:
+        raise ValueError("Incomplete IEEE 488.2 block of %d bytes, "
+                         "received %d bytes" % (length, len(data) - offset))
+    trailing = bytes(data[offset + length:])
+    if trailing and trailing != termination and trailing.strip(b"\r\n"):
+        raise ValueError("Unexpected %d bytes after IEEE 488.2 block" %
+                         len(trailing))
+    return _decode(data, offset, length, dtype)
+
+
+def read_block(read_bytes, dtype=np.float32, is_big_endian=None,
+               termination=None, read_until=None):
+    """ Reads an IEEE 488.2 block from a connection and returns a NumPy
+    array that references the received data, without copying it.
+
+    :param read_bytes: A function that reads and returns an exact number of bytes
+    :param dtype: The NumPy data type to format the values with
+    :param is_big_endian: True for big endian, False for little endian,
+                          or None to keep the byte order of the dtype
+    :param termination: Termination that follows the block, which is read
+                        from the connection if it is not None
+    :param read_until: A function that reads up to and including a given
+                       termination, required for indefinite length blocks
+    :returns: NumPy array of values
+    :raises: ValueError if the header is invalid or the data is incomplete
+    """
+    dtype = block_dtype(dtype, is_big_endian)
+    termination = _as_bytes(termination)
+    prefix = read_bytes(2)
+    size = block_header_size(prefix)
+    if size == 2:
+        if read_until is None:
+            raise ValueError("Indefinite length IEEE 488.2 blocks can not be "
+                             "read from this connection")
+        data = read_until(termination or b"\n")
+        return _decode_indefinite(data, 0, dtype, termination)
+    _, length = parse_block_header(prefix + read_bytes(size - 2))
+    data = read_bytes(length)
+    if len(data) != length:
+        raise ValueError("Incomplete IEEE 488.2 block of %d bytes, "
+                         "received %d bytes" % (length, len(data)))
+    if termination:
+        read_bytes(len(termination))
+    return _decode(data, 0, length, dtype)
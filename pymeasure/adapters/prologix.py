@@ -22,11 +22,17 @@
 # THE SOFTWARE.
 #
 import time
+from weakref import WeakKeyDictionary
 
 import serial
+import numpy as np
 
+from .adapter import wait_until
 from .serial import SerialAdapter
 
+# GPIB address that is selected on each shared serial connection
+_addresses = WeakKeyDictionary()
+
 
 class PrologixAdapter(SerialAdapter):
     """ Encapsulates the additional commands necessary
@@ -41,10 +47,19 @@ class PrologixAdapter(SerialAdapter):
     :param port: The Serial port name or a serial.Serial object
     :param address: Integer GPIB address of the desired instrument
     :param rw_delay: An optional delay to set between a write and read call for slow to respond instruments.
+    :param serial_timeout: Timeout in seconds for reading from the serial port
+    :param read_termination: An optional string that terminates the instrument responses, so
+                             that reads return as soon as it is received, such as "\\n" for
+                             instruments that respond in a single line. By default, reads
+                             continue until the serial timeout.
     :param kwargs: Key-word arguments if constructing a new serial object
 
     :ivar address: Integer GPIB address of the desired instrument
 
+    The GPIB address that is selected on a serial connection is tracked,
+    so that the :code:`++addr` command is only sent when an adapter
+    for a different address uses the connection.
+
     To allow user access to the Prologix adapter in Linux, create the file:
     :code:`/etc/udev/rules.d/51-prologix.rules`, with contents:
 
@@ -61,8 +76,10 @@ class PrologixAdapter(SerialAdapter):
 
     """
 
-    def __init__(self, port, address=None, rw_delay=None, serial_timeout = 0.5, **kwargs):
-        super().__init__(port, timeout = serial_timeout, **kwargs)
+    def __init__(self, port, address=None, rw_delay=None, serial_timeout = 0.5,
+                 read_termination=None, **kwargs):
+        super().__init__(port, read_termination=read_termination,
+                         timeout=serial_timeout, **kwargs)
         self.address = address
         self.rw_delay = rw_delay
         if not isinstance(port, serial.Serial):
@@ -81,11 +98,11 @@ class PrologixAdapter(SerialAdapter):
 
         :param command: SCPI command string to be sent to instrument
         """
-
-        self.write(command)
-        if self.rw_delay is not None:
-            time.sleep(self.rw_delay)
-        return self.read()
+        with self.lock:
+            self.write(command)
+            if self.rw_delay is not None:
+                time.sleep(self.rw_delay)
+            return self.read()
 
     def write(self, command):
         """ Writes the command to the GPIB address stored in the
@@ -93,40 +110,113 @@ class PrologixAdapter(SerialAdapter):
 
         :param command: SCPI command string to be sent to the instrument
         """
-        if self.address is not None:
-            address_command = "++addr %d\n" % self.address
-            self.connection.write(address_command.encode())
-        command += "\n"
-        self.connection.write(command.encode())
+        with self.lock:
+            if self.address is not None and _addresses.get(self.connection) != self.address:
+                address_command = "++addr %d\n" % self.address
+                self.connection.write(address_command.encode())
+                _addresses[self.connection] = self.address
+            command += "\n"
+            self.connection.write(command.encode())
 
     def read(self):
-        """ Reads the response of the instrument until timeout
+        """ Reads the response of the instrument until the read termination,
+        or until timeout if the read termination is None
 
         :returns: String ASCII response of the instrument
         """
-        self.write("++read eoi")
-        return b"\n".join(self.connection.readlines()).decode()
+        with self.lock:
+            self.write("++read eoi")
+            return super().read()
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
+        """ Returns a numpy array from a query for binary data
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore in header
+        :param dtype: The NumPy data type to format the values with
+        :param ieee_header: If True, the response is parsed as an IEEE 488.2
+                            block and exactly the announced number of bytes
+                            is read, otherwise the data is read until timeout
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: NumPy array of values, which references the received data
+        """
+        with self.lock:
+            self.write(command)
+            if self.rw_delay is not None:
+                time.sleep(self.rw_delay)
+            self.write("++read eoi")
+            return self._read_binary(header_bytes, dtype, ieee_header, is_big_endian)
 
     def gpib(self, address, rw_delay=None):
         """ Returns and PrologixAdapter object that references the GPIB
-        address specified, while sharing the Serial connection with other
-        calls of this function
+        address specified, while sharing the Serial connection and its
+        background reader with other calls of this function
 
         :param address: Integer GPIB address of the desired instrument
         :param rw_delay: Set a custom Read/Write delay for the instrument
         :returns: PrologixAdapter for specific GPIB address
         """
         rw_delay = rw_delay or self.rw_delay
-        return PrologixAdapter(self.connection, address, rw_delay=rw_delay)
+        return PrologixAdapter(self.connection, address, rw_delay=rw_delay,
+                               read_termination=self.read_termination,
+                               background_reader=self.reader is not None)
+
+    def _controller_ask(self, command):
+        # Queries the Prologix controller itself, which answers immediately
+        with self.lock:
+            self.connection.write((command + "\n").encode())
+            return SerialAdapter.read(self)
+
+    def srq(self):
+        """ Returns True if the SRQ line of the GPIB bus is asserted """
+        return int(self._controller_ask("++srq")) == 1
+
+    def read_stb(self):
+        """ Returns the status byte of the instrument by a serial poll """
+        if self.address is None:
+            return int(self._controller_ask("++spoll"))
+        return int(self._controller_ask("++spoll %d" % self.address))
+
+    def wait_for_event(self, mask, timeout=60, should_stop=lambda: False,
+                       register=None, max_interval=0.1):
+        """ Blocks until any bit of the mask is set in the status byte. The
+        SRQ line is polled on the controller without bus traffic, and the
+        instrument is serial polled once the line is asserted, so that the
+        bits of the mask must be enabled with :code:`*SRE`. Another register
+        is polled directly.
+
+        :param mask: Integer mask of the bits that signal the event
+        :param timeout: A time in seconds after which a TimeoutError is raised
+        :param should_stop: A function that returns True when this function
+                            should return early
+        :param register: A function that returns the value of the register,
+                         or None for the status byte
+        :param max_interval: The longest time in seconds between two polls
+        :returns: The value of the register, or None if stopped early
+        :raises: TimeoutError if the timeout is reached
+        """
+        if register is not None:
+            return super().wait_for_event(mask, timeout, should_stop, register,
+                                          max_interval)
+
+        def check():
+            if not self.srq():
+                return None  # Another instrument may request service
+            stb = self.read_stb()
+            return stb if stb & mask else None
+
+        return wait_until(check, timeout, should_stop, max_interval=max_interval)
 
     def wait_for_srq(self, timeout=25, delay=0.1):
         """ Blocks until a SRQ, and leaves the bit high
 
         :param timeout: Timeout duration in seconds
-        :param delay: Time delay between checking SRQ in seconds
+        :param delay: Longest time delay between checking SRQ in seconds
+        :raises: TimeoutError if no SRQ occurs within the timeout
         """
-        while int(self.ask("++srq")) != 1:  # TODO: Include timeout!
-            time.sleep(delay)
+        wait_until(self.srq, timeout, max_interval=delay)
 
     def __repr__(self):
         if self.address is not None:
@@ -0,0 +1,350 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import base64
+import json
+import logging
+import time
+
+import numpy as np
+
+from .adapter import Adapter
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+WRITE = "w"
+READ = "r"
+ASK = "q"
+BINARY = "b"
+VALUES = "v"
+BYTES = "n"
+STB = "s"
+EVENT = "e"
+
+
+class RecordingAdapter(Adapter):
+    """ Wraps an adapter and records every write, read, query, binary
+    response, status byte and event with its timestamp and duration, so that
+    the session can be played back by a :class:`ReplayAdapter` without the
+    instrument.
+
+    The recording is a JSON lines file, where each line is a list of the
+    time in seconds since the start, the duration of the call in seconds,
+    the operation, the command and the response.
+
+    .. code-block:: python
+
+        adapter = RecordingAdapter(VISAAdapter("GPIB::24"), "sweep.jsonl")
+        sourcemeter = Keithley2400(adapter)
+        ...
+        adapter.close()
+
+    :param adapter: The adapter that communicates with the instrument
+    :param filename: File to write the recording to
+    """
+
+    def __init__(self, adapter, filename):
+        self.adapter = adapter
+        self.filename = filename
+        self.file = open(filename, "w")
+        self.start = time.perf_counter()
+
+    def __getattr__(self, name):
+        # Other attributes are provided by the wrapped adapter
+        if name == "adapter":
+            raise AttributeError(name)
+        return getattr(self.adapter, name)
+
+    def __del__(self):
+        if hasattr(self, "file"):
+            self.file.close()
+
+    def __repr__(self):
+        return "<RecordingAdapter(adapter=%r,filename='%s')>" % (
+            self.adapter, self.filename)
+
+    def close(self):
+        """ Closes the recording """
+        self.file.close()
+
+    def _record(self, start, operation, command, response):
+        now = time.perf_counter()
+        self.file.write(json.dumps(
+            [round(start - self.start, 6), round(now - start, 6), operation,
+             command, response], separators=(",", ":")) + "\n")
+
+    def write(self, command):
+        """ Writes a command to the instrument and records it
+
+        :param command: SCPI command string to be sent to the instrument
+        """
+        start = time.perf_counter()
+        self.adapter.write(command)
+        self._record(start, WRITE, command, None)
+
+    def read(self):
+        """ Reads the response of the instrument and records it
+
+        :returns: String ASCII response of the instrument.
+        """
+        start = time.perf_counter()
+        response = self.adapter.read()
+        self._record(start, READ, None, response)
+        return response
+
+    def ask(self, command):
+        """ Writes the command to the instrument and records the resulting
+        ASCII response
+
+        :param command: SCPI command string to be sent to the instrument
+        :returns: String ASCII response of the instrument
+        """
+        start = time.perf_counter()
+        response = self.adapter.ask(command)
+        self._record(start, ASK, command, response)
+        return response
+
+    def read_bytes(self, size):
+        """ Reads a number of bytes from the instrument and records them
+
+        :param size: Number of bytes to read
+        :returns: Bytes of the received data
+        """
+        start = time.perf_counter()
+        response = self.adapter.read_bytes(size)
+        self._record(start, BYTES, size,
+                     base64.b64encode(bytes(response)).decode())
+        return response
+
+    def values(self, command, separator=',', cast=float, as_array=False):
+        """ Returns the formatted values of a query of the wrapped adapter,
+        and records them
+
+        :param command: SCPI command to be sent to the instrument
+        :param separator: A separator character to split the string into a list
+        :param cast: A type to cast the result
+        :param as_array: If True, a NumPy array is returned when all the values
+                         could be cast
+        :returns: A list of the desired type, or strings where the casting fails
+        """
+        start = time.perf_counter()
+        values = self.adapter.values(command, separator, cast, as_array)
+        if isinstance(values, np.ndarray):
+            response = [True, values.tolist()]
+        else:
+            response = [False, list(values)]
+        self._record(start, VALUES, command, response)
+        return values
+
+    def read_stb(self):
+        """ Returns the status byte of the wrapped adapter and records it """
+        start = time.perf_counter()
+        stb = self.adapter.read_stb()
+        self._record(start, STB, None, stb)
+        return stb
+
+    def wait_for_event(self, mask, timeout=60, should_stop=lambda: False,
+                       register=None, max_interval=0.1):
+        """ Blocks until the wrapped adapter signals the event, and records
+        it. The queries of the register function are recorded before it.
+
+        :param mask: Integer mask of the bits that signal the event
+        :param timeout: A time in seconds after which a TimeoutError is raised
+        :param should_stop: A function that returns True when this function
+                            should return early
+        :param register: A function that returns the value of the register,
+                         or None for the status byte
+        :param max_interval: The longest time in seconds between two polls
+        :returns: The value of the register, or None if stopped early
+        """
+        start = time.perf_counter()
+        value = self.adapter.wait_for_event(mask, timeout, should_stop,
+                                            register, max_interval)
+        self._record(start, EVENT, mask, value)
+        return value
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
+        """ Returns a numpy array from a query for binary data, and records
+        the data with its type
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore in header
+        :param dtype: The NumPy data type to format the values with
+        :param ieee_header: If True, the response is parsed as an IEEE 488.2
+                            block
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: NumPy array of values
+        """
+        start = time.perf_counter()
+        values = np.asarray(self.adapter.binary_values(
+            command, header_bytes, dtype, ieee_header, is_big_endian))
+        self._record(start, BINARY, command, [
+            values.dtype.str, base64.b64encode(values.tobytes()).decode()])
+        return values
+
+
+class ReplayAdapter(Adapter):
+    """ Plays back a recording of a :class:`RecordingAdapter` to an
+    unchanged instrument driver, by returning the recorded responses in
+    order. The commands of the driver are checked against the recording.
+
+    By default, the responses are returned as fast as possible, so that
+    the software overhead of a procedure can be measured separately from
+    the time spent on the bus. With :code:`realtime=True`, the recorded
+    speed is reproduced: each call returns no earlier than it did in the
+    recording, counted from the first call of the playback, so that both
+    the durations of the calls and the gaps between them are replayed.
+
+    :param filename: File of the recording
+    :param realtime: If True, the calls are played back at the recorded speed
+    :raises: ValueError when a command differs from the recording
+    """
+
+    def __init__(self, filename, realtime=False):
+        self.filename = filename
+        self.realtime = realtime
+        with open(filename) as file:
+            self.records = [json.loads(line) for line in file if line.strip()]
+        self.index = 0
+        self.origin = None
+
+    def __repr__(self):
+        return "<ReplayAdapter(filename='%s')>" % self.filename
+
+    def rewind(self):
+        """ Restarts the playback from the beginning of the recording """
+        self.index = 0
+        self.origin = None
+
+    @property
+    def finished(self):
+        """ True when all the recorded calls have been played back """
+        return self.index >= len(self.records)
+
+    def _next(self, operation, command):
+        if self.finished:
+            raise ValueError("Replay of %s has no more records for %r" % (
+                self.filename, command))
+        timestamp, duration, recorded_operation, recorded_command, response = \
+            self.records[self.index]
+        if recorded_operation != operation or recorded_command != command:
+            raise ValueError("Replay of %s expected %s %r in record %d, "
+                             "instead of %s %r" % (
+                                 self.filename, recorded_operation,
+                                 recorded_command, self.index,
+                                 operation, command))
+        self.index += 1
+        if self.realtime:
+            now = time.perf_counter()
+            if self.origin is None:
+                self.origin = now - timestamp
+            remaining = self.origin + timestamp + duration - now
+            if remaining > 0:
+                time.sleep(remaining)
+        return response
+
+    def write(self, command):
+        """ Checks that the command was written in the recording
+
+        :param command: SCPI command string to be sent to the instrument
+        """
+        self._next(WRITE, command)
+
+    def read(self):
+        """ Returns the recorded response of the instrument
+
+        :returns: String ASCII response of the instrument.
+        """
+        return self._next(READ, None)
+
+    def ask(self, command):
+        """ Returns the recorded response to the command
+
+        :param command: SCPI command string to be sent to the instrument
+        :returns: String ASCII response of the instrument
+        """
+        return self._next(ASK, command)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
+        """ Returns the recorded binary data of the query
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore in header
+        :param dtype: The NumPy data type to format the values with
+        :param ieee_header: If True, the response is parsed as an IEEE 488.2
+                            block
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: NumPy array of values
+        """
+        recorded_dtype, data = self._next(BINARY, command)
+        return np.frombuffer(base64.b64decode(data), dtype=recorded_dtype)
+
+    def read_bytes(self, size):
+        """ Returns the recorded bytes of the instrument
+
+        :param size: Number of bytes to read
+        :returns: Bytes of the received data
+        """
+        return base64.b64decode(self._next(BYTES, size))
+
+    def values(self, command, separator=',', cast=float, as_array=False):
+        """ Returns the recorded values of the query
+
+        :param command: SCPI command to be sent to the instrument
+        :param separator: A separator character to split the string into a list
+        :param cast: A type to cast the result
+        :param as_array: If True, a NumPy array is returned when all the values
+                         could be cast
+        :returns: A list of the desired type, or strings where the casting fails
+        """
+        is_array, values = self._next(VALUES, command)
+        return np.array(values) if is_array else values
+
+    def read_stb(self):
+        """ Returns the recorded status byte """
+        return self._next(STB, None)
+
+    def wait_for_event(self, mask, timeout=60, should_stop=lambda: False,
+                       register=None, max_interval=0.1):
+        """ Plays back an event. The register function is called until the
+        mask matches, which replays its recorded queries.
+
+        :param mask: Integer mask of the bits that signal the event
+        :param timeout: A time in seconds after which a TimeoutError is raised
+        :param should_stop: A function that returns True when this function
+                            should return early
+        :param register: A function that returns the value of the register,
+                         or None for the status byte
+        :param max_interval: The longest time in seconds between two polls
+        :returns: The recorded value of the register
+        """
+        if register is not None:
+            while not register() & mask and not should_stop():
+                pass
+        return self._next(EVENT, mask)
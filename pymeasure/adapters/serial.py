@@ -23,33 +23,247 @@
 #
 
 import logging
+import threading
+from collections import deque
 
 import serial
 import numpy as np
 
 from .adapter import Adapter
+from .block import block_dtype, read_block
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+# Background readers of the serial connections, which may be shared by
+# several adapters, and the lock that guards them
+_readers = {}
+_readers_lock = threading.Lock()
+
+
+class ChunkBuffer(object):
+    """ First-in first-out buffer of received bytes, which keeps the chunks
+    as they are received, so that taking a response does not copy the
+    data that follows it
+    """
+
+    def __init__(self):
+        self.chunks = deque()
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, data):
+        """ Appends a chunk of bytes """
+        self.chunks.append(data)
+        self.size += len(data)
+
+    def find(self, termination, start=0):
+        """ Returns the index of the termination, or -1 if it is not found
+
+        :param termination: Bytes to find
+        :param start: Index from which to search
+        """
+        overlap = len(termination) - 1
+        offset = 0
+        carry = b""
+        for chunk in self.chunks:
+            end = offset + len(chunk)
+            if end > start:
+                # The termination may span the previous chunk
+                data = carry + chunk
+                base = offset - len(carry)
+                index = data.find(termination, max(0, start - base))
+                if index >= 0:
+                    return base + index
+                carry = data[len(data) - overlap:] if overlap else b""
+            else:
+                carry = chunk[len(chunk) - overlap:] if overlap else b""
+            offset = end
+        return -1
+
+    def take(self, size):
+        """ Removes and returns the first bytes
+
+        :param size: Number of bytes, which are at most those in the buffer
+        """
+        parts = []
+        remaining = size
+        while remaining:
+            chunk = self.chunks.popleft()
+            if len(chunk) > remaining:
+                self.chunks.appendleft(chunk[remaining:])
+                chunk = chunk[:remaining]
+            parts.append(chunk)
+            remaining -= len(chunk)
+        self.size -= size
+        return b"".join(parts)
+
+
+class SerialReader(object):
+    """ Reads a serial connection in a background thread, and collects the
+    data in a buffer from which complete responses are taken as soon as
+    they are available. The reader of a connection is shared by the
+    adapters, and stops once all of them are closed, or the connection is.
+
+    :param connection: A serial.Serial object
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.buffer = ChunkBuffer()
+        self.error = None
+        self.users = 0
+        self.stopped = threading.Event()
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def for_connection(cls, connection):
+        """ Returns the reader of a connection, which is started once.
+        Each call must be matched by a call of :meth:`release`.
+        """
+        with _readers_lock:
+            reader = _readers.get(connection)
+            if reader is None or reader.stopped.is_set():
+                reader = _readers[connection] = cls(connection)
+            reader.users += 1
+            return reader
+
+    def release(self):
+        """ Releases the reader, which is stopped once it has no users """
+        with _readers_lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+            if _readers.get(self.connection) is self:
+                del _readers[self.connection]
+        self.stop()
+
+    def stop(self, timeout=1):
+        """ Stops the background thread
+
+        :param timeout: Time in seconds to wait for the thread to finish
+        """
+        self.stopped.set()
+        cancel_read = getattr(self.connection, 'cancel_read', None)
+        if cancel_read is not None and self.connection.is_open:
+            cancel_read()
+        if self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+    def _run(self):
+        try:
+            while not self.stopped.is_set() and self.connection.is_open:
+                data = self.connection.read(self.connection.in_waiting or 1)
+                if data:
+                    with self.condition:
+                        self.buffer.append(data)
+                        self.condition.notify_all()
+        except Exception as e:
+            if not self.stopped.is_set():
+                with self.condition:
+                    self.error = e
+                    self.condition.notify_all()
+        finally:
+            self.stopped.set()
+            with _readers_lock:
+                if _readers.get(self.connection) is self:
+                    del _readers[self.connection]
+
+    def read_until(self, termination, timeout=None):
+        """ Returns the data up to and including the termination
+
+        :param termination: Bytes that terminate the response
+        :param timeout: Time in seconds to wait for more data, or None
+        :raises: TimeoutError if no more data is received within the timeout
+        """
+        start = 0
+        with self.condition:
+            while True:
+                index = self.buffer.find(termination, start)
+                if index >= 0:
+                    return self.buffer.take(index + len(termination))
+                start = max(0, len(self.buffer) - len(termination) + 1)
+                self._wait(timeout)
+
+    def read_bytes(self, size, timeout=None):
+        """ Returns an exact number of bytes
+
+        :param size: Number of bytes to read
+        :param timeout: Time in seconds to wait for more data, or None
+        :raises: TimeoutError if no more data is received within the timeout
+        """
+        with self.condition:
+            while len(self.buffer) < size:
+                self._wait(timeout)
+            return self.buffer.take(size)
+
+    def read_all(self, timeout=None):
+        """ Returns the data that is received until the timeout """
+        with self.condition:
+            try:
+                while True:
+                    self._wait(timeout)
+            except TimeoutError:
+                return self.buffer.take(len(self.buffer))
+
+    def _wait(self, timeout):
+        # Waits for new data, where the timeout restarts with each chunk
+        if self.error is not None:
+            raise self.error
+        size = len(self.buffer)
+        if not self.condition.wait_for(
+                lambda: len(self.buffer) > size or self.error is not None,
+                timeout):
+            raise TimeoutError("Timed out reading from %s" % self.connection.port)
+
 
 class SerialAdapter(Adapter):
     """ Adapter class for using the Python Serial package to allow
     serial communication to instrument
 
     :param port: Serial port
+    :param read_termination: String that terminates the instrument responses,
+                             so that reads return as soon as it is received.
+                             If None, reads continue until the timeout.
+    :param background_reader: If True, the connection is read in a
+                              background thread into a buffer, from which
+                              responses are taken as soon as they are complete
     :param kwargs: Any valid key-word argument for serial.Serial
+
+    With the background reader, the serial :code:`timeout` is the longest time
+    to wait for more data before a TimeoutError is raised. The reader is
+    stopped by :meth:`close`.
     """
 
-    def __init__(self, port, **kwargs):
+    reader = None
+
+    def __init__(self, port, read_termination=None, background_reader=False,
+                 **kwargs):
         if isinstance(port, serial.Serial):
             self.connection = port
         else:
             self.connection = serial.Serial(port, **kwargs)
+        self.read_termination = read_termination
+        self.reader = None
+        if background_reader:
+            self.reader = SerialReader.for_connection(self.connection)
 
     def __del__(self):
         """ Ensures the connection is closed upon deletion
         """
+        if hasattr(self, 'connection'):
+            self.close()
+
+    def close(self):
+        """ Stops the background reader, unless other adapters of the
+        connection use it, and closes the connection """
+        reader, self.reader = self.reader, None
+        if reader is not None:
+            reader.release()
         self.connection.close()
 
     def write(self, command):
@@ -60,25 +274,69 @@ class SerialAdapter(Adapter):
         self.connection.write(command.encode())  # encode added for Python 3
 
     def read(self):
-        """ Reads until the buffer is empty and returns the resulting
+        """ Reads until the read termination, or until the buffer is empty
+        if the read termination is None, and returns the resulting
         ASCII respone
 
         :returns: String ASCII response of the instrument.
         """
-        return b"\n".join(self.connection.readlines()).decode()
+        if self.read_termination is None:
+            if self.reader is not None:
+                return self.reader.read_all(self.connection.timeout).decode()
+            return b"\n".join(self.connection.readlines()).decode()
+        termination = self.read_termination.encode()
+        response = self._read_until(termination)
+        if response.endswith(termination):
+            response = response[:-len(termination)]
+        return response.decode()
+
+    def read_bytes(self, size):
+        """ Reads an exact number of bytes, unless the timeout is reached
+
+        :param size: Number of bytes to read
+        :returns: Bytes of the received data
+        """
+        if self.reader is not None:
+            return self.reader.read_bytes(size, self.connection.timeout)
+        return self.connection.read(size)
+
+    def _read_until(self, termination):
+        if self.reader is not None:
+            return self.reader.read_until(termination, self.connection.timeout)
+        return self.connection.read_until(termination)
 
-    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
         """ Returns a numpy array from a query for binary data 
 
         :param command: SCPI command to be sent to the instrument
         :param header_bytes: Integer number of bytes to ignore in header
         :param dtype: The NumPy data type to format the values with
-        :returns: NumPy array of values
+        :param ieee_header: If True, the response is parsed as an IEEE 488.2
+                            block and exactly the announced number of bytes
+                            is read, otherwise all the data that arrives
+                            until the serial timeout is read, since the end
+                            of the response is not known (this used to read
+                            a single byte)
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: NumPy array of values, which references the received data
         """
-        self.connection.write(command.encode())
-        binary = self.connection.read().decode()
-        header, data = binary[:header_bytes], binary[header_bytes:]
-        return np.fromstring(data, dtype=dtype)
+        with self.lock:
+            self.write(command)
+            return self._read_binary(header_bytes, dtype, ieee_header, is_big_endian)
+
+    def _read_binary(self, header_bytes, dtype, ieee_header, is_big_endian):
+        if ieee_header:
+            return read_block(self.read_bytes, dtype, is_big_endian,
+                              termination=self.read_termination,
+                              read_until=self._read_until)
+        if self.reader is not None:
+            binary = self.reader.read_all(self.connection.timeout)
+        else:
+            binary = b"".join(self.connection.readlines())
+        return np.frombuffer(binary, dtype=block_dtype(dtype, is_big_endian),
+                             offset=header_bytes)
 
     def __repr__(self):
         return "<SerialAdapter(port='%s')>" % self.connection.port
@@ -0,0 +1,169 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import socket
+
+import numpy as np
+
+from .adapter import Adapter
+from .block import block_dtype, read_block
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class SocketAdapter(Adapter):
+    """ Adapter class for instruments that accept SCPI commands over a
+    raw TCP socket, which most LXI instruments provide on port 5025.
+    This has a lower overhead per command than VXI-11.
+
+    Nagle's algorithm is disabled, so that short commands are sent
+    immediately. The received data is kept in a buffer, from which
+    responses are split at the read termination.
+
+    :param host: Host name or IP address of the instrument
+    :param port: TCP port of the instrument
+    :param read_termination: String that terminates the instrument responses
+    :param write_termination: String appended to each command
+    :param timeout: Timeout in seconds for connecting and reading
+    :param chunk_size: Maximum number of bytes received at once
+    """
+
+    def __init__(self, host, port=5025, read_termination="\n",
+                 write_termination="\n", timeout=10, chunk_size=65536):
+        self.host = host
+        self.port = port
+        self.read_termination = read_termination
+        self.write_termination = write_termination
+        self.chunk_size = chunk_size
+        self.connection = socket.create_connection((host, port), timeout)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buffer = bytearray()
+
+    def __del__(self):
+        """ Ensures the connection is closed upon deletion
+        """
+        if hasattr(self, 'connection'):
+            self.connection.close()
+
+    def __repr__(self):
+        return "<SocketAdapter(host='%s',port=%d)>" % (self.host, self.port)
+
+    @property
+    def timeout(self):
+        """ Timeout in seconds for reading from the instrument """
+        return self.connection.gettimeout()
+
+    @timeout.setter
+    def timeout(self, value):
+        self.connection.settimeout(value)
+
+    def close(self):
+        """ Closes the connection """
+        self.connection.close()
+
+    def write(self, command):
+        """ Writes a command to the instrument
+
+        :param command: SCPI command string to be sent to the instrument
+        """
+        self.connection.sendall((command + self.write_termination).encode())
+
+    def read(self):
+        """ Reads until the read termination and returns the resulting
+        ASCII response
+
+        :returns: String ASCII response of the instrument.
+        """
+        termination = self.read_termination.encode()
+        response = self._read_until(termination)
+        return response[:-len(termination)].decode()
+
+    def read_bytes(self, size):
+        """ Reads an exact number of bytes. The bytes that are not yet
+        in the buffer are received directly into the returned array.
+
+        :param size: Number of bytes to read
+        :returns: Bytearray of the received data
+        """
+        data = bytearray(size)
+        view = memoryview(data)
+        received = min(size, len(self._buffer))
+        view[:received] = self._buffer[:received]
+        del self._buffer[:received]
+        while received < size:
+            count = self.connection.recv_into(view[received:])
+            if not count:
+                raise ConnectionError("Connection closed by %s" % self.host)
+            received += count
+        return data
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
+        """ Returns a numpy array from a query for binary data
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore in header
+        :param dtype: The NumPy data type to format the values with
+        :param ieee_header: If True, the response is parsed as an IEEE 488.2
+                            block and exactly the announced number of bytes
+                            is read, otherwise the data is read until the
+                            read termination that follows a whole number of
+                            values
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: NumPy array of values, which references the received data
+        """
+        with self.lock:
+            self.write(command)
+            if ieee_header:
+                return read_block(self.read_bytes, dtype, is_big_endian,
+                                  termination=self.read_termination,
+                                  read_until=self._read_until)
+            termination = self.read_termination.encode()
+            data = self._read_until(termination)
+            dtype = block_dtype(dtype, is_big_endian)
+            size = len(data) - len(termination) - header_bytes
+            while size <= 0 or size % dtype.itemsize:
+                # The termination was part of the data, which continues
+                data += self._read_until(termination)
+                size = len(data) - len(termination) - header_bytes
+            return np.frombuffer(data, dtype=dtype, offset=header_bytes,
+                                 count=size // dtype.itemsize)
+
+    def _read_until(self, termination):
+        start = 0
+        while True:
+            index = self._buffer.find(termination, start)
+            if index >= 0:
+                end = index + len(termination)
+                data = bytes(self._buffer[:end])
+                del self._buffer[:end]
+                return data
+            start = max(0, len(self._buffer) - len(termination) + 1)
+            chunk = self.connection.recv(self.chunk_size)
+            if not chunk:
+                raise ConnectionError("Connection closed by %s" % self.host)
+            self._buffer += chunk
@@ -0,0 +1,328 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+""" Opt-in instrumentation of the adapter I/O, which records the call count,
+the bytes sent and received, and a latency histogram for each command.
+
+Commands are grouped by their header, which is the text before the first
+whitespace, so that :code:`"VOLT 1.5"` and :code:`"VOLT 2"` are recorded
+together as :code:`"VOLT"`. A read is attributed to the preceding command
+of the same thread, and the bytes are counted as they are encoded.
+The counters and histograms are allocated once per command, so that
+recording a call only increments integers.
+
+.. code-block:: python
+
+    stats = adapter.enable_stats()
+    ...
+    print(stats.summary())
+    adapter.disable_stats()
+"""
+
+import json
+import logging
+import math
+import threading
+from time import perf_counter
+from weakref import WeakSet
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# Latency histograms with 10 logarithmic bins per decade from 1 us to 1000 s,
+# and bins for shorter and longer latencies at both ends
+BINS_PER_DECADE = 10
+MIN_DECADE = -6
+MAX_DECADE = 3
+BINS = (MAX_DECADE - MIN_DECADE) * BINS_PER_DECADE + 2
+
+OPERATIONS = ('write', 'read', 'ask')
+
+# Statistics of the adapters that are instrumented
+_enabled = WeakSet()
+
+
+def _bin(latency):
+    if latency <= 0:
+        return 0
+    index = int((math.log10(latency) - MIN_DECADE) * BINS_PER_DECADE) + 1
+    return min(max(index, 0), BINS - 1)
+
+
+def bin_edges():
+    """ Returns the upper latency edges in seconds of the histogram bins,
+    where the last bin has no upper edge
+    """
+    return [10 ** (MIN_DECADE + i / BINS_PER_DECADE) for i in range(BINS - 1)]
+
+
+def _template(command):
+    end = command.find(" ")
+    return command if end < 0 else command[:end]
+
+
+def _size(data):
+    """ Returns the number of bytes of a string, as it is encoded for
+    sending, or of the received bytes or array """
+    if isinstance(data, str):
+        return len(data.encode())
+    nbytes = getattr(data, 'nbytes', None)
+    return len(data) if nbytes is None else nbytes
+
+
+class LatencyHistogram(object):
+    """ Counts the latencies of an operation in logarithmic bins """
+
+    __slots__ = ('counts', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.counts = [0] * BINS
+        self.count = 0
+        self.total = 0.
+        self.minimum = math.inf
+        self.maximum = 0.
+
+    def add(self, latency):
+        """ Records the latency of a call in seconds """
+        self.counts[_bin(latency)] += 1
+        self.count += 1
+        self.total += latency
+        if latency < self.minimum:
+            self.minimum = latency
+        if latency > self.maximum:
+            self.maximum = latency
+
+    def quantile(self, q):
+        """ Returns an upper estimate of a latency quantile, from the upper
+        edge of the bin that contains it
+
+        :param q: Quantile between 0 and 1
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                break
+        if index == BINS - 1:
+            return self.maximum
+        return min(10 ** (MIN_DECADE + index / BINS_PER_DECADE), self.maximum)
+
+    def to_dict(self):
+        """ Returns the histogram as a dictionary, where the bins are listed
+        by their upper edge in seconds
+        """
+        edges = bin_edges() + [None]
+        return {
+            'count': self.count,
+            'total': self.total,
+            'min': self.minimum if self.count else None,
+            'max': self.maximum if self.count else None,
+            'mean': self.total / self.count if self.count else None,
+            'histogram': [(edges[i], c) for i, c in enumerate(self.counts) if c],
+        }
+
+
+class CommandStats(object):
+    """ Statistics of the calls of a command """
+
+    __slots__ = ('bytes_sent', 'bytes_received') + OPERATIONS
+
+    def __init__(self):
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        for operation in OPERATIONS:
+            setattr(self, operation, LatencyHistogram())
+
+    def to_dict(self):
+        """ Returns the statistics as a dictionary """
+        result = {
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+        }
+        for operation in OPERATIONS:
+            result[operation] = getattr(self, operation).to_dict()
+        return result
+
+
+class AdapterStats(object):
+    """ Records the I/O statistics of an adapter, by wrapping the
+    :code:`write`, :code:`read`, :code:`ask` and :code:`binary_values`
+    methods of the instance. Binary queries are recorded as :code:`ask`.
+    This is created by :meth:`Adapter.enable_stats
+    <pymeasure.adapters.Adapter.enable_stats>`.
+
+    :param adapter: The adapter to instrument
+    """
+
+    def __init__(self, adapter):
+        self.name = repr(adapter)
+        self.commands = {}
+        # The statistics are recorded by the threads that use the adapter
+        self._lock = threading.Lock()
+        # Calls made by ask, binary_values and read are not recorded
+        # separately, and a read is attributed to the last command of the
+        # same thread, which is tracked for each thread
+        self._local = threading.local()
+        self._install(adapter)
+
+    def _command(self, command):
+        template = _template(command)
+        stats = self.commands.get(template)
+        if stats is None:
+            with self._lock:
+                stats = self.commands.setdefault(template, CommandStats())
+        self._local.last = template
+        return stats
+
+    def _record(self, stats, operation, latency, sent=None, received=None):
+        with self._lock:
+            getattr(stats, operation).add(latency)
+            if sent is not None:
+                stats.bytes_sent += _size(sent)
+            if received is not None:
+                stats.bytes_received += _size(received)
+
+    def _install(self, adapter):
+        write = adapter.write
+        read = adapter.read
+        ask = adapter.ask
+        binary_values = adapter.binary_values
+        local = self._local
+
+        def timed_write(command):
+            if getattr(local, 'nested', False):
+                return write(command)
+            start = perf_counter()
+            write(command)
+            latency = perf_counter() - start
+            self._record(self._command(command), 'write', latency,
+                         sent=command)
+
+        def timed_read():
+            if getattr(local, 'nested', False):
+                return read()
+            # The command is looked up first, since the read may write
+            # commands of its own, such as the Prologix "++read eoi"
+            stats = self._command(getattr(local, 'last', None) or "")
+            local.nested = True
+            start = perf_counter()
+            try:
+                response = read()
+            finally:
+                local.nested = False
+            self._record(stats, 'read', perf_counter() - start,
+                         received=response)
+            return response
+
+        def timed_ask(command):
+            if getattr(local, 'nested', False):
+                return ask(command)
+            local.nested = True
+            start = perf_counter()
+            try:
+                response = ask(command)
+            finally:
+                local.nested = False
+            latency = perf_counter() - start
+            self._record(self._command(command), 'ask', latency,
+                         sent=command, received=response)
+            return response
+
+        def timed_binary_values(command, *args, **kwargs):
+            if getattr(local, 'nested', False):
+                return binary_values(command, *args, **kwargs)
+            local.nested = True
+            start = perf_counter()
+            try:
+                values = binary_values(command, *args, **kwargs)
+            finally:
+                local.nested = False
+            latency = perf_counter() - start
+            self._record(self._command(command), 'ask', latency,
+                         sent=command, received=values)
+            return values
+
+        adapter.write = timed_write
+        adapter.read = timed_read
+        adapter.ask = timed_ask
+        adapter.binary_values = timed_binary_values
+        _enabled.add(adapter)
+
+    def reset(self):
+        """ Clears the recorded statistics """
+        with self._lock:
+            self.commands = {}
+
+    def to_dict(self):
+        """ Returns the statistics of each command as a dictionary """
+        with self._lock:
+            return {template: stats.to_dict()
+                    for template, stats in self.commands.items()}
+
+    def to_json(self, **kwargs):
+        """ Returns the statistics of each command as a JSON string
+
+        :param kwargs: Key-word arguments for :func:`json.dumps`
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def summary(self):
+        """ Returns a table of the call count, bytes, and latencies in
+        milliseconds of each command and operation, sorted by the total time
+        """
+        rows = []
+        with self._lock:
+            commands = list(self.commands.items())
+        for template, stats in commands:
+            for operation in OPERATIONS:
+                histogram = getattr(stats, operation)
+                if histogram.count:
+                    rows.append((histogram.total, template, operation, histogram,
+                                 stats))
+        rows.sort(key=lambda row: row[0], reverse=True)
+        lines = ["%s" % self.name,
+                 "%-24s %-5s %8s %10s %10s %9s %9s %9s" % (
+                     "command", "op", "count", "sent", "received",
+                     "mean/ms", "p99/ms", "max/ms")]
+        for total, template, operation, histogram, stats in rows:
+            lines.append("%-24s %-5s %8d %10d %10d %9.3f %9.3f %9.3f" % (
+                template, operation, histogram.count, stats.bytes_sent,
+                stats.bytes_received, 1e3 * total / histogram.count,
+                1e3 * histogram.quantile(0.99), 1e3 * histogram.maximum))
+        return "\n".join(lines)
+
+
+def disable_stats(adapter):
+    """ Removes the instrumentation of an adapter """
+    for method in OPERATIONS + ('binary_values',):
+        adapter.__dict__.pop(method, None)
+    _enabled.discard(adapter)
+
+
+def enabled_stats():
+    """ Returns the :class:`AdapterStats` of all the instrumented adapters """
+    return [adapter.stats for adapter in list(_enabled)]
@@ -28,6 +28,7 @@ from telnetlib import Telnet
 import numpy as np
 
 from .adapter import Adapter
+from .block import block_dtype, read_block
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
@@ -39,14 +40,25 @@ class TelnetAdapter(Adapter):
 
     :param host: Host Address
     :param port: Host port
+    :param read_termination: String that terminates the instrument responses
+    :param timeout: Timeout in seconds for reading a response
     :param kwargs: Any valid key-word argument for telnetlib.Telnet
+
+    For instruments that accept raw SCPI commands, the
+    :class:`SocketAdapter<pymeasure.adapters.SocketAdapter>` has
+    a lower overhead.
     """
 
-    def __init__(self, host, port, **kwargs):
+    _buffer = b""
+
+    def __init__(self, host, port=23, read_termination="\n", timeout=10,
+                 **kwargs):
         if isinstance(host, Telnet):
             self.connection = host
         else:
-            self.connection = host.Telnet(host, port, **kwargs)
+            self.connection = Telnet(host, port, **kwargs)
+        self.read_termination = read_termination
+        self.timeout = timeout
 
     def __del__(self):
         """ Ensures the connection is closed upon deletion
@@ -61,25 +73,69 @@ class TelnetAdapter(Adapter):
         self.connection.write(command.encode())
 
     def read(self):
-        """ Reads until the buffer is empty and returns the resulting
-        ASCII respone
+        """ Reads until the read termination and returns the resulting
+        ASCII response
 
         :returns: String ASCII response of the instrument.
         """
-        return b"\n".join(self.connection.read_eager()).decode()
+        termination = self.read_termination.encode()
+        return self._read_until(termination)[:-len(termination)].decode()
 
-    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
         """ Returns a numpy array from a query for binary data 
 
         :param command: SCPI command to be sent to the instrument
         :param header_bytes: Integer number of bytes to ignore in header
         :param dtype: The NumPy data type to format the values with
-        :returns: NumPy array of values
+        :param ieee_header: If True, the response is parsed as an IEEE 488.2
+                            block and exactly the announced number of bytes
+                            is read, otherwise the data is read until the
+                            read termination that follows a whole number of
+                            values
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: NumPy array of values, which references the received data
         """
-        self.connection.write(command.encode())
-        binary = self.connection.read().decode()
-        header, data = binary[:header_bytes], binary[header_bytes:]
-        return np.fromstring(data, dtype=dtype)
+        with self.lock:
+            self.connection.write(command.encode())
+            if ieee_header:
+                return read_block(self._read_bytes, dtype, is_big_endian,
+                                  termination=self.read_termination,
+                                  read_until=self._read_until)
+            termination = self.read_termination.encode()
+            data = self._read_until(termination)
+            dtype = block_dtype(dtype, is_big_endian)
+            size = len(data) - len(termination) - header_bytes
+            while size <= 0 or size % dtype.itemsize:
+                # The termination was part of the data, which continues
+                data += self._read_until(termination)
+                size = len(data) - len(termination) - header_bytes
+            return np.frombuffer(data, dtype=dtype, offset=header_bytes,
+                                 count=size // dtype.itemsize)
+
+    def _read_bytes(self, size):
+        data = self._buffer
+        while len(data) < size:
+            received = self.connection.read_some()
+            if not received:
+                raise EOFError("Telnet connection closed")
+            data += received
+        data, self._buffer = data[:size], data[size:]
+        return data
+
+    def _read_until(self, termination):
+        data, self._buffer = self._buffer, b""
+        if termination not in data:
+            data += self.connection.read_until(termination, self.timeout)
+            if termination not in data:
+                self._buffer = data
+                raise TimeoutError("Telnet response was not terminated "
+                                   "within %g s" % self.timeout)
+        end = data.index(termination) + len(termination)
+        data, self._buffer = data[:end], data[end:]
+        return data
 
     def __repr__(self):
-        return "<SerialAdapter(port='%s')>" % self.connection.port
+        return "<TelnetAdapter(host='%s',port=%d)>" % (
+            self.connection.host, self.connection.port)
@@ -23,17 +23,40 @@
 #
 
 import logging
+import re
+import threading
+import time
 
 import copy
 import visa
 import numpy as np
-from pkg_resources import parse_version
+from pyvisa import constants
+from pyvisa.errors import VisaIOError
 
 from .adapter import Adapter
+from .block import block_dtype, read_block
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+# ResourceManagers and sessions that are shared by the process
+_managers = {}
+_sessions = {}
+_registry_lock = threading.Lock()
+
+
+def get_resource_manager(visa_library=''):
+    """ Returns the PyVISA ResourceManager for the VISA library, which is
+    created once and shared by all the adapters of the process.
+
+    :param visa_library: VisaLibrary Instance, path of the VISA library or
+                         VisaLibrary spec string (@py or @ni)
+    """
+    with _registry_lock:
+        if visa_library not in _managers:
+            _managers[visa_library] = visa.ResourceManager(visa_library)
+        return _managers[visa_library]
+
 
 # noinspection PyPep8Naming,PyUnresolvedReferences
 class VISAAdapter(Adapter):
@@ -44,8 +67,15 @@ class VISAAdapter(Adapter):
     :param visa_library: VisaLibrary Instance, path of the VISA library or VisaLibrary spec string (@py or @ni).
                          if not given, the default for the platform will be used.
     :param kwargs: Any valid key-word arguments for constructing a PyVISA instrument
+
+    Adapters with the same resource name, library and key-word arguments
+    share a single VISA session, which is closed when the last of them is
+    closed with :meth:`.close` or deleted. This avoids opening duplicate
+    sessions when several instruments are constructed from a resource name.
     """
 
+    _session_key = None
+
     def __init__(self, resourceName, visa_library='', **kwargs):
         if not VISAAdapter.has_supported_version():
             raise NotImplementedError("Please upgrade PyVISA to version 1.8 or later.")
@@ -54,7 +84,7 @@ class VISAAdapter(Adapter):
             resourceName = "GPIB0::%d::INSTR" % resourceName
         super(VISAAdapter, self).__init__()
         self.resource_name = resourceName
-        self.manager = visa.ResourceManager(visa_library)
+        self.manager = get_resource_manager(visa_library)
         safeKeywords = ['resource_name', 'timeout',
                         'chunk_size', 'lock', 'delay', 'send_end',
                         'values_format', 'read_termination', 'write_termination']
@@ -62,16 +92,46 @@ class VISAAdapter(Adapter):
         for key in kwargsCopy:
             if key not in safeKeywords:
                 kwargs.pop(key)
-        self.connection = self.manager.get_instrument(
-            resourceName,
-            **kwargs
-        )
+        key = (visa_library, resourceName,
+               tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        with _registry_lock:
+            if key not in _sessions:
+                connection = self.manager.get_instrument(
+                    resourceName,
+                    **kwargs
+                )
+                _sessions[key] = [connection, 0]
+            session = _sessions[key]
+            session[1] += 1
+        self.connection = session[0]
+        self._session_key = key
+
+    def __del__(self):
+        """ Releases the session upon deletion
+        """
+        self.close()
+
+    def close(self):
+        """ Releases the shared VISA session, and closes it if no other
+        adapter uses it
+        """
+        key, self._session_key = self._session_key, None
+        if key is None:
+            return
+        with _registry_lock:
+            session = _sessions[key]
+            session[1] -= 1
+            if session[1] > 0:
+                return
+            del _sessions[key]
+        session[0].close()
 
     @staticmethod
     def has_supported_version():
         """ Returns True if the PyVISA version is greater than 1.8 """
         if hasattr(visa, '__version__'):
-            return parse_version(visa.__version__) >= parse_version('1.8')
+            version = re.findall(r"\d+", visa.__version__)
+            return tuple(int(v) for v in version[:2]) >= (1, 8)
         else:
             return False
 
@@ -109,7 +169,8 @@ class VISAAdapter(Adapter):
         :param command: SCPI command string to be sent to the instrument
         :returns: String ASCII response of the instrument
         """
-        return self.connection.query(command)
+        with self.lock:
+            return self.connection.query(command)
 
     def ask_values(self, command):
         """ Writes a command to the instrument and returns a list of formatted
@@ -119,20 +180,95 @@ class VISAAdapter(Adapter):
         :param command: SCPI command to be sent to the instrument
         :returns: Formatted response of the instrument.
         """
-        return self.connection.query_values(command)
+        with self.lock:
+            return self.connection.query_values(command)
 
-    def binary_values(self, command, header_bytes=0, dtype=np.float32):
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
         """ Returns a numpy array from a query for binary data
 
         :param command: SCPI command to be sent to the instrument
         :param header_bytes: Integer number of bytes to ignore in header
         :param dtype: The NumPy data type to format the values with
-        :returns: NumPy array of values
+        :param ieee_header: If True, the response is parsed as an IEEE 488.2
+                            block, so that :code:`header_bytes` is not required
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: NumPy array of values, which references the received data
         """
-        self.connection.write(command)
-        binary = self.connection.read_raw()
-        header, data = binary[:header_bytes], binary[header_bytes:]
-        return np.fromstring(data, dtype=dtype)
+        with self.lock:
+            self.connection.write(command)
+            if ieee_header:
+                # Read the exact block length, so that termination characters
+                # in the binary data do not end the read
+                return read_block(
+                    self.connection.read_bytes, dtype, is_big_endian,
+                    termination=self.connection.read_termination,
+                    read_until=lambda termination: self.connection.read_raw()
+                )
+            binary = self.connection.read_raw()
+            return np.frombuffer(binary, dtype=block_dtype(dtype, is_big_endian),
+                                 offset=header_bytes)
+
+    def read_stb(self):
+        """ Returns the status byte of the instrument by a serial poll """
+        with self.lock:
+            return self.connection.read_stb()
+
+    def wait_for_event(self, mask, timeout=60, should_stop=lambda: False,
+                       register=None, max_interval=0.1):
+        """ Blocks until any bit of the mask is set in the status byte. The
+        service request events of VISA are awaited if the resource supports
+        them, where the bits of the mask must be enabled with :code:`*SRE`.
+        Otherwise, or for another register, the register is polled.
+
+        :param mask: Integer mask of the bits that signal the event
+        :param timeout: A time in seconds after which a TimeoutError is raised
+        :param should_stop: A function that returns True when this function
+                            should return early
+        :param register: A function that returns the value of the register,
+                         or None for the status byte
+        :param max_interval: The longest time in seconds between checks of
+                             :code:`should_stop` or polls
+        :returns: The value of the register, or None if stopped early
+        :raises: TimeoutError if the timeout is reached
+        """
+        if register is None:
+            try:
+                self.connection.enable_event(constants.VI_EVENT_SERVICE_REQ,
+                                             constants.VI_QUEUE)
+            except (VisaIOError, NotImplementedError):
+                log.debug("%r does not support service requests", self)
+            else:
+                try:
+                    return self._wait_for_srq(mask, timeout, should_stop,
+                                              max_interval)
+                finally:
+                    self.connection.disable_event(
+                        constants.VI_EVENT_SERVICE_REQ, constants.VI_QUEUE)
+        return super().wait_for_event(mask, timeout, should_stop, register,
+                                      max_interval)
+
+    def _wait_for_srq(self, mask, timeout, should_stop, max_interval):
+        deadline = time.monotonic() + timeout
+        stb = self.read_stb()  # The event may have occurred already
+        while not stb & mask:
+            if should_stop():
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Timed out after %g s" % timeout)
+            try:
+                response = self.connection.wait_on_event(
+                    constants.VI_EVENT_SERVICE_REQ,
+                    max(1, int(1000 * min(remaining, max_interval))))
+            except VisaIOError as e:
+                if e.error_code != constants.VI_ERROR_TMO:
+                    raise
+                continue
+            if not getattr(response, 'timed_out', False):
+                stb = self.read_stb()
+        return stb
 
     def config(self, is_binary=False, datatype='str',
                container=np.array, converter='s',
@@ -74,7 +74,8 @@ class VXI11Adapter(Adapter):
 
         :returns string containing a response from the device.
         """
-        return self.connection.ask(command)
+        with self.lock:
+            return self.connection.ask(command)
 
     def write_raw(self, command):
         """ Wrapper function for the write_raw command using the
@@ -102,4 +103,5 @@ class VXI11Adapter(Adapter):
 
         :returns binary string containing the response from the device.
         """
-        return self.connection.ask_raw(command)
+        with self.lock:
+            return self.connection.ask_raw(command)
@@ -33,6 +33,7 @@ from queue import Queue
 from .listeners import Recorder
 from .procedure import Procedure, ProcedureWrapper
 from .results import Results
+from ..adapters.stats import enabled_stats
 from ..log import TopicQueueHandler
 from ..thread import StoppableThread
 
@@ -52,6 +53,12 @@ class Worker(StoppableThread):
     """ Worker runs the procedure and emits information about
     the procedure and its status over a ZMQ TCP port. In a child
     thread, a Recorder is run to write the results to
+
+    The I/O statistics of the adapters with
+    :meth:`enable_stats<pymeasure.adapters.Adapter.enable_stats>` are reset
+    at the start of a run. At the end of the run, the statistics of the
+    adapters that the procedure used are logged, emitted with the
+    :code:`'stats'` topic, and kept in :attr:`stats`.
     """
 
     def __init__(self, results, log_queue=None, log_level=logging.INFO, port=None):
@@ -78,6 +85,7 @@ class Worker(StoppableThread):
 
         self.context = None
         self.publisher = None
+        self.stats = {}
 
     def join(self, timeout=0):
         try:
@@ -114,8 +122,30 @@ class Worker(StoppableThread):
         self.procedure.status = status
         self.emit('status', status)
 
+    def reset_stats(self):
+        """ Clears the I/O statistics of the instrumented adapters, so that
+        only the calls of this run are reported
+        """
+        self.stats = {}
+        for stats in enabled_stats():
+            stats.reset()
+
+    def report_stats(self):
+        """ Logs and emits the I/O statistics of the instrumented adapters
+        that were used during the run
+        """
+        self.stats = {}
+        for stats in enabled_stats():
+            if not stats.commands:
+                continue
+            log.info("Adapter I/O statistics of %s", stats.summary())
+            self.stats[stats.name] = stats.to_dict()
+        if self.stats:
+            self.emit('stats', self.stats)
+
     def shutdown(self):
         self.procedure.shutdown()
+        self.report_stats()
 
         if self.should_stop() and self.procedure.status == Procedure.RUNNING:
             self.update_status(Procedure.ABORTED)
@@ -160,6 +190,7 @@ class Worker(StoppableThread):
         log.info("Worker started running an instance of %r", self.procedure.__class__.__name__)
         self.update_status(Procedure.RUNNING)
         self.emit('progress', 0.)
+        self.reset_stats()
 
         try:
             self.procedure.startup()
@@ -22,26 +22,35 @@
 # THE SOFTWARE.
 #
 
+import sys
+from importlib import import_module
+
 from ..errors import RangeError, RangeException
 from .instrument import Instrument
 from .mock import Mock
-from .resources import list_resources
+from .resources import (list_resources, discover_resources,
+                        ResourceInventory, ResourceRecord)
 from .validators import discreteTruncate
 
-from . import advantest
-from . import agilent
-from . import ametek
-from . import anritsu
-from . import deltaelektronika
-from . import danfysik
-from . import fwbell
-from . import hbs
-from . import hp
-from . import keithley
-from . import lakeshore
-from . import parker
-from . import signalrecovery
-from . import srs
-from . import tektronix
-from . import thorlabs
-from . import yokogawa
+# Manufacturer packages, which are imported on first use
+_manufacturers = (
+    'advantest', 'agilent', 'ametek', 'anritsu', 'deltaelektronika',
+    'danfysik', 'fwbell', 'hbs', 'hp', 'keithley', 'lakeshore', 'parker',
+    'signalrecovery', 'srs', 'tektronix', 'thorlabs', 'yokogawa',
+)
+
+
+def __getattr__(name):
+    if name not in _manufacturers:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    return import_module('.' + name, __name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_manufacturers))
+
+
+if sys.version_info < (3, 7):
+    # Module attributes can only be loaded on demand since Python 3.7
+    for _name in _manufacturers:
+        __getattr__(_name)
@@ -384,7 +384,7 @@ class Agilent4156(Instrument):
         self.write(":FORM:DATA ASC")
         # recursively get data for each variable
         for i, listvar in enumerate(header):
-            data = self.values(":DATA? \'{}\'".format(listvar))
+            data = self.values(":DATA? \'{}\'".format(listvar), as_array=True)
             time.sleep(0.01)
             if i == 0:
                 lastdata = data
@@ -155,7 +155,8 @@ class Agilent8722ES(Instrument):
             self.write("*CLS;SRE 4;ESNB 1;")
             self.restartAveraging(averages)
             if blocking:
-                self.adapter.wait_for_srq(timeout, delay)
+                # Event status register B is summarized in bit 2
+                self.adapter.wait_for_event(4, timeout, max_interval=delay)
 
     def is_scan_complete():
         pass  # TODO: Implement method for determining if the scan is completed
@@ -25,9 +25,7 @@
 from pymeasure.instruments import Instrument
 from pymeasure.instruments.validators import truncated_range
 
-from io import StringIO
 import numpy as np
-import pandas as pd
 
 
 class AgilentE4408B(Instrument):
@@ -100,18 +98,15 @@ class AgilentE4408B(Instrument):
         based on the trace number (1, 2, or 3).
         """
         self.write(":FORMat:TRACe:DATA ASCII;")
-        data = np.loadtxt(
-            StringIO(self.ask(":TRACE:DATA? TRACE%d;" % number)),
-            delimiter=',',
-            dtype=np.float64
-        )
-        return data
+        data = self.values(":TRACE:DATA? TRACE%d;" % number, as_array=True)
+        return np.asarray(data, dtype=np.float64)
 
     def trace_df(self, number=1):
         """ Returns a pandas DataFrame containing the frequency
         and peak data for a particular trace, based on the 
         trace number (1, 2, or 3).
         """
+        import pandas as pd
         return pd.DataFrame({
             'Frequency (GHz)': self.frequencies*1e-9,
             'Peak (dB)': self.trace(number)
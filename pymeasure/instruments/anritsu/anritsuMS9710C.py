@@ -24,6 +24,7 @@
 import logging
 from time import sleep
 import numpy as np
+from pymeasure.adapters.adapter import wait_until
 from pymeasure.instruments import Instrument
 from pymeasure.instruments.validators import (
     strict_discrete_set,
@@ -309,20 +310,23 @@ class AnritsuMS9710C(Instrument):
 
         log.debug(res)
 
-    def wait_for_sweep(self, n=20, delay=0.5):
+    def wait_for_sweep(self, n=20, delay=0.5, should_stop=lambda: False):
         """Wait for a sweep to stop.
 
-        This is performed by checking bit 1 of the ESR2.
+        This is performed by checking that the ESR2 is 3, with an interval
+        that starts short and grows up to the delay.
+
+        :param n: Number of delays after which the wait times out
+        :param delay: Longest time in seconds between checks of the ESR2
+        :param should_stop: A function that returns True when this function
+                            should return early
         """
         log.debug("Waiting for spectrum sweep")
 
-        while(self.esr2 != 3 and n > 0):
-            log.debug("Wait for sweep [{}]".format(n))
-            # log.debug("ESR2: {}".format(esr2))
-            sleep(delay)
-            n -= 1
-
-        if n <= 0:
+        try:
+            wait_until(lambda: self.esr2 == 3, n * delay, should_stop,
+                       max_interval=delay)
+        except TimeoutError:
             log.warning("Sweep Timeout Occurred ({} s)".format(int(delay * n)))
 
     def single_sweep(self, **kwargs):
@@ -0,0 +1,265 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+""" Acquisition of points into the buffer of an instrument.
+
+A :class:`BufferedAcquisition` configures the buffer, arms it, fetches the
+new points into a preallocated array while the buffer fills, and detects
+the completion. Each driver subclasses it and only provides the commands
+of :meth:`~BufferedAcquisition.configure`,
+:meth:`~BufferedAcquisition.arm`, :meth:`~BufferedAcquisition.count`,
+:meth:`~BufferedAcquisition.fetch`, :meth:`~BufferedAcquisition.abort`
+and optionally :meth:`~BufferedAcquisition.finish`.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from .stream import Stream
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class BufferedAcquisition(object):
+    """ Base class of the buffered acquisitions of the drivers
+
+    .. code-block:: python
+
+        acquisition = lockin.buffer_acquisition(1000, rate=64)
+        data = acquisition.acquire(timeout=30)
+
+    The points are fetched while the buffer fills, so that the transfer
+    overlaps with the acquisition. Instruments that can only transfer the
+    complete buffer set :attr:`incremental` to False. Each point is a value,
+    or a row of values if the instrument acquires several channels.
+
+    :param instrument: The instrument whose buffer is used
+    :param points: Number of points to acquire
+    :param interval: Time in seconds between the checks of the count
+    :param dtype: The NumPy data type of the points
+    """
+
+    #: True if the points can be fetched before the buffer is full
+    incremental = True
+    #: Shape of each point if it is known in advance, such as :code:`(2,)`
+    #: for two channels, otherwise it is taken from the first fetch
+    shape = None
+
+    def __init__(self, instrument, points, interval=0.01, dtype=np.float64):
+        self.instrument = instrument
+        self.points = points
+        self.interval = interval
+        self.dtype = dtype
+        self.data = None
+        self.acquired = 0
+        self.running = False
+
+    def __repr__(self):
+        return "<%s(%r,points=%d)>" % (
+            self.__class__.__name__,
+            getattr(self.instrument, 'name', self.instrument), self.points)
+
+    def configure(self):
+        """ Configures the buffer of the instrument for :attr:`points`,
+        and clears it """
+        pass
+
+    def arm(self):
+        """ Starts filling the buffer """
+        raise NotImplementedError("%s does not implement arm()" %
+                                  self.__class__.__name__)
+
+    def count(self):
+        """ Returns the number of points in the buffer """
+        raise NotImplementedError("%s does not implement count()" %
+                                  self.__class__.__name__)
+
+    def fetch(self, start, stop):
+        """ Returns the points of the buffer from :code:`start` up to,
+        but not including, :code:`stop`
+
+        :param start: Index of the first point
+        :param stop: Index after the last point
+        :returns: Array of the points, or of all their values in order
+        """
+        raise NotImplementedError("%s does not implement fetch()" %
+                                  self.__class__.__name__)
+
+    def abort(self):
+        """ Stops filling the buffer """
+        pass
+
+    def finish(self):
+        """ Called once all the points are acquired, to stop instruments
+        that would keep filling the buffer """
+        pass
+
+    def ended(self):
+        """ Returns True if the instrument stopped filling the buffer before
+        all the points were acquired, and no more points can be fetched,
+        which ends the acquisition with fewer points """
+        return False
+
+    @property
+    def done(self):
+        """ True once all the points are acquired """
+        return self.acquired >= self.points
+
+    def start(self):
+        """ Configures and arms the buffer
+
+        :returns: The acquisition
+        """
+        self.acquired = 0
+        if self.data is None and self.shape is not None:
+            self.data = np.empty((self.points,) + tuple(self.shape),
+                                 dtype=self.dtype)
+        self.configure()
+        self.arm()
+        self.running = True
+        return self
+
+    def stop(self):
+        """ Aborts the acquisition, unless it is complete """
+        if self.running:
+            self.running = False
+            self.abort()
+
+    def update(self):
+        """ Fetches the points that were added to the buffer into
+        :attr:`data`
+
+        :returns: The number of new points
+        """
+        available = min(self.count(), self.points)
+        if available <= self.acquired or (
+                not self.incremental and available < self.points):
+            return 0
+        start = self.acquired
+        values = np.asarray(self.fetch(start, available), dtype=self.dtype)
+        new = available - start
+        if self.data is None:
+            shape = values.shape[1:] if len(values) == new else (-1,)
+            self.data = np.empty((self.points,) +
+                                 values.reshape((new,) + shape).shape[1:],
+                                 dtype=self.dtype)
+        # The fetch may return fewer points if the data ended
+        values = values.reshape((-1,) + self.data.shape[1:])
+        new = len(values)
+        available = start + new
+        self.data[start:available] = values
+        self.acquired = available
+        if self.done:
+            self.running = False
+            self.finish()
+        return new
+
+    def result(self):
+        """ Returns the points that are acquired """
+        if self.data is None:
+            return np.empty(0, dtype=self.dtype)
+        return self.data[:self.acquired]
+
+    def wait(self, should_stop=lambda: False, timeout=None):
+        """ Fetches the points until the acquisition is complete
+
+        :param should_stop: A function that returns True to abort the
+                            acquisition
+        :param timeout: Maximum time in seconds, or None to wait indefinitely
+        :returns: Array of the points, which are fewer than :attr:`points`
+                  if the acquisition was aborted or the data ended
+        :raises: TimeoutError if the acquisition is not complete within the
+                 timeout, after aborting it
+        """
+        if timeout is not None:
+            deadline = time.perf_counter() + timeout
+        while not self.done:
+            if should_stop():
+                self.stop()
+                break
+            if self.update():
+                continue
+            if self.ended():
+                log.warning("%r ended after %d of %d points", self,
+                            self.acquired, self.points)
+                self.running = False
+                break
+            if timeout is not None and time.perf_counter() > deadline:
+                self.stop()
+                raise TimeoutError("%d of %d points were acquired within "
+                                   "%g s" % (self.acquired, self.points, timeout))
+            time.sleep(self.interval)
+        return self.result()
+
+    def acquire(self, should_stop=lambda: False, timeout=None):
+        """ Starts the acquisition and waits for all the points, as
+        described in :meth:`wait` """
+        self.start()
+        return self.wait(should_stop, timeout)
+
+    def stream(self, chunk=100):
+        """ Starts the acquisition and returns a
+        :class:`~pymeasure.instruments.stream.Stream` of its points, which
+        are fetched in a background thread
+
+        :param chunk: Number of points in each chunk
+        """
+        return Stream(AcquisitionSource(self), chunk, max(chunk, self.points),
+                      self.points, self.dtype).start()
+
+
+class AcquisitionSource(object):
+    """ Source of a :class:`~pymeasure.instruments.stream.Stream`, which
+    returns the points of a :class:`BufferedAcquisition`
+
+    :param acquisition: The buffered acquisition
+    """
+
+    def __init__(self, acquisition):
+        self.acquisition = acquisition
+
+    def __repr__(self):
+        return "<AcquisitionSource(%r)>" % self.acquisition
+
+    def start(self):
+        self.acquisition.start()
+
+    def fetch(self, stopped):
+        acquisition = self.acquisition
+        new = acquisition.update()
+        if not new:
+            if acquisition.ended():
+                # The stream returns the points that it has and ends
+                stopped.set()
+                return ()
+            stopped.wait(acquisition.interval)
+            return ()
+        return acquisition.data[acquisition.acquired - new:acquisition.acquired]
+
+    def stop(self):
+        self.acquisition.stop()
@@ -28,6 +28,8 @@ from time import time, sleep
 from threading import Event
 from importlib.util import find_spec
 
+from pymeasure.instruments.buffered import BufferedAcquisition
+
 if find_spec('pycomedi'):  # Guard against pycomedi not being installed
     from pycomedi.subdevice import StreamingSubdevice
     from pycomedi.constant import *
@@ -80,17 +82,28 @@ def writeAO(device, channel, voltage, range=None):
     ao.data_write(converter.from_physical(voltage))
 
 
-class SynchronousAI(object):
-        
-    def __init__(self, channels, period, samples): 
+class SynchronousAI(BufferedAcquisition):
+    """ Acquires a number of samples of several analog input channels
+    with a timed command, which are fetched while they are acquired.
+    Subclasses receive each sample by :meth:`emit_data` and the progress
+    by :meth:`emit_progress`.
+
+    :param channels: List of the analog input channels
+    :param period: Total time of the acquisition in seconds
+    :param samples: Number of samples of each channel
+    """
+
+    def __init__(self, channels, period, samples):
         self.channels = channels
         self.samples = samples
         self.period = period
         self.scanPeriod = int(1e9*float(period)/float(samples)) # nano-seconds
-        
+
         self.subdevice = self.channels[0].subdevice
         self.subdevice.cmd = self._command()
-    
+        super().__init__(self.subdevice, samples, dtype=np.float32)
+        self.shape = (len(channels),)
+
     def _command(self):
         """ Returns the command used to initiate and end the sampling
         """
@@ -115,55 +128,89 @@ class SynchronousAI(object):
         for i in range(3):
             rc = self.subdevice.command_test() # Verify command is correct
             if rc == None: break
-        
-    def measure(self, hasAborted=lambda:False):
-        """ Initiates the scan after first checking the command
-        and does not block, returns the starting timestamp
-        """
+
+    def configure(self):
         self._verifyCommand()
         sleep(0.01)
         self.subdevice.command()
-        
-        length = len(self.channels)
-        dtype = self.subdevice.get_dtype()
-        converters = [c.get_converter() for c in self.channels]
-
-        self.data = np.zeros((self.samples, length), dtype=np.float32)
+        self._sample_dtype = np.dtype(self.subdevice.get_dtype())
+        self._converters = [c.get_converter() for c in self.channels]
+        self._scan_size = self._sample_dtype.itemsize * len(self.channels)
+        self._ended = False
 
+    def arm(self):
         # Trigger AI
         self.subdevice.device.do_insn(inttrig_insn(self.subdevice))
-                
-        # Measurement loop
-        count = 0
-        size = int(self.data.itemsize/2)*length
-        previous_bin_slice = b''
-        
-        while not hasAborted() and self.samples > count:
-            bin_slice = previous_bin_slice
-            while len(bin_slice) < size:
-                bin_slice += self.subdevice.device.file.read(size)
-            previous_bin_slice = bin_slice[size:]
-            bin_slice = bin_slice[:size]
-            slice = np.fromstring(
-                bin_slice,
-                dtype=dtype,
-                count=length
-            )
-
-            if len(slice) != length: # Reading finished
+
+    def count(self):
+        available = self.subdevice.get_buffer_contents()
+        return self.acquired + available // self._scan_size
+
+    def fetch(self, start, stop):
+        size = (stop - start) * self._scan_size
+        data = bytearray()
+        while len(data) < size:
+            block = self.subdevice.device.file.read(size - len(data))
+            if not block:
+                # Reading finished before the scans were complete
+                self._ended = True
                 break
+            data += block
+        scans = len(data) // self._scan_size
+        raw = np.frombuffer(bytes(data[:scans * self._scan_size]),
+                            dtype=self._sample_dtype).reshape(
+            scans, len(self.channels))
+        # Convert to physical values
+        return np.column_stack([c.to_physical(raw[:, i])
+                                for i, c in enumerate(self._converters)])
+
+    def abort(self):
+        if self.subdevice.get_flags().running:
+            self.subdevice.cancel()
 
-            # Convert to physical values
-            for i, c in enumerate(converters):
-                self.data[count,i] = c.to_physical(slice[i])
-            
+    def ended(self):
+        if self._ended:
+            return True
+        # The command finished, and no complete scan is left in the buffer
+        return (not self.subdevice.get_flags().running and
+                self.subdevice.get_buffer_contents() < self._scan_size)
+
+    def update(self):
+        new = super().update()
+        for count in range(self.acquired - new, self.acquired):
             self.emit_progress(100.*count/self.samples)
             self.emit_data(self.data[count])
-            count += 1
-            
+        return new
+
+    def emit_progress(self, progress):
+        """ Called before each sample is passed to :meth:`emit_data`
+
+        :param progress: Percentage of the samples that precede it
+        """
+        pass
+
+    def emit_data(self, data):
+        """ Called with each sample as it is fetched
+
+        :param data: Array of the physical values of the channels
+        """
+        pass
+
+    def measure(self, hasAborted=lambda:False, timeout=None):
+        """ Initiates the scan after first checking the command, and
+        fetches the samples into :attr:`data` until the scan is complete,
+        the device stops providing data, or :code:`hasAborted` returns True
+
+        :param hasAborted: A function that returns True to abort the scan
+        :param timeout: Maximum time in seconds, by default the period of
+                        the scan and 10 s more
+        :raises: TimeoutError if the scan is not complete within the timeout
+        """
+        if timeout is None:
+            timeout = float(self.period) + 10
+        self.acquire(hasAborted, timeout)
         # Cancel measurement if it is still running (abort event)
-        if self.subdevice.get_flags().running:             
-            self.subdevice.cancel()
+        self.abort()
                                 
 
 """ Command for limited samples
@@ -24,15 +24,46 @@
 
 import logging
 import re
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from copy import copy
 
 import numpy as np
 
 from pymeasure.adapters import FakeAdapter
-from pymeasure.adapters.visa import VISAAdapter
+from pymeasure.adapters.adapter import parse_values
+from .stream import PollingSource, Stream
+from .validators import prepare_validator
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+# Policies of Instrument.error_check, besides a number of properties
+IMMEDIATE = 'immediate'
+DEFERRED = 'deferred'
+ESR = 'esr'
+
+# Bits of the standard event status register that report errors, which
+# are the query, device dependent, execution and command errors
+ESR_ERRORS = 0x3C
+
+# Guards the creation of the thread-local batch state of the instruments
+_local_lock = threading.Lock()
+
+
+def _is_async(adapter):
+    aio = sys.modules.get('pymeasure.adapters.aio')
+    return aio is not None and isinstance(adapter, aio.AsyncAdapter)
+
+
+def _isfuture(value):
+    # Futures only exist once asyncio is imported, which is slow to import
+    asyncio = sys.modules.get('asyncio')
+    return asyncio is not None and asyncio.isfuture(value)
+
 
 class Instrument(object):
     """ This provides the base class for all Instruments, which is
@@ -43,12 +74,50 @@ class Instrument(object):
     :param adapter: An :class:`Adapter<pymeasure.adapters.Adapter>` object
     :param name: A string name
     :param includeSCPI: A boolean, which toggles the inclusion of standard SCPI commands
+
+    When the adapter is an :class:`AsyncAdapter<pymeasure.adapters.AsyncAdapter>`,
+    reading a property created by :meth:`.control` or :meth:`.measurement`
+    returns an awaitable, and setting a property schedules the write in
+    the running event loop. Other methods of the instrument drivers remain
+    synchronous.
+
+    .. code-block:: python
+
+        async def measure(meters):
+            return await asyncio.gather(*(meter.voltage for meter in meters))
+
+    The errors that properties check with :code:`check_set_errors` and
+    :code:`check_get_errors` are handled according to :attr:`error_check`:
+
+    - :code:`'immediate'` calls :meth:`.check_errors` after each property,
+      or once at the end of a :meth:`.batch`.
+    - :code:`'deferred'` only calls it at the end of a :meth:`.batch` and
+      in :meth:`.check_pending_errors`.
+    - A number *N* calls it after every *N* properties.
+    - :code:`'esr'` follows each command with :code:`*ESR?` in the same
+      message, and calls :meth:`.check_errors` only if the standard event
+      status register reports an error, which is attributed to the command.
+      This requires an instrument that accepts SCPI compound commands.
+
+    .. code-block:: python
+
+        keithley.error_check = 'esr'
     """
 
+    _cache = None
+    # Thread-local state of the batches, which is created on first use
+    _local = None
+
+    #: Policy for the error checks that are requested by the properties
+    error_check = IMMEDIATE
+    # Commands of the properties whose error check is pending
+    _unchecked = ()
+
     # noinspection PyPep8Naming
     def __init__(self, adapter, name, includeSCPI=True, **kwargs):
         try:
             if isinstance(adapter, (int, str)):
+                from pymeasure.adapters.visa import VISAAdapter
                 adapter = VISAAdapter(adapter, **kwargs)
         except ImportError:
             raise Exception("Invalid Adapter provided for Instrument since "
@@ -74,6 +143,37 @@ class Instrument(object):
         self.isShutdown = False
         log.info("Initializing %s." % self.name)
 
+    @property
+    def adapter(self):
+        """ The adapter of the instrument. Within a :meth:`.batch`, its
+        methods that communicate with the instrument raise a
+        :code:`RuntimeError` in the thread of the batch, since they would
+        not be in order with the queued commands.
+        """
+        local = self._local
+        if local is not None and local.batch is not None:
+            return local.guard
+        return self._adapter
+
+    @adapter.setter
+    def adapter(self, adapter):
+        self._adapter = adapter
+
+    @property
+    def _batch(self):
+        # The batch of the current thread, if any
+        local = self._local
+        return None if local is None else local.batch
+
+    def _batch_state(self):
+        local = self._local
+        if local is None:
+            with _local_lock:
+                local = self.__dict__.get('_local')
+                if local is None:
+                    local = self._local = _BatchState()
+        return local
+
     @property
     def id(self):
         """ Requests and returns the identification of the instrument. """
@@ -85,40 +185,378 @@ class Instrument(object):
     # Wrapper functions for the Adapter object
     def ask(self, command):
         """ Writes the command to the instrument through the adapter
-        and returns the read response.
+        and returns the read response. Within :meth:`.batch`, a
+        :class:`~concurrent.futures.Future` of the response is returned.
 
         :param command: command string to be sent to the instrument
         """
-        return self.adapter.ask(command)
+        batch = self._batch
+        if batch is not None:
+            return batch.query(command, str)
+        return self._adapter.ask(command)
 
     def write(self, command):
         """ Writes the command to the instrument through the adapter.
+        Within :meth:`.batch`, the command is sent when the block exits.
 
         :param command: command string to be sent to the instrument
         """
-        self.adapter.write(command)
+        if self._cache is not None:
+            self._cache.written(command)
+        local = self._local
+        if local is not None and local.batch is not None:
+            local.batch.write(command)
+        else:
+            self._adapter.write(command)
 
     def read(self):
         """ Reads from the instrument through the adapter and returns the
         response.
+
+        :raises: RuntimeError within :meth:`.batch`, where the response
+                 belongs to the compound message
         """
-        return self.adapter.read()
+        if self._batch is not None:
+            raise RuntimeError("Instrument.read can not be used within a "
+                               "batch, use ask or values instead")
+        return self._adapter.read()
 
     def values(self, command, **kwargs):
         """ Reads a set of values from the instrument through the adapter,
-        passing on any key-word arguments.
+        passing on any key-word arguments. Within :meth:`.batch`, a
+        :class:`~concurrent.futures.Future` of the values is returned.
         """
-        return self.adapter.values(command, **kwargs)
+        local = self._local
+        if local is not None and local.batch is not None:
+            return local.batch.query(
+                command, lambda response: parse_values(response.strip(), **kwargs))
+        return self._adapter.values(command, **kwargs)
+
+    @contextmanager
+    def batch(self, separator=";"):
+        """ Returns a context manager that combines the commands of the block
+        into a single message, which is sent when the block exits. Queries,
+        including the properties of the instrument, return a
+        :class:`~concurrent.futures.Future` that is resolved from the
+        compound response. Errors are checked once after the message,
+        if any of the properties requested it.
 
-    def binary_values(self, command, header_bytes=0, dtype=np.float32):
-        return self.adapter.binary_values(command, header_bytes, dtype)
+        .. code-block:: python
+
+            with keithley.batch():
+                keithley.source_voltage = 1
+                keithley.compliance_current = 1e-3
+                current = keithley.current
+            print(current.result())
+
+        Nested blocks are combined into the outer block. The commands
+        are joined as written, so they should be valid in sequence, such as
+        SCPI commands with a leading colon.
+
+        The batch only applies to the thread that opened it, so that other
+        threads, such as a :meth:`.stream`, keep communicating directly.
+        Within the block, :meth:`.read`, :meth:`.binary_values` and the
+        methods of the :attr:`adapter` raise a :code:`RuntimeError`.
+
+        :param separator: A string that separates the commands and responses
+        :raises: NotImplementedError if the driver overrides :meth:`.ask` or
+                 :meth:`.values`, whose responses can not be combined
+        """
+        local = self._batch_state()
+        if local.batch is not None:
+            yield local.batch
+            return
+        if not self._can_batch():
+            raise NotImplementedError(
+                "%s overrides ask or values, so its queries can not be "
+                "combined in a batch" % self.__class__.__name__)
+        batch = Batch(separator)
+        local.batch, local.guard = batch, _BatchGuard(self._adapter)
+        try:
+            yield batch
+        except BaseException:
+            batch.cancel()
+            self.invalidate()
+            raise
+        finally:
+            local.batch = local.guard = None
+        try:
+            batch.send(self._adapter)
+        except BaseException:
+            # The cached values of the batch may not have been applied
+            self.invalidate()
+            raise
+        if batch.esr:
+            self._check_esr([(command, future.result())
+                             for command, future in batch.esr])
+        if batch.check_errors:
+            self._unchecked = ()
+            self.check_errors()
+
+    def _can_batch(self):
+        # The drivers that parse the responses of ask or values themselves
+        # would receive futures within a batch
+        cls = type(self)
+        return cls.ask is Instrument.ask and cls.values is Instrument.values
+
+    def get_many(self, names, separator=";"):
+        """ Reads several properties in a single compound query, which is
+        processed by each property as if it had been read on its own.
+
+        .. code-block:: python
+
+            values = keithley.get_many(['source_voltage', 'current'])
+            print(values['current'])
+
+        Within :meth:`.batch`, the values are futures that are resolved
+        when the block exits. Drivers that can not use a batch read the
+        properties one after the other.
+
+        :param names: Names of the properties to read
+        :param separator: A string that separates the commands and responses
+        :returns: Dictionary of the values by name
+        """
+        if self._batch is not None or not self._can_batch():
+            return {name: getattr(self, name) for name in names}
+        with self.batch(separator):
+            results = [(name, getattr(self, name)) for name in names]
+        return {name: value.result() if isinstance(value, Future) else value
+                for name, value in results}
+
+    def set_many(self, values, separator=";"):
+        """ Sets several properties with a single compound command
+
+        .. code-block:: python
+
+            keithley.set_many({'source_mode': 'voltage',
+                               'compliance_current': 1e-3})
+
+        :param values: Dictionary of the values by property name, or a list
+                       of pairs of the name and value to set them in order
+        :param separator: A string that separates the commands
+        """
+        if hasattr(values, 'items'):
+            values = values.items()
+        if not self._can_batch():
+            for name, value in values:
+                setattr(self, name, value)
+            return
+        with self.batch(separator):
+            for name, value in values:
+                setattr(self, name, value)
+
+    def stream(self, quantity, rate=None, chunk=100, size=None, count=None,
+               dtype=np.float64):
+        """ Starts a continuous acquisition of a quantity in a background
+        thread, and returns a :class:`~pymeasure.instruments.stream.Stream`
+        that iterates over chunks of the samples as NumPy arrays.
+
+        .. code-block:: python
+
+            with keithley.stream('current', rate=50, chunk=100) as stream:
+                for currents in stream:
+                    print(currents.mean())
+
+        :param quantity: Name of the measured property
+        :param rate: Number of samples per second, or None for the fastest rate
+        :param chunk: Number of samples in each chunk
+        :param size: Number of samples in the ring buffer, which is ten
+                     chunks by default
+        :param count: Total number of samples, or None to stream until stopped
+        :param dtype: The NumPy data type of the samples
+        """
+        source = self.stream_source(quantity, rate)
+        return Stream(source, chunk, size, count, dtype).start()
+
+    def stream_source(self, quantity, rate=None):
+        """ Returns the source of the samples of :meth:`stream`. This polls
+        the property of the quantity, and is overridden by instruments that
+        can fill a buffer on their own, as described in
+        :mod:`pymeasure.instruments.stream`.
+
+        :param quantity: Name of the measured property
+        :param rate: Number of samples per second, or None for the fastest rate
+        """
+        return PollingSource(self, quantity, rate)
+
+    def enable_cache(self, ttl=None, suppress_writes=False):
+        """ Enables the cache of the properties that are created by
+        :meth:`.control` with :code:`cache=True`. These properties return
+        the value that was last set or read, instead of querying the
+        instrument again.
+
+        With :code:`suppress_writes`, setting any property created by
+        :meth:`.control` or :meth:`.setting` to the value that it was last
+        set to does not write the command again, nor check the errors.
+        Use :meth:`.force_writes` to write the unchanged values.
+
+        A command that is written with :meth:`.write` other than by setting
+        a property, such as those of :meth:`.reset`, :meth:`.clear` and the
+        methods of the instrument drivers, invalidates the whole cache, since
+        it may change the settings. Queries with :meth:`.ask` and
+        :meth:`.values` are assumed not to change the settings, so that a
+        driver method that changes them with a query must call
+        :meth:`.invalidate`.
+
+        :param ttl: Time in seconds after which a cached value is read again
+                    from the instrument, or None to keep it until invalidated
+        :param suppress_writes: Toggles skipping the commands of properties
+                                that are set to their current value
+        :returns: The :class:`ValueCache` of the instrument
+        """
+        if _is_async(self.adapter):
+            raise ValueError("The cache can not be used with asynchronous "
+                             "adapters")
+        self._cache = ValueCache(ttl, suppress_writes)
+        return self._cache
+
+    def disable_cache(self):
+        """ Disables the cache of the properties """
+        self._cache = None
+
+    def invalidate(self, *names):
+        """ Invalidates cached values, so that they are read again from the
+        instrument
+
+        :param names: Names of the properties to invalidate, or none to
+                      invalidate all the properties
+        """
+        if self._cache is None:
+            return
+        if not names:
+            self._cache.invalidate()
+        for name in names:
+            self._cache.invalidate(getattr(type(self), name))
+
+    @contextmanager
+    def force_writes(self):
+        """ Returns a context manager, in which the properties are written
+        even if they are set to an unchanged value
+
+        .. code-block:: python
+
+            with keithley.force_writes():
+                keithley.compliance_current = 1e-3
+        """
+        cache = self._cache
+        if cache is None or not cache.suppress_writes:
+            yield
+            return
+        cache.suppress_writes = False
+        try:
+            yield
+        finally:
+            cache.suppress_writes = True
+
+    def check_pending_errors(self):
+        """ Calls :meth:`.check_errors` if the error check of a property
+        is pending, which is the case with a deferred :attr:`error_check`
+
+        :returns: The errors returned by :meth:`.check_errors`
+        """
+        commands = self._unchecked
+        if not commands:
+            return None
+        self._unchecked = ()
+        errors = self.check_errors()
+        if errors:
+            log.warning("%s reported the errors %r after the commands %r",
+                        self.name, errors, commands)
+        return errors
+
+    def _write_setting(self, key, command, check_set_errors):
+        """ Writes the command of a property setter, unless the same command
+        of that property was written last and writes are suppressed
+        """
+        cache = self._cache
+        if cache is not None:
+            if cache.suppress_writes and cache.last_command(key) == command:
+                return
+            cache.invalidate(key)
+        if (check_set_errors and self.error_check == ESR and
+                self._batch is None and not _is_async(self._adapter)):
+            # The command and the error check take a single round trip
+            esr = int(self.ask("%s;*ESR?" % command))
+            self._check_esr([(command, esr)])
+        else:
+            if cache is not None:
+                cache.expect(command)
+            self.write(command)
+            if check_set_errors:
+                self._request_error_check(command)
+        if cache is not None:
+            cache.record_command(key, command)
+
+    def _request_error_check(self, command):
+        """ Checks the errors after a property, according to
+        :attr:`error_check`
+        """
+        policy = self.error_check
+        batch = self._batch
+        if _is_async(self._adapter):
+            # The queries are scheduled after the command, and the
+            # failures of the check are raised by the flush of the adapter
+            self._adapter.track(self.check_errors_async())
+        elif batch is not None:
+            if policy == ESR:
+                batch.esr.append((command, batch.query("*ESR?", int)))
+            else:
+                batch.check_errors = True
+        elif policy == IMMEDIATE:
+            self.check_errors()
+        elif policy == ESR:
+            self._check_esr([(command, int(self.ask("*ESR?")))])
+        else:
+            self._unchecked += (command,)
+            if policy != DEFERRED and len(self._unchecked) >= policy:
+                self.check_pending_errors()
+
+    def _check_esr(self, results):
+        """ Calls :meth:`.check_errors` if the standard event status
+        register reported an error after any of the commands
+
+        :param results: Pairs of a command and the following register value
+        """
+        failed = [command for command, esr in results if esr & ESR_ERRORS]
+        if not failed:
+            return
+        for command in failed:
+            log.warning("%s reported an error after %r", self.name, command)
+        self.check_errors()
+
+    def _complete_get(self, vals, process, check_get_errors, command=None):
+        """ Processes the values read by a property, which may also be
+        the future of an asynchronous adapter or of a :meth:`.batch`
+        """
+        if _isfuture(vals):
+            return _async_get(self, vals, process, check_get_errors)
+        if self._batch is not None:
+            future = self._batch.then(vals, process)
+            if check_get_errors:
+                self._request_error_check(command)
+            return future
+        if check_get_errors:
+            self._request_error_check(command)
+        return process(vals)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32, **kwargs):
+        """ Reads binary data from the instrument through the adapter,
+        passing on any key-word arguments.
+
+        :raises: RuntimeError within :meth:`.batch`
+        """
+        if self._batch is not None:
+            raise RuntimeError("Instrument.binary_values can not be used "
+                               "within a batch")
+        return self._adapter.binary_values(command, header_bytes, dtype,
+                                           **kwargs)
 
     @staticmethod
     def control(get_command, set_command, docs,
-                validator=lambda v, vs: v, values=(), map_values=False,
-                get_process=lambda v: v, set_process=lambda v: v,
+                validator=None, values=(), map_values=False,
+                get_process=None, set_process=None,
                 check_set_errors=False, check_get_errors=False,
-                **kwargs):
+                cache=False, **kwargs):
         """Returns a property for the class based on the supplied
         commands. This property may be set and read from the
         instrument.
@@ -138,58 +576,23 @@ class Instrument(object):
                             before value mapping, returning the processed value
         :param check_set_errors: Toggles checking errors after setting
         :param check_get_errors: Toggles checking errors after getting
+        :param cache: Toggles caching the value that was last set or read,
+                      when the cache of the instrument is enabled by
+                      :meth:`.enable_cache`. This should only be used for
+                      settings that the instrument keeps exactly as set.
+        :returns: A :class:`Control` descriptor
         """
-
-        if map_values and isinstance(values, dict):
-            # Prepare the inverse values for performance
-            inverse = {v: k for k, v in values.items()}
-
-        def fget(self):
-            vals = self.values(get_command, **kwargs)
-            if check_get_errors:
-                self.check_errors()
-            if len(vals) == 1:
-                value = get_process(vals[0])
-                if not map_values:
-                    return value
-                elif isinstance(values, (list, tuple, range)):
-                    return values[int(value)]
-                elif isinstance(values, dict):
-                    return inverse[value]
-                else:
-                    raise ValueError(
-                        'Values of type `{}` are not allowed '
-                        'for Instrument.control'.format(type(values))
-                    )
-            else:
-                vals = get_process(vals)
-                return vals
-
-        def fset(self, value):
-            value = set_process(validator(value, values))
-            if not map_values:
-                pass
-            elif isinstance(values, (list, tuple, range)):
-                value = values.index(value)
-            elif isinstance(values, dict):
-                value = values[value]
-            else:
-                raise ValueError(
-                    'Values of type `{}` are not allowed '
-                    'for Instrument.control'.format(type(values))
-                )
-            self.write(set_command % value)
-            if check_set_errors:
-                self.check_errors()
-
-        # Add the specified document string to the getter
-        fget.__doc__ = docs
-
-        return property(fget, fset)
+        return Control(get_command, set_command, docs,
+                       validator=validator, values=values,
+                       map_values=map_values, get_process=get_process,
+                       set_process=set_process,
+                       check_set_errors=check_set_errors,
+                       check_get_errors=check_get_errors,
+                       cache=cache, **kwargs)
 
     @staticmethod
     def measurement(get_command, docs, values=(), map_values=None,
-                    get_process=lambda v: v, command_process=lambda c: c,
+                    get_process=None, command_process=None,
                     check_get_errors=False, **kwargs):
         """ Returns a property for the class based on the supplied
         commands. This is a measurement quantity that may only be
@@ -206,41 +609,19 @@ class Instrument(object):
         :param command_process: A function that take a command and allows processing
                             before executing the command, for both getting and setting
         :param check_get_errors: Toggles checking errors after getting
+        :returns: A :class:`Measurement` descriptor
         """
-
-        if map_values and isinstance(values, dict):
-            # Prepare the inverse values for performance
-            inverse = {v: k for k, v in values.items()}
-
-        def fget(self):
-            vals = self.values(command_process(get_command), **kwargs)
-            if check_get_errors:
-                self.check_errors()
-            if len(vals) == 1:
-                value = get_process(vals[0])
-                if not map_values:
-                    return value
-                elif isinstance(values, (list, tuple, range)):
-                    return values[int(value)]
-                elif isinstance(values, dict):
-                    return inverse[value]
-                else:
-                    raise ValueError(
-                        'Values of type `{}` are not allowed '
-                        'for Instrument.measurement'.format(type(values))
-                    )
-            else:
-                return get_process(vals)
-
-        # Add the specified document string to the getter
-        fget.__doc__ = docs
-
-        return property(fget)
+        if command_process is not None:
+            # The command is constant, so it is processed only once
+            get_command = command_process(get_command)
+        return Measurement(get_command, None, docs, values=values,
+                           map_values=map_values, get_process=get_process,
+                           check_get_errors=check_get_errors, **kwargs)
 
     @staticmethod
     def setting(set_command, docs,
-                validator=lambda x, y: x, values=(), map_values=False,
-                set_process=lambda v: v,
+                validator=None, values=(), map_values=False,
+                set_process=None,
                 check_set_errors=False,
                 **kwargs):
         """Returns a property for the class based on the supplied
@@ -258,36 +639,12 @@ class Instrument(object):
         :param set_process: A function that takes a value and allows processing
                             before value mapping, returning the processed value
         :param check_set_errors: Toggles checking errors after setting
+        :returns: A :class:`Setting` descriptor
         """
-
-        if map_values and isinstance(values, dict):
-            # Prepare the inverse values for performance
-            inverse = {v: k for k, v in values.items()}
-
-        def fget(self):
-            raise LookupError("Instrument.setting properties can not be read.")
-
-        def fset(self, value):
-            value = set_process(validator(value, values))
-            if not map_values:
-                pass
-            elif isinstance(values, (list, tuple, range)):
-                value = values.index(value)
-            elif isinstance(values, dict):
-                value = values[value]
-            else:
-                raise ValueError(
-                    'Values of type `{}` are not allowed '
-                    'for Instrument.control'.format(type(values))
-                )
-            self.write(set_command % value)
-            if check_set_errors:
-                self.check_errors()
-
-        # Add the specified document string to the getter
-        fget.__doc__ = docs
-
-        return property(fget, fset)
+        return Setting(None, set_command, docs, validator=validator,
+                       values=values, map_values=map_values,
+                       set_process=set_process,
+                       check_set_errors=check_set_errors, **kwargs)
 
     # TODO: Determine case basis for the addition of this method
     def clear(self):
@@ -310,6 +667,455 @@ class Instrument(object):
         """
         pass
 
+    async def check_errors_async(self):
+        """ Calls :meth:`.check_errors` for an instrument with an
+        :class:`AsyncAdapter<pymeasure.adapters.AsyncAdapter>`. The
+        synchronous check of the driver runs in a worker thread, on a copy
+        of the instrument whose queries are scheduled on the asynchronous
+        adapter, so that it uses the error protocol of the driver and
+        raises its errors as it would synchronously.
+
+        :returns: The errors returned by :meth:`.check_errors`
+        """
+        if type(self).check_errors is Instrument.check_errors:
+            return None
+
+        def check(adapter):
+            instrument = copy(self)
+            instrument._adapter = adapter
+            instrument._local = None
+            return instrument.check_errors()
+
+        return await self._adapter.run_blocking(check)
+
+
+async def _async_get(instrument, vals, process, check_get_errors):
+    """ Completes the property getters of an :class:`Instrument` that uses
+    an :class:`AsyncAdapter<pymeasure.adapters.AsyncAdapter>`
+    """
+    vals = await vals
+    if check_get_errors:
+        await instrument.check_errors_async()
+    return process(vals)
+
+
+# Strategies of the value maps of the properties
+_INDEX = 'index'
+_DICT = 'dict'
+_INVALID = 'invalid'
+
+
+class CommandProperty(object):
+    """ Base class of the descriptors that are returned by
+    :meth:`Instrument.control`, :meth:`Instrument.measurement` and
+    :meth:`Instrument.setting`, which keep the definition of the property
+    and read and write its value
+    """
+
+    # The definition is kept in slots, while the documentation of each
+    # property is its own __doc__, which is stored in the __dict__
+    __slots__ = ('__dict__', 'name', 'get_command', 'set_command', 'validator',
+                 'values', 'map_values', 'get_process', 'set_process',
+                 'check_set_errors', 'check_get_errors', 'cache', 'kwargs',
+                 '_mapping', '_inverse', '_validate', '_simple_read',
+                 '_plain_read', '_simple_write')
+
+    kind = 'Instrument.control'
+
+    def __init__(self, get_command, set_command, docs, validator=None,
+                 values=(), map_values=False, get_process=None,
+                 set_process=None, check_set_errors=False,
+                 check_get_errors=False, cache=False, **kwargs):
+        self.__doc__ = docs
+        self.name = None
+        self.get_command = get_command
+        self.set_command = set_command
+        self.validator = validator
+        self.values = values
+        self.map_values = map_values
+        self.get_process = get_process
+        self.set_process = set_process
+        self.check_set_errors = check_set_errors
+        self.check_get_errors = check_get_errors
+        self.cache = cache
+        self.kwargs = kwargs
+        self._validate = None
+        if validator is not None:
+            try:
+                # The valid values are processed once, if the validator can
+                self._validate = prepare_validator(validator, values)
+            except Exception:
+                # Invalid values raise an error when the property is set
+                self._validate = None
+        # The value map is chosen once, instead of on each access
+        self._inverse = None
+        if not map_values:
+            self._mapping = None
+        elif isinstance(values, (list, tuple, range)):
+            self._mapping = _INDEX
+        elif isinstance(values, dict):
+            self._mapping = _DICT
+            self._inverse = {v: k for k, v in values.items()}
+        else:
+            self._mapping = _INVALID
+        # The reads and writes that need neither the cache nor error checks
+        # take a shorter path, which is chosen once here
+        self._simple_read = not (cache or check_get_errors or kwargs)
+        self._plain_read = get_process is None and self._mapping is None
+        self._simple_write = not check_set_errors
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _find_name(self, owner):
+        # Python 3.5 does not call __set_name__, so that the name is looked
+        # up in the class when the descriptor is accessed on it
+        for cls in owner.__mro__:
+            for name, value in vars(cls).items():
+                if value is self:
+                    self.name = name
+                    return
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            if self.name is None and owner is not None:
+                self._find_name(owner)
+            return self
+        if not self._simple_read:
+            return self.read(instance)
+        vals = instance.values(self.get_command)
+        if type(vals) is not list:
+            # A future of a batch or of an asynchronous adapter
+            return instance._complete_get(vals, self.process, False)
+        if self._plain_read:
+            return vals[0] if len(vals) == 1 else vals
+        return self.process(vals)
+
+    def __repr__(self):
+        return "<%s(name=%r,get_command=%r,set_command=%r)>" % (
+            type(self).__name__, self.name, self.get_command, self.set_command)
+
+    def _invalid_values(self):
+        return ValueError(
+            'Values of type `{}` are not allowed '
+            'for {}'.format(type(self.values), self.kind)
+        )
+
+    def process(self, vals):
+        """ Returns the value of the property from the values read from
+        the instrument
+        """
+        if len(vals) != 1:
+            return vals if self.get_process is None else self.get_process(vals)
+        value = vals[0]
+        if self.get_process is not None:
+            value = self.get_process(value)
+        mapping = self._mapping
+        if mapping is None:
+            return value
+        elif mapping is _INDEX:
+            return self.values[int(value)]
+        elif mapping is _DICT:
+            return self._inverse[value]
+        raise self._invalid_values()
+
+    def command(self, value):
+        """ Returns the command that sets a value, which has been validated """
+        if self.set_process is not None:
+            value = self.set_process(value)
+        mapping = self._mapping
+        if mapping is None:
+            pass
+        elif mapping is _INDEX:
+            value = self.values.index(value)
+        elif mapping is _DICT:
+            value = self.values[value]
+        else:
+            raise self._invalid_values()
+        return self.set_command % value
+
+    def read(self, instance):
+        """ Reads the value of the property from an instrument """
+        if self.cache:
+            cache = instance._cache
+            if cache is not None:
+                return self._read_cached(instance, cache)
+        vals = instance.values(self.get_command, **self.kwargs)
+        if type(vals) is not list:
+            return instance._complete_get(vals, self.process,
+                                          self.check_get_errors,
+                                          self.get_command)
+        if self.check_get_errors:
+            instance._request_error_check(self.get_command)
+        return self.process(vals)
+
+    def _read_cached(self, instance, cache):
+        value = cache.get(self)
+        if value is not ValueCache.MISSING:
+            if instance._batch is not None:
+                future = Future()
+                future.set_result(value)
+                return future
+            return value
+
+        def process_and_store(vals):
+            value = self.process(vals)
+            cache.set(self, value)
+            return value
+
+        vals = instance.values(self.get_command, **self.kwargs)
+        return instance._complete_get(vals, process_and_store,
+                                      self.check_get_errors, self.get_command)
+
+    def write(self, instance, value):
+        """ Validates a value and writes it to an instrument """
+        if self._validate is not None:
+            value = self._validate(value)
+        elif self.validator is not None:
+            value = self.validator(value, self.values)
+        if self._simple_write and instance._cache is None:
+            if self.set_process is not None:
+                instance.write(self.command(value))
+            elif self._mapping is None:
+                instance.write(self.set_command % value)
+            elif self._mapping is _DICT:
+                instance.write(self.set_command % self.values[value])
+            else:
+                instance.write(self.command(value))
+            return
+        command = self.command(value)
+        cache = instance._cache
+        instance._write_setting(self, command, self.check_set_errors)
+        if self.cache and cache is not None:
+            cache.set(self, value)
+
+    def fget(self, instance):
+        """ Reads the property, as the getter of a :class:`property` """
+        return self.__get__(instance, type(instance))
+
+    def fset(self, instance, value):
+        """ Sets the property, as the setter of a :class:`property` """
+        self.__set__(instance, value)
+
+
+class Measurement(CommandProperty):
+    """ Descriptor of :meth:`Instrument.measurement`, which can only be read
+    """
+
+    __slots__ = ()
+
+    kind = 'Instrument.measurement'
+
+    def __set__(self, instance, value):
+        raise AttributeError("can't set attribute")
+
+
+class Control(CommandProperty):
+    """ Descriptor of :meth:`Instrument.control`, which can be read and set
+    """
+
+    __slots__ = ()
+
+    kind = 'Instrument.control'
+
+    __set__ = CommandProperty.write
+
+
+class Setting(CommandProperty):
+    """ Descriptor of :meth:`Instrument.setting`, which can only be set """
+
+    __slots__ = ()
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return super().__get__(instance, owner)
+        raise LookupError("Instrument.setting properties can not be read.")
+
+    __set__ = CommandProperty.write
+
+
+class _BatchState(threading.local):
+    # The batch of an instrument in the current thread, and the guard
+    # that replaces its adapter within the batch
+    batch = None
+    guard = None
+
+
+class _BatchGuard(object):
+    # Stands in for the adapter within a batch, so that direct I/O fails
+    # rather than being sent before the queued commands
+
+    _io = frozenset(('write', 'read', 'ask', 'values', 'binary_values',
+                     'read_bytes', 'read_stb', 'wait_for_event'))
+
+    def __init__(self, adapter):
+        self._adapter = adapter
+
+    def __repr__(self):
+        return "<BatchGuard(%r)>" % self._adapter
+
+    def __getattr__(self, name):
+        if name in self._io:
+            raise RuntimeError("The adapter can not be used directly within "
+                               "Instrument.batch, which queues the commands")
+        return getattr(self._adapter, name)
+
+
+class Batch(object):
+    """ Collects the commands and queries of an :meth:`Instrument.batch`
+    block, and resolves the futures of the queries from the compound
+    response.
+
+    :param separator: A string that separates the commands and responses
+    """
+
+    def __init__(self, separator=";"):
+        self.separator = separator
+        self.commands = []
+        self.queries = []
+        self.check_errors = False
+        # Commands that are followed by *ESR?, with the future of the result
+        self.esr = []
+
+    def write(self, command):
+        """ Adds a command to the message """
+        self.commands.append(command)
+
+    def query(self, command, parse):
+        """ Adds a query to the message and returns a
+        :class:`~concurrent.futures.Future` of its response
+
+        :param command: The query command
+        :param parse: A function that parses the response of the query
+        """
+        future = Future()
+        self.commands.append(command)
+        self.queries.append((future, parse))
+        return future
+
+    def then(self, future, process):
+        """ Returns a future of the result of :code:`process`, which is
+        applied to the result of a query future
+        """
+        result = Future()
+
+        def resolve(done):
+            if done.cancelled():
+                result.cancel()
+                return
+            try:
+                result.set_result(process(done.result()))
+            except Exception as e:
+                result.set_exception(e)
+
+        future.add_done_callback(resolve)
+        return result
+
+    def send(self, adapter):
+        """ Sends the compound message through the adapter and
+        resolves the futures of the queries
+        """
+        if not self.commands:
+            return
+        message = self.separator.join(self.commands)
+        if not self.queries:
+            adapter.write(message)
+            return
+        responses = adapter.ask(message).strip().split(self.separator)
+        if len(responses) != len(self.queries):
+            error = ValueError(
+                "Received %d responses for %d queries in the batch" % (
+                    len(responses), len(self.queries)))
+            for future, parse in self.queries:
+                future.set_exception(error)
+            raise error
+        for (future, parse), response in zip(self.queries, responses):
+            try:
+                future.set_result(parse(response))
+            except Exception as e:
+                future.set_exception(e)
+
+    def cancel(self):
+        """ Cancels the queries, without sending the message """
+        for future, parse in self.queries:
+            future.cancel()
+
+
+class ValueCache(object):
+    """ Values of the cacheable properties of an :class:`Instrument`,
+    which is created by :meth:`Instrument.enable_cache`
+
+    The values and the last command written by each property are stored
+    by its descriptor.
+
+    :param ttl: Time in seconds after which a value expires, or None
+    :param suppress_writes: Toggles skipping unchanged property commands
+    """
+
+    # Returned by get for values that are not cached
+    MISSING = object()
+
+    def __init__(self, ttl=None, suppress_writes=False):
+        self.ttl = ttl
+        self.suppress_writes = suppress_writes
+        self.values = {}
+        self.commands = {}
+        self._expected = None
+
+    def _lookup(self, entries, key):
+        entry = entries.get(key)
+        if entry is None:
+            return self.MISSING
+        value, timestamp = entry
+        if self.ttl is not None and time.monotonic() - timestamp > self.ttl:
+            del entries[key]
+            return self.MISSING
+        return value
+
+    def get(self, key):
+        """ Returns the cached value, or :attr:`MISSING` if it is not
+        cached or has expired
+        """
+        return self._lookup(self.values, key)
+
+    def set(self, key, value):
+        """ Stores the value of a property """
+        self.values[key] = (value, time.monotonic())
+
+    def last_command(self, key):
+        """ Returns the command that a property wrote last, or
+        :attr:`MISSING` if it is not known
+        """
+        return self._lookup(self.commands, key)
+
+    def record_command(self, key, command):
+        """ Stores the command that a property wrote """
+        self.commands[key] = (command, time.monotonic())
+
+    def invalidate(self, key=None):
+        """ Removes the value and command of a property, or all of them """
+        if key is None:
+            self.values.clear()
+            self.commands.clear()
+        else:
+            self.values.pop(key, None)
+            self.commands.pop(key, None)
+
+    def expect(self, command):
+        """ Announces the command of a property that is set, which is
+        written without invalidating the other values
+        """
+        self._expected = command
+
+    def written(self, command):
+        """ Invalidates all the values when a command is written, other
+        than the expected command of a property
+        """
+        if command != self._expected:
+            self.values.clear()
+            self.commands.clear()
+        self._expected = None
+
 
 class FakeInstrument(Instrument):
     """ Provides a fake implementation of the Instrument class
@@ -326,8 +1132,8 @@ class FakeInstrument(Instrument):
 
     @staticmethod
     def control(get_command, set_command, docs,
-                validator=lambda v, vs: v, values=(), map_values=False,
-                get_process=lambda v: v, set_process=lambda v: v,
+                validator=None, values=(), map_values=False,
+                get_process=None, set_process=None,
                 check_set_errors=False, check_get_errors=False,
                 **kwargs):
         """Fake Instrument.control.
@@ -27,11 +27,10 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 from pymeasure.instruments import Instrument
+from pymeasure.instruments.buffered import BufferedAcquisition
 from pymeasure.instruments.validators import truncated_range
-from pymeasure.adapters import PrologixAdapter
 
 import numpy as np
-from time import sleep, time
 
 
 class KeithleyBuffer(object):
@@ -65,6 +64,16 @@ class KeithleyBuffer(object):
         self.write(":TRAC:FEED SENSE;:TRAC:FEED:CONT NEXT;")
         self.check_errors()
 
+    def buffer_acquisition(self, points=64, delay=0):
+        """ Returns a :class:`KeithleyBufferAcquisition`, which configures
+        the buffer as :meth:`config_buffer` and fetches its data once
+        it is full.
+
+        :param points: The number of points in the buffer.
+        :param delay: The delay time in seconds.
+        """
+        return KeithleyBufferAcquisition(self, points, delay)
+
     def is_buffer_full(self):
         """ Returns True if the buffer is full of measurements. """
         status_bit = int(self.ask("*STB?"))
@@ -76,25 +85,27 @@ class KeithleyBuffer(object):
         returns early if the :code:`should_stop` function returns True or
         the timeout is reached before the buffer is full.
 
+        The measurement summary bit of the status byte, which is enabled for
+        service requests by :meth:`config_buffer`, is awaited with
+        :meth:`Adapter.wait_for_event<pymeasure.adapters.Adapter.wait_for_event>`.
+
         :param should_stop: A function that returns True when this function should return early
         :param timeout: A time in seconds after which this function should return early
-        :param interval: A time in seconds for how often to check if the buffer is full
+        :param interval: The longest time in seconds between checks if the buffer is full
+        :raises: TimeoutError if the buffer is not full within the timeout
         """
-        # TODO: Use SRQ initially instead of constant polling
-        #self.adapter.wait_for_srq()
-        t = time()
-        while not self.is_buffer_full():
-            sleep(interval)
-            if should_stop():
-                return
-            if (time()-t)>timeout:
-                raise Exception("Timed out waiting for Keithley buffer to fill.")
+        try:
+            self.adapter.wait_for_event(1, timeout, should_stop,
+                                        max_interval=interval)
+        except TimeoutError:
+            raise TimeoutError("Timed out waiting for Keithley buffer to fill.")
 
     @property
     def buffer_data(self):
         """ Returns a numpy array of values from the buffer. """
         self.write(":FORM:DATA ASCII")
-        return np.array(self.values(":TRAC:DATA?"), dtype=np.float64)
+        return np.asarray(self.values(":TRAC:DATA?", as_array=True),
+                          dtype=np.float64)
 
     def start_buffer(self):
         """ Starts the buffer. """
@@ -108,7 +119,11 @@ class KeithleyBuffer(object):
         """ Aborts the buffering measurement, by stopping the measurement
         arming and triggering sequence. If possible, a Selected Device 
         Clear (SDC) is used. """
-        if type(self.adapter) is PrologixAdapter:
+        try:
+            from pymeasure.adapters.prologix import PrologixAdapter
+        except ImportError:
+            PrologixAdapter = None  # PySerial is not available
+        if PrologixAdapter is not None and type(self.adapter) is PrologixAdapter:
             self.write("++clr")
         else:
             self.write(":ABOR")
@@ -118,3 +133,36 @@ class KeithleyBuffer(object):
         buffer, but does not abort the measurement process.
         """
         self.write(":TRAC:FEED:CONT NEV")
+
+
+class KeithleyBufferAcquisition(BufferedAcquisition):
+    """ Acquires the measurements of a Keithley instrument into its buffer,
+    which is read once it is full. Each point contains the elements that
+    the instrument is configured to store.
+
+    :param instrument: The instrument with a :class:`KeithleyBuffer`
+    :param points: The number of points in the buffer.
+    :param delay: The delay time in seconds.
+    :param interval: The time in seconds between the checks of the count.
+    """
+
+    incremental = False
+
+    def __init__(self, instrument, points=64, delay=0, interval=0.1):
+        super().__init__(instrument, points, interval)
+        self.delay = delay
+
+    def configure(self):
+        self.instrument.config_buffer(self.points, self.delay)
+
+    def arm(self):
+        self.instrument.start_buffer()
+
+    def count(self):
+        return int(float(self.instrument.ask(":TRAC:POIN:ACT?")))
+
+    def fetch(self, start, stop):
+        return self.instrument.buffer_data
+
+    def abort(self):
+        self.instrument.stop_buffer()
@@ -31,10 +31,18 @@ from pymeasure.instruments.validators import (
     truncated_range, truncated_discrete_set,
     strict_discrete_set
 )
-from pymeasure.adapters import VISAAdapter
 from .buffer import KeithleyBuffer
 
 
+def _is_visa(adapter):
+    # The VISA backend is only imported when it is available
+    try:
+        from pymeasure.adapters.visa import VISAAdapter
+    except ImportError:
+        return False
+    return isinstance(adapter, VISAAdapter)
+
+
 class Keithley2000(Instrument, KeithleyBuffer):
     """ Represents the Keithley 2000 Multimeter and provides a high-level
     interface for interacting with the instrument.
@@ -435,7 +443,7 @@ class Keithley2000(Instrument, KeithleyBuffer):
             adapter, "Keithley 2000 Multimeter", **kwargs
         )
         # Set up data transfer format
-        if isinstance(self.adapter, VISAAdapter):
+        if _is_visa(self.adapter):
             self.adapter.config(
                 is_binary=False,
                 datatype='float32',
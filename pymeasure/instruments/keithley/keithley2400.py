@@ -27,7 +27,6 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 from pymeasure.instruments import Instrument, RangeException
-from pymeasure.adapters import PrologixAdapter
 from pymeasure.instruments.validators import truncated_range, strict_discrete_set
 
 from .buffer import KeithleyBuffer
@@ -71,7 +70,8 @@ class Keithley2400(Instrument, KeithleyBuffer):
         can also be used. """,
         validator=strict_discrete_set,
         values={'current':'CURR', 'voltage':'VOLT'},
-        map_values=True
+        map_values=True,
+        cache=True
     )
 
     source_enabled = Instrument.control(
@@ -105,7 +105,8 @@ class Keithley2400(Instrument, KeithleyBuffer):
         """ A floating point property that controls the number of power line cycles
         (NPLC) for the DC current measurements, which sets the integration period 
         and measurement speed. Takes values from 0.01 to 10, where 0.1, 1, and 10 are
-        Fast, Medium, and Slow respectively. """
+        Fast, Medium, and Slow respectively. """,
+        cache=True
     )
     compliance_current = Instrument.control(
         ":SENS:CURR:PROT?", ":SENS:CURR:PROT %g",
@@ -195,7 +196,8 @@ class Keithley2400(Instrument, KeithleyBuffer):
         """ A floating point property that controls the number of power line cycles
         (NPLC) for the 2-wire resistance measurements, which sets the integration period 
         and measurement speed. Takes values from 0.01 to 10, where 0.1, 1, and 10 are
-        Fast, Medium, and Slow respectively. """
+        Fast, Medium, and Slow respectively. """,
+        cache=True
     )
     wires = Instrument.control(
         ":SYSTEM:RSENSE?", ":SYSTEM:RSENSE %d",
@@ -205,7 +207,8 @@ class Keithley2400(Instrument, KeithleyBuffer):
         """,
         validator=strict_discrete_set,
         values={4:1, 2:0},
-        map_values=True
+        map_values=True,
+        cache=True
     )
 
     buffer_points = Instrument.control(
@@ -22,12 +22,247 @@
 # THE SOFTWARE.
 #
 
-import visa
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ResourceRecord(object):
+    """ Result of probing a VISA resource for its identification
+
+    :param resource: VISA resource name
+    :param idn: Identification returned by the instrument, or None
+    :param latency: Time in seconds to open and query the resource
+    :param error: Description of the error that occurred, or None
+    :param timestamp: Time of the probe in seconds since the epoch
+    :param opened: False if the resource could not be opened
+    """
+
+    def __init__(self, resource, idn=None, latency=None, error=None,
+                 timestamp=None, opened=True):
+        self.resource = resource
+        self.idn = idn
+        self.latency = latency
+        self.error = error
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.opened = opened
+
+    def __repr__(self):
+        return "<ResourceRecord(resource='%s',idn=%r,error=%r)>" % (
+            self.resource, self.idn, self.error)
+
+    @property
+    def ok(self):
+        """ True if the resource responded to the query """
+        return self.error is None
+
+    def to_dict(self):
+        """ Returns the record as a dictionary """
+        return {
+            'resource': self.resource,
+            'idn': self.idn,
+            'latency': self.latency,
+            'error': self.error,
+            'timestamp': self.timestamp,
+            'opened': self.opened,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """ Returns a record from a dictionary of :meth:`to_dict` """
+        return cls(**data)
+
+
+def _manager(manager, visa_library):
+    if manager is None:
+        from pymeasure.adapters.visa import get_resource_manager
+        manager = get_resource_manager(visa_library)
+    return manager
+
+
+def probe_resource(manager, resource, timeout=2, query="*IDN?"):
+    """ Opens a VISA resource, queries its identification and closes it
+
+    :param manager: PyVISA ResourceManager
+    :param resource: VISA resource name
+    :param timeout: Timeout in seconds for opening and for the query
+    :param query: Identification query to send
+    :returns: :class:`ResourceRecord` of the resource, which describes the
+              error instead of raising it
+    """
+    start = time.perf_counter()
+    timestamp = time.time()
+    idn = error = None
+    opened = False
+    try:
+        connection = manager.open_resource(
+            resource, open_timeout=int(timeout * 1000))
+        opened = True
+        try:
+            connection.timeout = int(timeout * 1000)
+            idn = connection.query(query).strip()
+        finally:
+            connection.close()
+    except Exception as e:  # Any failure is recorded, so that the scan goes on
+        error = "%s: %s" % (type(e).__name__, e)
+    return ResourceRecord(resource, idn, time.perf_counter() - start, error,
+                          timestamp, opened)
+
+
+def discover_resources(resources=None, timeout=2, max_workers=16,
+                       query="*IDN?", visa_library='', manager=None):
+    """ Probes VISA resources concurrently and returns their identification.
+    A resource that does not respond only delays the scan by its own
+    timeout, instead of stalling the resources that follow it.
+
+    .. code-block:: python
+
+        for record in discover_resources(timeout=1):
+            print(record.resource, record.idn or record.error)
+
+    :param resources: VISA resource names to probe, or None for all the
+                      resources that are listed by the resource manager
+    :param timeout: Timeout in seconds per resource for opening and querying
+    :param max_workers: Maximum number of resources probed at the same time
+    :param query: Identification query to send
+    :param visa_library: VisaLibrary spec string of the resource manager
+    :param manager: PyVISA ResourceManager, by default the one shared with
+                    the :class:`VISAAdapter<pymeasure.adapters.VISAAdapter>`
+    :returns: List of :class:`ResourceRecord` in the order of the resources
+    """
+    manager = _manager(manager, visa_library)
+    if resources is None:
+        resources = manager.list_resources()
+    resources = list(resources)
+    if not resources:
+        return []
+    workers = max(1, min(max_workers, len(resources)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(probe_resource, manager, resource,
+                                   timeout, query)
+                   for resource in resources]
+        return [future.result() for future in futures]
+
+
+class ResourceInventory(object):
+    """ Cache of the :class:`ResourceRecord` of discovered resources,
+    which is optionally stored in a JSON file, so that scripts do not
+    scan all the resources each time they start.
+
+    A record is re-validated only when it is looked up and is older
+    than :code:`max_age` or had failed, by probing that resource again.
+
+    .. code-block:: python
+
+        inventory = ResourceInventory("instruments.json")
+        record = inventory.find("MODEL 2400")[0]
+        sourcemeter = Keithley2400(record.resource)
+
+    :param filename: JSON file of the inventory, or None to keep it in memory
+    :param max_age: Time in seconds after which a record is re-validated
+    :param timeout: Timeout in seconds per resource for probing
+    :param kwargs: Key-word arguments for :func:`discover_resources`
+    """
+
+    def __init__(self, filename=None, max_age=3600, timeout=2, **kwargs):
+        self.filename = filename
+        self.max_age = max_age
+        self.timeout = timeout
+        self.kwargs = kwargs
+        self.records = {}
+        if filename is not None and os.path.exists(filename):
+            self.load()
+
+    def __repr__(self):
+        return "<ResourceInventory(filename=%r,records=%d)>" % (
+            self.filename, len(self.records))
+
+    def load(self):
+        """ Loads the records from the file of the inventory """
+        with open(self.filename) as handle:
+            data = json.load(handle)
+        self.records = {item['resource']: ResourceRecord.from_dict(item)
+                        for item in data}
+
+    def save(self):
+        """ Writes the records to the file of the inventory, if any """
+        if self.filename is None:
+            return
+        with open(self.filename, "w") as handle:
+            json.dump([record.to_dict() for record in self.records.values()],
+                      handle, indent=2)
+
+    def scan(self, resources=None):
+        """ Probes the resources concurrently and replaces their records
+
+        :param resources: VISA resource names to probe, or None for all the
+                          resources that are listed by the resource manager
+        :returns: List of the new :class:`ResourceRecord`
+        """
+        records = discover_resources(resources, self.timeout, **self.kwargs)
+        if resources is None:
+            self.records = {}
+        for record in records:
+            self.records[record.resource] = record
+        self.save()
+        return records
+
+    def is_stale(self, record):
+        """ Returns True if the record needs to be re-validated """
+        return (not record.ok or
+                time.time() - record.timestamp > self.max_age)
+
+    def get(self, resource):
+        """ Returns the record of a resource, which is probed if it is
+        missing or stale
+
+        :param resource: VISA resource name
+        :returns: :class:`ResourceRecord` of the resource
+        """
+        record = self.records.get(resource)
+        if record is None or self.is_stale(record):
+            record = self.scan([resource])[0]
+        return record
+
+    def find(self, pattern):
+        """ Returns the responding resources whose identification matches
+        a regular expression, scanning all the resources if the inventory
+        is empty. Only the matching records are re-validated.
+
+        :param pattern: Regular expression searched in the identification,
+                        ignoring the case
+        :returns: List of :class:`ResourceRecord`
+        """
+        if not self.records:
+            self.scan()
+        regex = re.compile(pattern, re.IGNORECASE)
+        matches = [record for record in list(self.records.values())
+                   if record.idn is not None and regex.search(record.idn)]
+        stale = [record.resource for record in matches
+                 if self.is_stale(record)]
+        if stale:
+            self.scan(stale)
+        return [self.records[record.resource] for record in matches
+                if self.records[record.resource].ok]
+
+    def invalidate(self, resource=None):
+        """ Removes the record of a resource, or all the records
+
+        :param resource: VISA resource name, or None for all the resources
+        """
+        if resource is None:
+            self.records = {}
+        else:
+            self.records.pop(resource, None)
+        self.save()
 
 
 def list_resources():
     """
-    Prints the available resources, and returns a list of VISA resource names
+    Prints the available resources, and returns a tuple of VISA resource
+    names. The resources are probed concurrently by :func:`discover_resources`.
     
     .. code-block:: python
 
@@ -38,23 +273,13 @@ def list_resources():
         dmm = Agilent34410(resources[0])
     
     """
-    rm = visa.ResourceManager()
-    instrs = rm.list_resources()
-    for n, instr in enumerate(instrs):
-        # trying to catch errors in comunication
-        try:
-            res = rm.open_resource(instr)
-            # try to avoid errors from *idn?
-            try:
-                # noinspection PyUnresolvedReferences
-                idn = res.ask('*idn?')[:-1]
-            except visa.Error:
-                idn = "Not known"
-            finally:
-                res.close()
-                print(n, ":", instr, ":", idn)
-        except visa.VisaIOError as e:
-            print(n, ":", instr, ":", "Visa IO Error: check connections")
-            print(e)
-    rm.close()
-    return instrs
+    records = discover_resources()
+    for n, record in enumerate(records):
+        if record.ok:
+            print(n, ":", record.resource, ":", record.idn)
+        elif record.opened:
+            print(n, ":", record.resource, ":", "Not known")
+        else:
+            print(n, ":", record.resource, ":", "Visa IO Error: check connections")
+            print(record.error)
+    return tuple(record.resource for record in records)
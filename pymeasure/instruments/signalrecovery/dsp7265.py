@@ -27,9 +27,10 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 from pymeasure.instruments import Instrument
+from pymeasure.instruments.buffered import BufferedAcquisition
 from pymeasure.instruments.validators import truncated_discrete_set, truncated_range, modular_range, modular_range_bidirectional, strict_discrete_set
 
-from time import sleep
+from time import sleep, time
 import numpy as np
 
 
@@ -250,11 +251,12 @@ class DSP7265(Instrument):
     def gain(self, value):
         self.write("ACGAIN %d" % int(value/10.0))
 
-    def set_buffer(self, points, quantities=['x'], interval=10.0e-3):
+    def set_buffer(self, points, quantities=None, interval=10.0e-3):
+        if quantities is None:
+            quantities = ['x']
         num = 0
         for q in quantities:
             num += self.curve_bits[q]
-        self.points = points
         self.write("CBD %d" % int(num))
         self.write("LEN %d" % int(points))
         # interval in increments of 5ms
@@ -265,31 +267,87 @@ class DSP7265(Instrument):
     def start_buffer(self):
         self.write("TD")
 
+    def buffer_acquisition(self, points, quantities=None, interval=10.0e-3):
+        """ Returns a :class:`DSP7265BufferAcquisition` of the curves
+        of the quantities, as configured by :meth:`set_buffer`, which are
+        :code:`['x']` by default
+        """
+        return DSP7265BufferAcquisition(self, points, quantities, interval)
+
+    @property
+    def buffer_status(self):
+        """ Returns the curve acquisition status, which is 0 if no curve
+        is being acquired, and the number of points that are stored """
+        status = self.values("M")
+        return int(status[0]), int(status[3])
+
+    def get_curve(self, quantity='x', points=None):
+        """ Returns the values of a stored curve as a numpy array
+
+        :param quantity: The quantity of the curve
+        :param points: The number of points, by default those that are
+                       stored according to :attr:`buffer_status`
+        """
+        if points is None:
+            points = self.buffer_status[1]
+        # The curve is dumped with one value per line
+        self.write("DC. %d" % self.curve_bits[quantity])
+        return np.array([float(self.read().replace('\x00', ''))
+                         for _ in range(points)])
+
     def get_buffer(self, quantity='x', timeout=1.00, average=False):
-        count = 0
-        maxCount = int(timeout/0.05)
-        failed = False
-        while int(self.values("M")) != 0:
-            # Sleeping
+        deadline = time() + timeout
+        while self.buffer_status[0] != 0:
+            if time() > deadline:
+                # The curve is not complete, wait longer before asking!
+                return [0.0]
             sleep(0.05)
-            if count > maxCount:
-                # Count reached max value, wait longer before asking!
-                failed = True
-                break
-        if not failed:
-            data = []
-            # Getting data
-            for i in range(self.length):
-                val = self.values("DC. %d" % self.curve_bits[quantity])
-                data.append(val)
-            if average:
-                return np.mean(data)
-            else:
-                return data
+        data = self.get_curve(quantity)
+        if average:
+            return np.mean(data)
         else:
-            return [0.0]
+            return data.tolist()
 
     def shutdown(self):
         log.info("Shutting down %s." % self.name)
         self.voltage = 0.
         self.isShutdown = True
+
+
+class DSP7265BufferAcquisition(BufferedAcquisition):
+    """ Acquires the curves of the DSP 7265, which are transferred once
+    they are complete. Each point contains the values of the quantities.
+
+    :param instrument: The DSP 7265
+    :param points: The number of points
+    :param quantities: The names of the quantities in :attr:`DSP7265.curve_bits`,
+                       which are :code:`['x']` by default
+    :param interval: The time in seconds between the points, in steps of 5 ms
+    """
+
+    incremental = False
+
+    def __init__(self, instrument, points, quantities=None, interval=10.0e-3):
+        super().__init__(instrument, points, interval=0.05)
+        self.quantities = ['x'] if quantities is None else list(quantities)
+        self.sample_interval = interval
+        self.shape = (len(self.quantities),)
+
+    def configure(self):
+        self.instrument.set_buffer(self.points, self.quantities,
+                                   self.sample_interval)
+
+    def arm(self):
+        self.instrument.start_buffer()
+
+    def count(self):
+        return self.instrument.buffer_status[1]
+
+    def fetch(self, start, stop):
+        return np.column_stack([
+            self.instrument.get_curve(quantity, stop)
+            for quantity in self.quantities])[start:stop]
+
+    def abort(self):
+        # Halts the curve acquisition
+        self.instrument.write("HC")
@@ -23,6 +23,7 @@
 #
 
 from pymeasure.instruments import Instrument, discreteTruncate
+from pymeasure.instruments.buffered import BufferedAcquisition
 from pymeasure.instruments.validators import strict_discrete_set, \
     truncated_discrete_set, truncated_range
 
@@ -52,6 +53,12 @@ class SR830(Instrument):
     EXPANSION_VALUES = [1, 10, 100]
     RESERVE_VALUES = ['High Reserve', 'Normal', 'Low Noise']
     CHANNELS = ['X', 'Y', 'R']
+    # Parameters of the SNAP? command by property name
+    SNAP_PARAMETERS = {
+        'x': 1, 'y': 2, 'magnitude': 3, 'theta': 4,
+        'aux_in_1': 5, 'aux_in_2': 6, 'aux_in_3': 7, 'aux_in_4': 8,
+        'frequency': 9,
+    }
     INPUT_CONFIGS = ['A', 'A - B', 'I (1 MOhm)', 'I (100 MOhm)']
     INPUT_GROUNDINGS = ['Float', 'Ground']
     INPUT_COUPLINGS = ['AC', 'DC']
@@ -264,6 +271,31 @@ class SR830(Instrument):
             **kwargs
         )
 
+    def snap(self, *names):
+        """ Reads 2 to 6 values at the same instant with the SNAP? command
+
+        :param names: Names of the values in :attr:`SNAP_PARAMETERS`
+        :returns: List of the values as floats
+        """
+        if not 2 <= len(names) <= 6:
+            raise ValueError("SNAP? reads between 2 and 6 values")
+        parameters = ",".join(str(self.SNAP_PARAMETERS[name]) for name in names)
+        return self.values("SNAP?%s" % parameters)
+
+    def get_many(self, names, separator=";"):
+        """ Reads several properties in a single query, which is
+        :meth:`.snap` if it can read all of them at the same instant
+
+        :param names: Names of the properties to read
+        :param separator: A string that separates the commands and responses
+        :returns: Dictionary of the values by name
+        """
+        names = list(names)
+        if (self._batch is None and 2 <= len(names) <= 6 and
+                all(name in self.SNAP_PARAMETERS for name in names)):
+            return dict(zip(names, self.snap(*names)))
+        return super().get_many(names, separator)
+
     def auto_gain(self):
         self.write("AGAN")
 
@@ -313,7 +345,7 @@ class SR830(Instrument):
     def sample_frequency(self):
         """ Gets the sample frequency in Hz """
         index = int(self.ask("SRAT?"))
-        if index is 14:
+        if index == 14:
             return None  # Trigger
         else:
             return SR830.SAMPLE_FREQUENCIES[index]
@@ -327,7 +359,7 @@ class SR830(Instrument):
         else:
             frequency = discreteTruncate(frequency, SR830.SAMPLE_FREQUENCIES)
             index = SR830.SAMPLE_FREQUENCIES.index(frequency)
-        self.write("SRAT%f" % index)
+        self.write("SRAT%d" % index)
 
     def aquireOnTrigger(self, enable=True):
         self.write("TSTR%d" % enable)
@@ -347,7 +379,7 @@ class SR830(Instrument):
     def is_out_of_range(self):
         """ Returns True if the magnitude is out of range
         """
-        return int(self.ask("LIAS?2")) is 1
+        return int(self.ask("LIAS?2")) == 1
 
     def quick_range(self):
         """ While the magnitude is out of range, increase
@@ -368,46 +400,57 @@ class SR830(Instrument):
         else:
             return int(query)
 
+    def buffer_acquisition(self, points, rate=None, fast=False):
+        """ Returns a :class:`SR830BufferAcquisition` of the two display
+        channels, which resets and starts the buffer itself
+
+        :param points: Number of points to acquire
+        :param rate: Sample frequency in Hz, or None to keep the current one
+        :param fast: If True, the data is also transferred in fast mode
+        """
+        return SR830BufferAcquisition(self, points, rate, fast)
+
     def fill_buffer(self, count, has_aborted=lambda: False, delay=0.001):
-        ch1 = np.empty(count, np.float32)
-        ch2 = np.empty(count, np.float32)
-        currentCount = self.buffer_count
-        index = 0
-        while currentCount < count:
-            if currentCount > index:
-                ch1[index:currentCount] = self.buffer_data(1, index, currentCount)
-                ch2[index:currentCount] = self.buffer_data(2, index, currentCount)
-                index = currentCount
-                time.sleep(delay)
-            currentCount = self.buffer_count
-            if has_aborted():
-                self.pause_buffer()
-                return ch1, ch2
-        self.pauseBuffer()
-        ch1[index:count+1] = self.buffer_data(1, index, count)
-        ch2[index:count+1] = self.buffer_data(2, index, count)
-        return ch1, ch2
+        """ Fetches a number of points from the buffer, which must already
+        be started, and pauses it once the points are acquired or the
+        acquisition is aborted. Use :meth:`buffer_acquisition` to also
+        reset and start the buffer.
+
+        :param count: Number of points
+        :param has_aborted: A function that returns True to stop early
+        :param delay: Time in seconds between the checks of the buffer
+        :returns: Two arrays of the :code:`count` points of channels 1 and 2,
+                  of which only the acquired points are set if the
+                  acquisition was aborted
+        """
+        acquisition = SR830BufferAcquisition(self, count, interval=delay,
+                                             reset_buffer=False,
+                                             start_buffer=False)
+        acquisition.acquire(has_aborted)
+        return acquisition.data[:, 0], acquisition.data[:, 1]
 
     def buffer_measure(self, count, stopRequest=None, delay=1e-3):
-        self.write("FAST0;STRD")
-        ch1 = np.empty(count, np.float64)
-        ch2 = np.empty(count, np.float64)
-        currentCount = self.buffer_count
-        index = 0
-        while currentCount < count:
-            if currentCount > index:
-                ch1[index:currentCount] = self.buffer_data(1, index, currentCount)
-                ch2[index:currentCount] = self.buffer_data(2, index, currentCount)
-                index = currentCount
-                time.sleep(delay)
-            currentCount = self.buffer_count
-            if stopRequest is not None and stopRequest.isSet():
-                self.pauseBuffer()
-                return (0, 0, 0, 0)
-        self.pauseBuffer()
-        ch1[index:count] = self.buffer_data(1, index, count)
-        ch2[index:count] = self.buffer_data(2, index, count)
-        return (ch1.mean(), ch1.std(), ch2.mean(), ch2.std())
+        """ Starts the buffer without resetting it, acquires a number of
+        points, and returns the mean and standard deviation of each channel
+
+        :param count: Number of points
+        :param stopRequest: A :class:`threading.Event` that stops the
+                            acquisition early
+        :param delay: Time in seconds between the checks of the buffer
+        :returns: Tuple of the mean and standard deviation of channel 1
+                  and channel 2, which are zero if the acquisition stopped
+        """
+        acquisition = SR830BufferAcquisition(self, count, interval=delay,
+                                             dtype=np.float64,
+                                             reset_buffer=False)
+        if stopRequest is None:
+            data = acquisition.acquire()
+        else:
+            data = acquisition.acquire(stopRequest.is_set)
+        if not acquisition.done:
+            return (0, 0, 0, 0)
+        return (data[:, 0].mean(), data[:, 0].std(),
+                data[:, 1].mean(), data[:, 1].std())
 
     def pause_buffer(self):
         self.write("PAUS")
@@ -428,7 +471,7 @@ class SR830(Instrument):
             i += 1
             if has_aborted():
                 return False
-        self.pauseBuffer()
+        self.pause_buffer()
 
     def get_buffer(self, channel=1, start=0, end=None):
         """ Aquires the 32 bit floating point data through binary transfer
@@ -443,3 +486,54 @@ class SR830(Instrument):
 
     def trigger(self):
         self.write("TRIG")
+
+
+class SR830BufferAcquisition(BufferedAcquisition):
+    """ Acquires the two display channels of the SR830 into its buffer,
+    which are fetched as rows of two values with binary transfers
+
+    :param instrument: The SR830
+    :param points: Number of points to acquire
+    :param rate: Sample frequency in Hz, or None to keep the current one
+    :param fast: If True, the data is also transferred in fast mode
+    :param interval: Time in seconds between the checks of the count
+    :param dtype: The NumPy data type of the points
+    :param reset_buffer: If True, the buffer is reset before the acquisition
+    :param start_buffer: If True, the buffer is started by the acquisition,
+                         otherwise it must already be started
+    """
+
+    shape = (2,)
+
+    def __init__(self, instrument, points, rate=None, fast=False,
+                 interval=0.01, dtype=np.float32, reset_buffer=True,
+                 start_buffer=True):
+        super().__init__(instrument, points, interval, dtype)
+        self.rate = rate
+        self.fast = fast
+        self.reset_buffer = reset_buffer
+        self.start_buffer = start_buffer
+
+    def configure(self):
+        if self.rate is not None:
+            self.instrument.sample_frequency = self.rate
+        if self.reset_buffer:
+            self.instrument.reset_buffer()
+
+    def arm(self):
+        if self.start_buffer:
+            self.instrument.start_buffer(self.fast)
+
+    def count(self):
+        return self.instrument.buffer_count
+
+    def fetch(self, start, stop):
+        return np.column_stack([
+            self.instrument.get_buffer(channel, start, stop)
+            for channel in (1, 2)])
+
+    def abort(self):
+        self.instrument.pause_buffer()
+
+    def finish(self):
+        self.instrument.pause_buffer()
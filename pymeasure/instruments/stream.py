@@ -0,0 +1,330 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+""" Streaming acquisition of the values of an instrument.
+
+A :class:`Stream` acquires the samples of a source in a background thread
+into a :class:`RingBuffer`, and returns them in chunks of NumPy arrays.
+A source has the methods :code:`start()`, :code:`fetch(stopped)` and
+:code:`stop()`, which are all called from the acquisition thread. The
+:code:`fetch` method waits for new samples and returns them as a sequence,
+which may be empty. Its :code:`stopped` argument is a
+:class:`threading.Event` that is set when the stream is stopped, so that
+any waiting can be interrupted. Drivers with a hardware buffer return such
+a source from :meth:`Instrument.stream_source
+<pymeasure.instruments.Instrument.stream_source>`, while other instruments
+are polled by a :class:`PollingSource`.
+"""
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class RingBuffer(object):
+    """ Preallocated first-in first-out buffer of samples, which discards
+    the oldest samples when it is full
+
+    :param size: Maximum number of samples in the buffer
+    :param dtype: The NumPy data type of the samples
+    :param shape: The shape of each sample, which is a scalar by default
+    """
+
+    def __init__(self, size, dtype=np.float64, shape=()):
+        self.data = np.empty((size,) + tuple(shape), dtype=dtype)
+        self.size = size
+        self.start = 0
+        self.count = 0
+        self.overflows = 0
+
+    def __len__(self):
+        return self.count
+
+    def write(self, samples):
+        """ Appends samples to the buffer
+
+        :param samples: Sequence or array of samples
+        :returns: The number of older samples that were discarded
+        """
+        samples = np.asarray(samples, dtype=self.data.dtype)
+        length = len(samples)
+        if length > self.size:
+            # Only the newest samples fit into the buffer
+            dropped = length - self.size
+            samples = samples[dropped:]
+            length = self.size
+        else:
+            dropped = 0
+        end = (self.start + self.count) % self.size
+        first = min(length, self.size - end)
+        self.data[end:end + first] = samples[:first]
+        self.data[:length - first] = samples[first:]
+        excess = max(0, self.count + length - self.size)
+        self.start = (self.start + excess) % self.size
+        self.count += length - excess
+        dropped += excess
+        self.overflows += dropped
+        return dropped
+
+    def read(self, count=None):
+        """ Removes and returns the oldest samples
+
+        :param count: Maximum number of samples, or None for all the samples
+        :returns: NumPy array of the samples
+        """
+        if count is None or count > self.count:
+            count = self.count
+        first = min(count, self.size - self.start)
+        if first == count:
+            samples = self.data[self.start:self.start + count].copy()
+        else:
+            samples = np.concatenate((self.data[self.start:],
+                                      self.data[:count - first]))
+        self.start = (self.start + count) % self.size
+        self.count -= count
+        return samples
+
+
+class PollingSource(object):
+    """ Source of a :class:`Stream`, which reads a property of an
+    instrument at a constant rate
+
+    :param instrument: The instrument
+    :param quantity: Name of the property to be read
+    :param rate: Number of samples per second, or None to read the
+                 property as fast as possible
+    """
+
+    def __init__(self, instrument, quantity, rate=None):
+        self.instrument = instrument
+        self.quantity = quantity
+        self.rate = rate
+        self._deadline = None
+
+    def __repr__(self):
+        return "<PollingSource(%r,%r,rate=%r)>" % (
+            self.instrument.name, self.quantity, self.rate)
+
+    def start(self):
+        self._deadline = time.perf_counter()
+
+    def fetch(self, stopped):
+        if self.rate is not None:
+            delay = self._deadline - time.perf_counter()
+            if delay > 0 and stopped.wait(delay):
+                return ()
+            # Samples that are late are not caught up on
+            self._deadline = max(self._deadline + 1 / self.rate,
+                                 time.perf_counter())
+        return (getattr(self.instrument, self.quantity),)
+
+    def stop(self):
+        pass
+
+
+class Stream(object):
+    """ Iterator of chunks of the samples of a source, which are acquired
+    in a background thread into a :class:`RingBuffer`. If the chunks are
+    not consumed in time, the oldest samples are discarded and counted by
+    :attr:`overflows`. The stream is an asynchronous iterator as well.
+
+    .. code-block:: python
+
+        with instrument.stream('voltage', rate=100, chunk=50) as stream:
+            for chunk in stream:
+                process(chunk)
+
+    The iteration ends once :code:`count` samples are returned, or after
+    :meth:`stop`, in which case the remaining samples are returned first.
+    An error of the source stops the acquisition, and is raised by the
+    iteration after the samples that were acquired before it.
+
+    :param source: The source of the samples
+    :param chunk: Number of samples in each chunk
+    :param size: Size of the ring buffer, which is ten chunks by default
+    :param count: Total number of samples, or None to stream until stopped
+    :param dtype: The NumPy data type of the samples
+    """
+
+    def __init__(self, source, chunk=100, size=None, count=None,
+                 dtype=np.float64):
+        self.source = source
+        self.chunk = chunk
+        self.size = size or 10 * chunk
+        if self.size < chunk:
+            raise ValueError("The buffer of %d samples can not hold a chunk "
+                             "of %d samples" % (self.size, chunk))
+        self.count = count
+        self.dtype = dtype
+        self.buffer = None
+        self.error = None
+        self._acquired = 0
+        self._returned = 0
+        self._stopped = threading.Event()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._done = False
+        # Samples discarded since the buffer last had room, or 0
+        self._dropping = 0
+
+    def __repr__(self):
+        return "<Stream(%r,chunk=%d)>" % (self.source, self.chunk)
+
+    @property
+    def overflows(self):
+        """ Number of samples that were discarded because the buffer was full
+        """
+        return 0 if self.buffer is None else self.buffer.overflows
+
+    @property
+    def running(self):
+        """ True while the samples are acquired """
+        return self._thread is not None and not self._done
+
+    def start(self):
+        """ Starts the acquisition thread
+
+        :returns: The stream
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """ Stops the acquisition and waits for the thread to finish
+
+        :param timeout: Maximum time in seconds to wait for the thread
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        chunk = self.read()
+        if chunk is None:
+            raise StopIteration
+        return chunk
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # asyncio is only imported by asynchronous code
+        import asyncio
+        loop = asyncio.get_event_loop()
+        chunk = await loop.run_in_executor(None, self.read)
+        if chunk is None:
+            raise StopAsyncIteration
+        return chunk
+
+    def read(self, timeout=None):
+        """ Waits for the next chunk of samples
+
+        :param timeout: Maximum time in seconds to wait, or None
+        :returns: NumPy array of samples, which is shorter than a chunk only
+                  at the end of the stream, or None once the stream has ended
+        :raises: TimeoutError if no chunk is complete within the timeout,
+                 or the error of the source
+        """
+        if self._thread is None:
+            self.start()
+        chunk = self.chunk
+        if self.count is not None:
+            chunk = min(chunk, self.count - self._returned)
+            if chunk <= 0:
+                return None
+        with self._condition:
+            ready = self._condition.wait_for(
+                lambda: (self.buffer is not None and len(self.buffer) >= chunk)
+                or not self.running, timeout)
+            if not ready:
+                raise TimeoutError("No chunk was acquired within %g s" %
+                                   timeout)
+            if self.buffer is None or not len(self.buffer):
+                if self.error is not None:
+                    error, self.error = self.error, None
+                    raise error
+                return None
+            samples = self.buffer.read(chunk)
+        self._returned += len(samples)
+        return samples
+
+    def _run(self):
+        source = self.source
+        stopped = self._stopped
+        try:
+            source.start()
+            try:
+                while not stopped.is_set():
+                    samples = source.fetch(stopped)
+                    if len(samples):
+                        self._store(samples)
+                    if self.count is not None and self._acquired >= self.count:
+                        break
+            finally:
+                source.stop()
+        except Exception as e:
+            log.exception("Streaming from %r failed", source)
+            self.error = e
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def _store(self, samples):
+        if self.count is not None:
+            samples = samples[:self.count - self._acquired]
+        with self._condition:
+            if self.buffer is None:
+                shape = np.shape(samples[0])
+                self.buffer = RingBuffer(self.size, self.dtype, shape)
+            dropped = self.buffer.write(samples)
+            self._acquired += len(samples)
+            self._condition.notify_all()
+        # An overflow is logged once when it starts and once when it ends,
+        # instead of on each store while the buffer stays full
+        if dropped:
+            if not self._dropping:
+                log.warning("%r discards samples, since the chunks are not "
+                            "read in time", self)
+            self._dropping += dropped
+        elif self._dropping:
+            log.info("%r discarded %d samples", self, self._dropping)
+            self._dropping = 0
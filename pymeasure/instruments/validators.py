@@ -23,6 +23,48 @@
 #
 
 
+""" Validators are functions that take a value and the valid values of
+a property, and return a valid value or raise a ValueError.
+
+A validator may also have a :code:`prepare` attribute, which is a function
+that takes the valid values and returns a function of the value alone.
+:func:`Instrument.control <pymeasure.instruments.Instrument.control>` calls
+it once when the property is defined, so that the valid values are not
+processed again each time the property is set. The valid values of such
+properties should therefore not be modified later.
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+
+
+def _prepare_with(prepare):
+    """ Returns a decorator that sets the prepare function of a validator """
+    def decorate(validator):
+        validator.prepare = prepare
+        return validator
+    return decorate
+
+
+def _range_error(value, minimum, maximum):
+    return ValueError('Value of {:g} is not in range [{:g},{:g}]'.format(
+        value, minimum, maximum
+    ))
+
+
+def _prepare_strict_range(values):
+    minimum, maximum = min(values), max(values)
+
+    def validate(value):
+        if minimum <= value <= maximum:
+            return value
+        raise _range_error(value, minimum, maximum)
+
+    return validate
+
+
+@_prepare_with(_prepare_strict_range)
 def strict_range(value, values):
     """ Provides a validator function that returns the value
     if its value is less than the maximum and greater than the
@@ -32,14 +74,50 @@ def strict_range(value, values):
     :param values: A range of values (range, list, etc.)
     :raises: ValueError if the value is out of the range
     """
-    if min(values) <= value <= max(values):
+    minimum, maximum = min(values), max(values)
+    if minimum <= value <= maximum:
         return value
     else:
-        raise ValueError('Value of {:g} is not in range [{:g},{:g}]'.format(
-            value, min(values), max(values)
+        raise _range_error(value, minimum, maximum)
+
+
+def _prepare_strict_discrete_set(values):
+    if isinstance(values, range):
+        members = values  # Ranges are searched without iterating
+    else:
+        items = values.tolist() if isinstance(values, np.ndarray) else values
+        try:
+            members = frozenset(items)
+        except TypeError:
+            members = tuple(items)  # Unhashable values are searched in order
+
+    def validate(value):
+        try:
+            if value in members:
+                return value
+        except TypeError:
+            pass  # An unhashable value is not in the set
+        raise ValueError('Value of {} is not in the discrete set {}'.format(
+            value, values
+        ))
+
+    return validate
+
+
+@_prepare_with(_prepare_strict_discrete_set)
+def _prepare_strict_discrete_set(values):
+
+    def validate(value):
+        if value in values:
+            return value
+        raise ValueError('Value of {} is not in the discrete set {}'.format(
+            value, values
         ))
 
+    return validate
+
 
+@_prepare_with(_prepare_strict_discrete_set)
 def strict_discrete_set(value, values):
     """ Provides a validator function that returns the value
     if it is in the discrete set. Otherwise it raises a ValueError.
@@ -56,6 +134,21 @@ def strict_discrete_set(value, values):
         ))
 
 
+def _prepare_truncated_range(values):
+    minimum, maximum = min(values), max(values)
+
+    def validate(value):
+        if minimum <= value <= maximum:
+            return value
+        elif value > maximum:
+            return maximum
+        else:
+            return minimum
+
+    return validate
+
+
+@_prepare_with(_prepare_truncated_range)
 def truncated_range(value, values):
     """ Provides a validator function that returns the value
     if it is in the range. Otherwise it returns the closest
@@ -64,14 +157,21 @@ def truncated_range(value, values):
     :param value: A value to test
     :param values: A set of values that are valid
     """
-    if min(values) <= value <= max(values):
+    minimum, maximum = min(values), max(values)
+    if minimum <= value <= maximum:
         return value
-    elif value > max(values):
-        return max(values)
+    elif value > maximum:
+        return maximum
     else:
-        return min(values)
+        return minimum
+
 
+def _prepare_modular_range(values):
+    maximum = max(values)
+    return lambda value: value % maximum
 
+
+@_prepare_with(_prepare_modular_range)
 def modular_range(value, values):
     """ Provides a validator function that returns the value
     if it is in the range. Otherwise it returns the value,
@@ -83,6 +183,19 @@ def modular_range(value, values):
     return value % max(values)
 
 
+def _prepare_modular_range_bidirectional(values):
+    maximum = max(values)
+
+    def validate(value):
+        if value > 0:
+            return value % maximum
+        else:
+            return -1 * (abs(value) % maximum)
+
+    return validate
+
+
+@_prepare_with(_prepare_modular_range_bidirectional)
 def modular_range_bidirectional(value, values):
     """ Provides a validator function that returns the value
     if it is in the range. Otherwise it returns the value,
@@ -97,6 +210,21 @@ def modular_range_bidirectional(value, values):
         return -1 * (abs(value) % max(values))
 
 
+def _prepare_truncated_discrete_set(values):
+    if isinstance(values, np.ndarray):
+        ordered = np.sort(values).tolist()
+    else:
+        ordered = sorted(values)
+    last = len(ordered) - 1
+
+    def validate(value):
+        # The first value that is not smaller, found by bisection
+        return ordered[min(bisect_left(ordered, value), last)]
+
+    return validate
+
+
+@_prepare_with(_prepare_truncated_discrete_set)
 def truncated_discrete_set(value, values):
     """ Provides a validator function that returns the value
     if it is in the discrete set. Otherwise, it returns the smallest
@@ -105,14 +233,26 @@ def truncated_discrete_set(value, values):
     :param value: A value to test
     :param values: A set of values that are valid
     """
-    # Force the values to be sorted
-    values = list(values)
-    values.sort()
-    for v in values:
-        if value <= v:
-            return v
+    if isinstance(values, np.ndarray):
+        larger = values[values >= value]
+        return larger.min() if larger.size else values.max()
+    larger = [v for v in values if value <= v]
+    if larger:
+        return min(larger)
+    return max(values)
 
-    return values[-1]
+
+def prepare_validator(validator, values):
+    """ Returns a function that validates a value against the valid
+    values, which are processed once if the validator supports it
+
+    :param validator: A validator function
+    :param values: The valid values
+    """
+    prepare_values = getattr(validator, 'prepare', None)
+    if prepare_values is not None:
+        return prepare_values(values)
+    return lambda value: validator(value, values)
 
 
 def joined_validators(*validators):
@@ -129,6 +269,22 @@ def joined_validators(*validators):
                 pass
         raise ValueError("Value of {} not in chained validator set".format(value))
 
+    def prepare_joined(values):
+        prepared = [prepare_validator(validator, vals)
+                    for validator, vals in zip(validators, values)]
+
+        def validate_prepared(value):
+            for validator in prepared:
+                try:
+                    return validator(value)
+                except (ValueError, TypeError):
+                    pass
+            raise ValueError(
+                "Value of {} not in chained validator set".format(value))
+
+        return validate_prepared
+
+    validate.prepare = prepare_joined
     return validate
 
 
@@ -0,0 +1,177 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import random
+import re
+from collections import deque
+
+import numpy as np
+
+from ..adapters.adapter import Adapter
+from ..adapters.block import block_dtype, parse_block
+from .clock import RealClock
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class SimulatedAdapter(Adapter):
+    """ Programmable fake adapter, which responds to commands from a
+    mapping of regular expressions to responses, a function of the
+    command, or a :class:`Model<pymeasure.simulation.Model>`.
+
+    A response can be a string, bytes such as an IEEE 488.2 block, a NumPy
+    array, an exception that is raised when the response is read, or a
+    function of the regular expression match that returns one of these.
+    Commands without response, such as settings, are mapped to None or
+    are not matched at all. Each response is queued until it is read.
+
+    .. code-block:: python
+
+        adapter = SimulatedAdapter({
+            r"VOLT (.*)": None,
+            r"READ\\?": "1.5",
+            r"TRACE\\?": np.arange(1000, dtype=np.float32),
+            r"SYST:ERR\\?": lambda match: '0,"No error"',
+            r"BAD\\?": TimeoutError("Instrument did not respond"),
+        }, latency=0.01, jitter=0.002, clock=VirtualClock())
+
+    Every write and read lasts the latency, with Gaussian jitter of the
+    given standard deviation, or a time drawn from a function. With a
+    :class:`VirtualClock<pymeasure.simulation.VirtualClock>`, the time
+    advances without waiting.
+
+    :param responses: Dictionary of regular expressions that match
+                      complete commands to responses, a function that
+                      returns the response to a command, or a Model
+    :param latency: Time in seconds of each write and read, or a function
+                    without arguments that returns the time
+    :param jitter: Standard deviation in seconds of the latency
+    :param clock: Clock that is used to wait, which defaults to real time
+    :param seed: Seed of the random jitter, for reproducible timing
+    """
+
+    def __init__(self, responses=None, latency=0., jitter=0., clock=None,
+                 seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.clock = clock or RealClock()
+        self.random = random.Random(seed)
+        self.pending = deque()
+        self.commands = []
+        self.model = None
+        self.patterns = []
+        if hasattr(responses, 'handle'):
+            self.model = responses
+        elif callable(responses):
+            self.lookup = responses
+        else:
+            self.patterns = [(re.compile(pattern), response)
+                             for pattern, response in (responses or {}).items()]
+
+    def __repr__(self):
+        return "<SimulatedAdapter(clock=%r)>" % self.clock
+
+    def lookup(self, command):
+        """ Returns the response to a command, or None if it has
+        no response
+
+        :param command: SCPI command string that was written
+        """
+        if self.model is not None:
+            response, latency = self.model.handle(command)
+            self.clock.sleep(latency)
+            return response
+        for regex, response in self.patterns:
+            match = regex.fullmatch(command)
+            if match is not None:
+                return response(match) if callable(response) else response
+        return None
+
+    def _wait(self):
+        latency = self.latency() if callable(self.latency) else self.latency
+        if self.jitter:
+            latency = max(0., self.random.gauss(latency, self.jitter))
+        self.clock.sleep(latency)
+
+    def write(self, command):
+        """ Writes a command, and queues its response to be read
+
+        :param command: SCPI command string to be sent to the instrument
+        """
+        self._wait()
+        self.commands.append(command)
+        response = self.lookup(command)
+        if response is not None:
+            self.pending.append(response)
+
+    def _next(self):
+        self._wait()
+        if not self.pending:
+            raise TimeoutError("SimulatedAdapter has no response to read")
+        response = self.pending.popleft()
+        if isinstance(response, BaseException) or (
+                isinstance(response, type) and
+                issubclass(response, BaseException)):
+            raise response
+        return response
+
+    def read(self):
+        """ Reads the oldest queued response
+
+        :returns: String ASCII response, where bytes are decoded and
+                  arrays are separated by commas
+        :raises: TimeoutError if there is no response, or the exception of
+                 the response
+        """
+        response = self._next()
+        if isinstance(response, (bytes, bytearray)):
+            return bytes(response).decode()
+        if isinstance(response, np.ndarray):
+            return ",".join(str(value) for value in response.tolist())
+        return str(response)
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
+        """ Writes a command and returns its response as a NumPy array, which
+        is decoded from bytes, or converted to the data type from an array
+
+        :param command: SCPI command to be sent to the instrument
+        :param header_bytes: Integer number of bytes to ignore in header
+        :param dtype: The NumPy data type to format the values with
+        :param ieee_header: If True, bytes are parsed as an IEEE 488.2 block
+        :param is_big_endian: True for big endian, False for little endian,
+                              or None to keep the byte order of the dtype
+        :returns: NumPy array of values
+        """
+        with self.lock:
+            self.write(command)
+            response = self._next()
+            dtype = block_dtype(dtype, is_big_endian)
+            if isinstance(response, (bytes, bytearray)):
+                if ieee_header:
+                    return parse_block(response, dtype)
+                return np.frombuffer(response, dtype=dtype, offset=header_bytes)
+            return np.asarray(response, dtype=dtype)
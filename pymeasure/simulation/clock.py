@@ -0,0 +1,74 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import threading
+import time
+
+
+class VirtualClock(object):
+    """ Clock whose time only advances when it sleeps, so that simulated
+    latencies are accounted for without waiting. This allows long
+    procedures to be run quickly, while their timing remains realistic.
+
+    :param start: Initial time in seconds
+    """
+
+    def __init__(self, start=0.):
+        self._time = start
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "<VirtualClock(time=%g)>" % self._time
+
+    def time(self):
+        """ Returns the current time in seconds """
+        return self._time
+
+    def sleep(self, seconds):
+        """ Advances the time without waiting
+
+        :param seconds: Time in seconds to advance
+        """
+        if seconds > 0:
+            with self._lock:
+                self._time += seconds
+
+
+class RealClock(object):
+    """ Clock of the real time, which waits when it sleeps """
+
+    def __repr__(self):
+        return "<RealClock>"
+
+    def time(self):
+        """ Returns the current time in seconds """
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        """ Waits for a time
+
+        :param seconds: Time in seconds to wait
+        """
+        if seconds > 0:
+            time.sleep(seconds)
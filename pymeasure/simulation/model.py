@@ -0,0 +1,174 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import re
+import threading
+from collections import deque
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+NO_ERROR = '0,"No error"'
+UNDEFINED_HEADER = '-113,"Undefined header"'
+
+
+class Rule(object):
+    """ Declares how a simulated instrument handles a command. The command
+    is matched by a regular expression, ignoring the case and a leading
+    colon, and the named groups of the match are stored in the state.
+
+    :param pattern: Regular expression that matches the complete command
+    :param response: Format string of the response, with the state as
+                     key-word arguments, a function of the model and the
+                     match that returns the response, or None for commands
+                     without response
+    :param latency: Time in seconds to respond, or None for the latency
+                    of the model
+    """
+
+    def __init__(self, pattern, response=None, latency=None):
+        self.regex = re.compile(pattern, re.IGNORECASE)
+        self.response = response
+        self.latency = latency
+
+    def __repr__(self):
+        return "<Rule(pattern=%r)>" % self.regex.pattern
+
+
+def setting(query, command, key):
+    """ Returns the rules of a setting, which is read by a query and
+    written by a command followed by the value, for example
+    :code:`setting("SOUR:VOLT?", "SOUR:VOLT:LEV", "source_voltage")`
+
+    :param query: Query that returns the setting
+    :param command: Command that precedes the new value
+    :param key: Key of the setting in the state
+    """
+    return [
+        Rule(re.escape(query.lstrip(":")), "{%s}" % key),
+        Rule(r"%s\s*(?P<%s>[^?\s].*)" % (re.escape(command.lstrip(":")), key)),
+    ]
+
+
+class Model(object):
+    """ Declarative model of an instrument, which responds to messages
+    like the instrument. Each message can contain several commands
+    separated by semicolons, whose responses are joined by semicolons.
+
+    Besides its rules, the model implements :code:`*IDN?`, :code:`*RST`,
+    :code:`*CLS`, :code:`*OPC?`, the error queue, and :code:`*STB?`, which
+    returns :code:`status_byte` of the state. Unknown commands
+    are ignored, while unknown queries add an error to the queue
+    and are not answered.
+
+    .. code-block:: python
+
+        model = Model([
+            Rule(r"READ\\?", "{reading}"),
+            *setting("SOUR:VOLT?", "SOUR:VOLT", "voltage"),
+        ], state={'reading': "1.5", 'voltage': "0"}, latency=0.001)
+
+    :param rules: List of :class:`Rule` objects, where the first matching
+                  rule handles a command
+    :param state: Dictionary of the initial state, which is restored
+                  by :code:`*RST`
+    :param latency: Time in seconds to respond to each command
+    :param name: Identification returned by :code:`*IDN?`
+    """
+
+    def __init__(self, rules, state=None, latency=0., name="PyMeasure,Model"):
+        self.name = name
+        self.latency = latency
+        self.defaults = dict(state or {})
+        self.defaults.setdefault('idn', name)
+        self.defaults.setdefault('status_byte', "0")
+        self.state = dict(self.defaults)
+        self.errors = deque()
+        self.lock = threading.Lock()
+        self.rules = list(rules) + [
+            Rule(r"\*IDN\?", "{idn}"),
+            Rule(r"\*RST", lambda model, match: model.reset()),
+            Rule(r"\*CLS", lambda model, match: model.errors.clear()),
+            Rule(r"\*OPC\?", "1"),
+            Rule(r"\*STB\?", "{status_byte}"),
+            Rule(r"(SYST(EM)?:ERR(OR)?|STAT(US)?:QUE(UE)?)(:NEXT)?\?",
+                 lambda model, match: model.next_error()),
+        ]
+
+    def __repr__(self):
+        return "<Model(name='%s')>" % self.name
+
+    def reset(self):
+        """ Restores the initial state """
+        self.state = dict(self.defaults)
+
+    def status_byte(self):
+        """ Returns the status byte of the instrument """
+        return int(self.state['status_byte'])
+
+    def next_error(self):
+        """ Returns and removes the oldest error of the queue """
+        return self.errors.popleft() if self.errors else NO_ERROR
+
+    def handle(self, message):
+        """ Handles a message and returns the response
+
+        :param message: String of one or more commands
+        :returns: A tuple of the response, or None if there is no response,
+                  and the time in seconds to respond
+        """
+        responses = []
+        latency = 0.
+        with self.lock:
+            for command in message.split(";"):
+                command = command.strip().lstrip(":")
+                if not command:
+                    continue
+                response, rule_latency = self._handle(command)
+                latency += rule_latency
+                if response is not None:
+                    responses.append(str(response))
+        return (";".join(responses) if responses else None), latency
+
+    def _handle(self, command):
+        for rule in self.rules:
+            match = rule.regex.fullmatch(command)
+            if match is not None:
+                break
+        else:
+            if "?" in command:
+                self.errors.append(UNDEFINED_HEADER)
+            log.debug("%r ignored the unknown command %r", self, command)
+            return None, self.latency
+        for key, value in match.groupdict().items():
+            if value is not None:
+                self.state[key] = value
+        response = rule.response
+        if callable(response):
+            response = response(self, match)
+        elif response is not None:
+            response = response.format(**self.state)
+        latency = self.latency if rule.latency is None else rule.latency
+        return response, latency
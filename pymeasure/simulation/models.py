@@ -0,0 +1,160 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+""" Models of common instruments, which implement the commands of their
+drivers in :mod:`pymeasure.instruments`. Each function returns a new
+:class:`Model<pymeasure.simulation.Model>`, whose latency can be set to
+mimic the instrument.
+"""
+
+import math
+
+from .model import Model, Rule, setting
+
+
+def keithley2000(latency=0.):
+    """ Returns a model of the Keithley 2000 multimeter, which reads the
+    value of :code:`reading` in the state
+
+    :param latency: Time in seconds to respond to each command
+    """
+    rules = [
+        Rule(r"CONF\?", '"{mode}"'),
+        Rule(r"CONF:(?P<mode>.+)"),
+        Rule(r"(READ|FETC|MEAS(:\S+)?)\?", "{reading}"),
+        Rule(r"SYST:BEEP:STAT\?", "{beep_state}"),
+        Rule(r"SYST:BEEP:STAT (?P<beep_state>\d)"),
+    ]
+    for function in ["VOLT", "VOLT:AC", "CURR", "CURR:AC", "RES", "FRES"]:
+        key = function.lower().replace(":", "_")
+        for name in ["RANG", "NPLC", "DIG", "REF"]:
+            rules += setting("SENS:%s:%s?" % (function, name),
+                             "SENS:%s:%s" % (function, name),
+                             "%s_%s" % (key, name.lower()))
+    state = {'mode': "VOLT:DC", 'reading': "+1.000000E-03", 'beep_state': "1"}
+    for key in ["volt", "volt_ac", "curr", "curr_ac", "res", "fres"]:
+        state.update({key + '_rang': "1", key + '_nplc': "1",
+                      key + '_dig': "6", key + '_ref': "0"})
+    return Model(rules, state, latency,
+                 name="KEITHLEY INSTRUMENTS INC.,MODEL 2000,0,A19")
+
+
+def _keithley2400_read(model, match):
+    # The voltage and current follow from the source and the load resistance
+    state = model.state
+    resistance = float(state['load'])
+    if state['output'] != "1":
+        voltage = current = 0.
+    elif state['source'].upper().startswith("VOLT"):
+        voltage = float(state['source_voltage'])
+        current = voltage / resistance
+    else:
+        current = float(state['source_current'])
+        voltage = current * resistance
+    return "%E,%E,%E,%E,%E" % (voltage, current, resistance, 0., 0.)
+
+
+def keithley2400(latency=0.):
+    """ Returns a model of the Keithley 2400 SourceMeter, which sources
+    into a resistance given by :code:`load` in the state
+
+    :param latency: Time in seconds to respond to each command
+    """
+    rules = [
+        Rule(r"READ\?", _keithley2400_read),
+        Rule(r"OUTP(UT)?\?", "{output}"),
+        Rule(r"OUTP(UT)? (?P<output>[01])"),
+        Rule(r"OUTP(UT)? ON", lambda model, match: model.state.update(output="1")),
+        Rule(r"OUTP(UT)? OFF", lambda model, match: model.state.update(output="0")),
+        *setting("SOUR:FUNC?", "SOUR:FUNC", "source"),
+        *setting("SOUR:VOLT?", "SOUR:VOLT:LEV", "source_voltage"),
+        *setting("SOUR:CURR?", "SOUR:CURR:LEV", "source_current"),
+        *setting("SENS:VOLT:PROT?", "SENS:VOLT:PROT", "compliance_voltage"),
+        *setting("SENS:CURR:PROT?", "SENS:CURR:PROT", "compliance_current"),
+        *setting("TRIG:COUN?", "TRIG:COUN", "trigger_count"),
+        *setting("TRIG:SEQ:DEL?", "TRIG:SEQ:DEL", "trigger_delay"),
+    ]
+    for function in ["VOLT", "CURR", "RES"]:
+        for name in ["RANG", "NPLC"]:
+            rules += setting("SENS:%s:%s?" % (function, name),
+                             "SENS:%s:%s" % (function, name),
+                             "%s_%s" % (function.lower(), name.lower()))
+    state = {
+        'output': "0", 'source': "VOLT", 'load': "1E3",
+        'source_voltage': "0", 'source_current': "0",
+        'compliance_voltage': "21", 'compliance_current': "1.05E-4",
+        'trigger_count': "1", 'trigger_delay': "0",
+    }
+    for key in ["volt", "curr", "res"]:
+        state.update({key + '_rang': "1", key + '_nplc': "1"})
+    return Model(rules, state, latency,
+                 name="KEITHLEY INSTRUMENTS INC.,MODEL 2400,0,C30")
+
+
+def _sr830_outputs(model):
+    # Outputs 1 to 4 are X, Y, R and theta
+    x, y = float(model.state['x']), float(model.state['y'])
+    return {1: x, 2: y, 3: math.hypot(x, y), 4: math.degrees(math.atan2(y, x)),
+            9: float(model.state['frequency'])}
+
+
+def sr830(latency=0.):
+    """ Returns a model of the SR830 lock-in amplifier, which measures
+    the values of :code:`x` and :code:`y` in the state
+
+    :param latency: Time in seconds to respond to each command
+    """
+    rules = [
+        Rule(r"OUTP\?\s*(?P<output>\d)", lambda model, match: "%E" % (
+            _sr830_outputs(model)[int(match.group('output'))])),
+        Rule(r"SNAP\?\s*(?P<outputs>[\d,]+)", lambda model, match: ",".join(
+            "%E" % _sr830_outputs(model)[int(i)]
+            for i in match.group('outputs').split(","))),
+        *setting("SLVL?", "SLVL", "sine_voltage"),
+        *setting("FREQ?", "FREQ", "frequency"),
+        *setting("PHAS?", "PHAS", "phase"),
+        *setting("SENS?", "SENS", "sensitivity"),
+        *setting("OFLT?", "OFLT", "time_constant"),
+        *setting("OFSL?", "OFSL", "filter_slope"),
+        *setting("HARM?", "HARM", "harmonic"),
+        *setting("ISRC?", "ISRC", "input_config"),
+        *setting("IGND?", "IGND", "input_grounding"),
+        *setting("ICPL?", "ICPL", "input_coupling"),
+        *setting("ILIN?", "ILIN", "input_notch_config"),
+        *setting("FMOD?", "FMOD", "reference_source"),
+        *setting("RMOD?", "RMOD", "reserve"),
+        *setting("SRAT?", "SRAT", "sample_frequency"),
+        Rule(r"SPTS\?", "0"),
+        Rule(r"LIAS\?\s*\d", "0"),
+    ]
+    state = {
+        'x': "1E-3", 'y': "0", 'sine_voltage': "1.000", 'frequency': "1000",
+        'phase': "0", 'sensitivity': "26", 'time_constant': "10",
+        'filter_slope': "3", 'harmonic': "1", 'input_config': "0",
+        'input_grounding': "0", 'input_coupling': "0",
+        'input_notch_config': "0", 'reference_source': "1", 'reserve': "1",
+        'sample_frequency': "4",
+    }
+    return Model(rules, state, latency,
+                 name="Stanford_Research_Systems,SR830,s/n00000,ver1.07")
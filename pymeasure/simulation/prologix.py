@@ -0,0 +1,90 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+VERSION = "Prologix GPIB-USB Controller version 6.107"
+
+
+class PrologixController(object):
+    """ Simulates a Prologix GPIB controller with instrument models at
+    GPIB addresses. Messages that start with :code:`++` configure the
+    controller, and other messages are handled by the model at the
+    selected address. The responses are kept until :code:`++read`,
+    as with :code:`++auto 0`. The SRQ line is asserted while the request
+    service bit of a status byte is set, and :code:`++spoll` returns the
+    status byte.
+
+    :param models: Dictionary of the :class:`Model<pymeasure.simulation.Model>`
+                   objects by their integer GPIB address
+    """
+
+    def __init__(self, models):
+        self.models = dict(models)
+        self.address = None
+        self.responses = {}
+
+    def __repr__(self):
+        return "<PrologixController(addresses=%s)>" % sorted(self.models)
+
+    def handle(self, message):
+        """ Handles a message and returns the response
+
+        :param message: String of a controller command, or of commands
+                        to the instrument at the selected address
+        :returns: A tuple of the response, or None if there is no response,
+                  and the time in seconds to respond
+        """
+        if message.startswith("++"):
+            return self._controller(message[2:].split()), 0.
+        model = self.models.get(self.address)
+        if model is None:
+            log.debug("%r has no instrument at address %s", self, self.address)
+            return None, 0.
+        response, latency = model.handle(message)
+        if response is not None:
+            self.responses[self.address] = response
+        return None, latency
+
+    def _controller(self, arguments):
+        command = arguments[0].lower() if arguments else ""
+        if command == "addr":
+            if len(arguments) > 1:
+                self.address = int(arguments[1])
+                return None
+            return str(self.address)
+        if command == "read":
+            return self.responses.pop(self.address, None)
+        if command == "ver":
+            return VERSION
+        if command == "srq":
+            return "1" if any(model.status_byte() & 64
+                              for model in self.models.values()) else "0"
+        if command == "spoll":
+            address = int(arguments[1]) if len(arguments) > 1 else self.address
+            return str(self.models[address].status_byte())
+        return None  # Other settings are accepted
@@ -0,0 +1,214 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import logging
+import os
+import select
+import socket
+import time
+
+from ..thread import StoppableThread
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class SimulatedServer(StoppableThread):
+    """ Base class of the servers that expose an instrument model over a
+    connection, in a daemon thread. Each message ends with the read
+    termination, and each response with the write termination.
+
+    :param model: A :class:`Model<pymeasure.simulation.Model>` or
+                  :class:`PrologixController<pymeasure.simulation.PrologixController>`
+    :param read_termination: String that terminates the received messages
+    :param write_termination: String appended to each response
+    :param poll_interval: Time in seconds between checks for a stop request
+    """
+
+    def __init__(self, model, read_termination="\n", write_termination="\n",
+                 poll_interval=0.05):
+        super().__init__()
+        self.daemon = True
+        self.model = model
+        self.read_termination = read_termination.encode()
+        self.write_termination = write_termination.encode()
+        self.poll_interval = poll_interval
+        self.messages = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+        self.join(1)
+        self.close()
+
+    def close(self):
+        """ Closes the connection of the server """
+        pass
+
+    def respond(self, message):
+        """ Returns the response to a message, after the latency of the model
+
+        :param message: String of the received message
+        :returns: Bytes of the response, or None if there is no response
+        """
+        self.messages += 1
+        response, latency = self.model.handle(message)
+        if latency:
+            time.sleep(latency)
+        if response is None:
+            return None
+        return response.encode() + self.write_termination
+
+    def serve(self, receive, send):
+        """ Handles the received messages until the connection is closed
+        or the server is stopped
+
+        :param receive: Function that returns the received bytes, None
+                        if nothing was received within the poll interval,
+                        or empty bytes if the connection is closed
+        :param send: Function that sends bytes
+        """
+        buffer = bytearray()
+        termination = self.read_termination
+        while not self.should_stop():
+            data = receive()
+            if data is None:
+                continue
+            if not data:
+                break
+            buffer += data
+            index = buffer.find(termination)
+            while index >= 0:
+                message = buffer[:index].decode().rstrip("\r")
+                del buffer[:index + len(termination)]
+                response = self.respond(message)
+                if response is not None:
+                    send(response)
+                index = buffer.find(termination)
+
+
+class SocketServer(SimulatedServer):
+    """ Serves an instrument model over a raw TCP socket, like an LXI
+    instrument on port 5025. Clients are served one after the other.
+
+    .. code-block:: python
+
+        with SocketServer(keithley2000()) as server:
+            meter = Keithley2000(SocketAdapter(server.host, server.port))
+
+    :param model: A :class:`Model<pymeasure.simulation.Model>`
+    :param host: Host name or IP address to listen on
+    :param port: TCP port to listen on, or 0 for a free port
+    :param kwargs: Key-word arguments of the :class:`SimulatedServer`
+    """
+
+    def __init__(self, model, host="127.0.0.1", port=0, **kwargs):
+        super().__init__(model, **kwargs)
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind((host, port))
+        self.listener.listen(1)
+        self.listener.settimeout(self.poll_interval)
+        self.host, self.port = self.listener.getsockname()
+
+    def __repr__(self):
+        return "<SocketServer(host='%s',port=%d)>" % (self.host, self.port)
+
+    def close(self):
+        """ Stops listening for connections """
+        self.listener.close()
+
+    def run(self):
+        while not self.should_stop():
+            try:
+                connection, address = self.listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break  # The listener is closed
+            log.debug("%r accepted a connection from %s", self, address)
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection.settimeout(self.poll_interval)
+
+            def receive():
+                try:
+                    return connection.recv(65536)
+                except socket.timeout:
+                    return None
+                except OSError:
+                    return b""
+
+            with connection:
+                self.serve(receive, connection.sendall)
+
+
+class SerialServer(SimulatedServer):
+    """ Serves an instrument model over a pseudo terminal, which appears
+    as the serial port :attr:`port`. This is only available on POSIX
+    systems.
+
+    .. code-block:: python
+
+        models = {5: keithley2000(), 22: sr830()}
+        with SerialServer(PrologixController(models)) as server:
+            adapter = PrologixAdapter(server.port, read_termination="\\n")
+            meter = Keithley2000(adapter.gpib(5))
+
+    :param model: A :class:`Model<pymeasure.simulation.Model>` or
+                  :class:`PrologixController<pymeasure.simulation.PrologixController>`
+    :param kwargs: Key-word arguments of the :class:`SimulatedServer`
+    """
+
+    def __init__(self, model, **kwargs):
+        super().__init__(model, **kwargs)
+        self.master, self.slave = os.openpty()
+        self.port = os.ttyname(self.slave)
+
+    def __repr__(self):
+        return "<SerialServer(port='%s')>" % self.port
+
+    def close(self):
+        """ Closes the pseudo terminal """
+        os.close(self.master)
+        os.close(self.slave)
+
+    def run(self):
+        def receive():
+            readable, _, _ = select.select([self.master], [], [],
+                                           self.poll_interval)
+            if not readable:
+                return None
+            try:
+                return os.read(self.master, 65536)
+            except OSError:
+                return b""
+
+        def send(data):
+            while data:
+                data = data[os.write(self.master, data):]
+
+        self.serve(receive, send)
@@ -23,6 +23,11 @@
 #
 
 import logging
+import threading
+import time
+
+import numpy as np
+import pytest
 
 from pymeasure.adapters import FakeAdapter
 
@@ -37,3 +42,106 @@ def test_adapter_values():
     assert a.values("X,Y,Z") == ['X', 'Y', 'Z']
     assert a.values("X,Y,Z", cast=str) == ['X', 'Y', 'Z']
     assert a.values("X.Y.Z", separator='.') == ['X', 'Y', 'Z']
+
+
+def test_adapter_values_vectorized():
+    a = FakeAdapter()
+    values = [0.5 * i for i in range(100)]
+    response = ",".join(str(v) for v in values)
+    assert a.values(response) == values
+    assert a.values(response, cast=int) == [str(v) for v in values]
+    assert a.values(",".join(str(i) for i in range(100)), cast=int) == list(range(100))
+    assert a.values(response + ",X")[-2:] == [49.5, 'X']
+    array = a.values("5,6,7", as_array=True)
+    assert isinstance(array, np.ndarray)
+    assert array.tolist() == [5, 6, 7]
+    assert a.values("5,X,7", as_array=True) == [5, 'X', 7]
+
+
+def test_adapter_values_large_integers():
+    a = FakeAdapter()
+    response = ",".join(["99999999999999999999999"] * 20)
+    assert a.values(response, cast=int) == [99999999999999999999999] * 20
+    assert a.values(response, cast=int, as_array=True)[0] == \
+        99999999999999999999999
+
+
+class SubclassedFakeAdapter(FakeAdapter):
+
+    def __init__(self):
+        self.name = "subclass"
+
+
+def test_fake_adapter_without_constructor():
+    a = SubclassedFakeAdapter()
+    assert a.read() == ""
+    a.write("5")
+    a.write("6")
+    assert a.read() == "56"
+    assert a.read() == ""
+    # Instances do not share the buffer
+    b = SubclassedFakeAdapter()
+    a.write("7")
+    assert b.read() == ""
+    assert a.read() == "7"
+
+
+class SlowFakeAdapter(FakeAdapter):
+
+    def write(self, command):
+        time.sleep(0.001)
+        super().write(command)
+
+
+def test_ask_is_atomic_across_threads():
+    adapter = SlowFakeAdapter()
+    responses = {}
+
+    def ask(name):
+        responses[name] = [adapter.ask(name) for i in range(20)]
+
+    threads = [threading.Thread(target=ask, args=(name,)) for name in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert responses == {'a': ['a'] * 20, 'b': ['b'] * 20}
+
+
+def test_lock_is_shared_by_connection():
+    a, b, c = FakeAdapter(), FakeAdapter(), FakeAdapter()
+    a.connection = b.connection = FakeAdapter()
+    c.connection = FakeAdapter()
+    assert a.lock is b.lock
+    assert a.lock is not c.lock
+    acquired = []
+    with a.locked():
+        thread = threading.Thread(
+            target=lambda: acquired.append(b.lock.acquire(blocking=False)))
+        thread.start()
+        thread.join()
+    assert acquired == [False]
+
+
+class StatusFakeAdapter(FakeAdapter):
+    """ Sets the status byte after a number of polls """
+
+    def __init__(self, polls):
+        super().__init__()
+        self.polls = polls
+
+    def read_stb(self):
+        self.polls -= 1
+        return 65 if self.polls <= 0 else 0
+
+
+def test_wait_for_event():
+    adapter = StatusFakeAdapter(5)
+    start = time.monotonic()
+    assert adapter.wait_for_event(1, timeout=1) == 65
+    assert time.monotonic() - start < 0.1
+    assert adapter.wait_for_event(2, timeout=0.5, register=lambda: 3) == 3
+    with pytest.raises(TimeoutError):
+        StatusFakeAdapter(1000).wait_for_event(1, timeout=0.05)
+    assert StatusFakeAdapter(1000).wait_for_event(
+        1, timeout=1, should_stop=lambda: True) is None
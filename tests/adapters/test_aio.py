@@ -0,0 +1,191 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import asyncio
+import time
+
+import pytest
+
+from pymeasure.adapters import (FakeAdapter, ThreadedAsyncAdapter,
+                                AsyncSocketAdapter, AsyncAdapterError)
+from pymeasure.instruments import Instrument
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class SlowAdapter(FakeAdapter):
+
+    def read(self):
+        time.sleep(0.1)
+        return super().read()
+
+
+def test_threaded_adapter_values():
+    async def main():
+        a = ThreadedAsyncAdapter(FakeAdapter())
+        assert await a.ask("5") == "5"
+        assert await a.values("5,6,7") == [5, 6, 7]
+        a.write("8")  # Not awaited, but ordered before the read
+        assert await a.read() == "8"
+        await a.close()
+    run(main())
+
+
+def test_threaded_adapters_overlap():
+    async def main():
+        adapters = [ThreadedAsyncAdapter(SlowAdapter()) for i in range(4)]
+        start = time.perf_counter()
+        results = await asyncio.gather(*(a.ask(str(i)) for i, a in enumerate(adapters)))
+        elapsed = time.perf_counter() - start
+        assert results == ["0", "1", "2", "3"]
+        assert elapsed < 0.3
+    run(main())
+
+
+def test_socket_adapter():
+    async def handle(reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode().strip()
+            if command == "DATA?":
+                writer.write(b"#18" + bytes(range(8)) + b"\n")
+            elif command == "RAW?":
+                # The first value contains the termination
+                writer.write(b"\x00\n\x03\x00\n")
+            elif command.endswith("?"):
+                writer.write(command[:-1].encode() + b"\n")
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        a = AsyncSocketAdapter("127.0.0.1", port, timeout=1)
+        a.write("IGNORED")
+        assert await a.ask("X?") == "X"
+        assert await a.values("1,2,3?") == [1, 2, 3]
+        data = await a.binary_values("DATA?", dtype='u1', ieee_header=True)
+        assert list(data) == list(range(8))
+        data = await a.binary_values("RAW?", dtype='<u2')
+        assert list(data) == [0x0a00, 3]
+        await a.close()
+        server.close()
+        await server.wait_closed()
+    run(main())
+
+
+def test_instrument_properties_are_awaitable():
+    class Fake(Instrument):
+        x = Instrument.control("", "%d", "", values={'A': 1, 'B': 2},
+                               map_values=True)
+        y = Instrument.measurement("", "")
+
+    async def main():
+        fake = Fake(ThreadedAsyncAdapter(FakeAdapter()), "Fake",
+                    includeSCPI=False)
+        fake.x = 'B'
+        assert await fake.x == 'B'
+        fake.write("3.5")
+        assert await fake.y == 3.5
+    run(main())
+
+
+def test_operation_error_is_raised():
+    async def main():
+        a = ThreadedAsyncAdapter(FakeAdapter())
+        with pytest.raises(NameError):
+            await a.binary_values("X")
+        assert await a.ask("5") == "5"
+    run(main())
+
+
+def test_flush_raises_unawaited_errors():
+    async def main():
+        a = ThreadedAsyncAdapter(FakeAdapter())
+        a.binary_values("X")
+        await a.flush()
+
+    with pytest.raises(NameError):
+        run(main())
+
+    async def several():
+        a = ThreadedAsyncAdapter(FakeAdapter())
+        a.binary_values("X")
+        a.binary_values("Y")
+        assert await a.ask("5") == "5"
+        with pytest.raises(AsyncAdapterError) as info:
+            await a.flush()
+        assert len(info.value.errors) == 2
+        await a.flush()
+    run(several())
+
+
+def test_async_error_check():
+    class Fake(Instrument):
+        x = Instrument.measurement("X?", "", check_get_errors=True)
+        y = Instrument.control("Y?", "Y %d", "", check_set_errors=True)
+
+        def check_errors(self):
+            # The own error protocol of the driver
+            code = int(self.ask("ERR?"))
+            if code:
+                raise ValueError("Error %d" % code)
+            return []
+
+    errors = ["0", "-113", "-222"]
+
+    class ErrorAdapter(FakeAdapter):
+        def write(self, command):
+            if command == "ERR?":
+                super().write(errors.pop(0))
+            elif command == "X?":
+                super().write("1.5")
+
+    async def main():
+        fake = Fake(ThreadedAsyncAdapter(ErrorAdapter()), "Fake",
+                    includeSCPI=False)
+        assert await fake.x == 1.5
+        with pytest.raises(ValueError):
+            await fake.x
+        # The check of a setter is not awaited, so the flush raises it
+        fake.y = 1
+        with pytest.raises(ValueError):
+            await fake.adapter.flush()
+        assert errors == []
+    run(main())
+
+
+def test_flush_ignores_awaited_errors():
+    async def main():
+        a = ThreadedAsyncAdapter(FakeAdapter())
+        with pytest.raises(NameError):
+            await a.binary_values("X")
+        await a.flush()
+    run(main())
\ No newline at end of file
@@ -0,0 +1,91 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import numpy as np
+import pytest
+
+from pymeasure.adapters.block import parse_block, read_block
+
+
+def reader(data):
+    position = [0]
+
+    def read_bytes(size):
+        chunk = data[position[0]:position[0] + size]
+        position[0] += size
+        return chunk
+
+    def read_until(termination):
+        end = data.index(termination, position[0]) + len(termination)
+        chunk = data[position[0]:end]
+        position[0] = end
+        return chunk
+
+    return read_bytes, read_until
+
+
+def test_parse_definite_block():
+    values = np.arange(5, dtype='<f4')
+    data = b"#220" + values.tobytes() + b"\n"
+    result = parse_block(data)
+    assert np.array_equal(result, values)
+    assert result.base is not None  # References the received buffer
+
+
+def test_parse_block_byte_order():
+    values = np.arange(4, dtype='>i2')
+    data = b"#18" + values.tobytes()
+    assert list(parse_block(data, dtype='i2', is_big_endian=True)) == [0, 1, 2, 3]
+
+
+def test_parse_indefinite_block():
+    data = b"#0" + np.arange(3, dtype='u1').tobytes() + b"\n"
+    assert list(parse_block(data, dtype='u1')) == [0, 1, 2]
+
+
+def test_parse_block_errors():
+    with pytest.raises(ValueError):
+        parse_block(b"12345678")
+    with pytest.raises(ValueError):
+        parse_block(b"#18" + bytes(4))  # Incomplete
+    with pytest.raises(ValueError):
+        parse_block(b"#13" + bytes(3))  # Not a multiple of 4 bytes
+    with pytest.raises(ValueError):
+        parse_block(b"#14" + bytes(8))  # Unexpected trailing data
+
+
+def test_read_block_with_termination_in_data():
+    values = np.array([10, 13, 10, 35], dtype='u1')
+    read_bytes, read_until = reader(b"#14" + values.tobytes() + b"\n")
+    result = read_block(read_bytes, dtype='u1', termination="\n")
+    assert np.array_equal(result, values)
+
+
+def test_read_indefinite_block():
+    read_bytes, read_until = reader(b"#0" + bytes([1, 2, 3]) + b"\n")
+    with pytest.raises(ValueError):
+        read_block(read_bytes, dtype='u1')
+    read_bytes, read_until = reader(b"#0" + bytes([1, 2, 3]) + b"\n")
+    result = read_block(read_bytes, dtype='u1', read_until=read_until)
+    assert list(result) == [1, 2, 3]
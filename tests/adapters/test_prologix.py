@@ -0,0 +1,76 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import serial
+
+from pymeasure.adapters import PrologixAdapter
+
+
+class FakeSerial(serial.Serial):
+    """ Records the written bytes, and responds to reads with the
+    response of the instrument and a line feed
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.written = []
+        self.response = b""
+
+    def write(self, data):
+        self.written.append(data)
+
+    def read_until(self, expected=b"\n", size=None):
+        return self.response + expected
+
+    def readlines(self):
+        return self.response.split(b"\n")
+
+
+def test_prologix_address_is_cached():
+    connection = FakeSerial()
+    a = PrologixAdapter(connection, 1)
+    b = a.gpib(2)
+    a.write("A")
+    a.write("B")
+    b.write("C")
+    a.write("D")
+    assert connection.written == [
+        b"++addr 1\n", b"A\n", b"B\n", b"++addr 2\n", b"C\n", b"++addr 1\n", b"D\n"
+    ]
+
+
+def test_prologix_read_until_termination():
+    connection = FakeSerial()
+    connection.response = b"1.5,2.5"
+    a = PrologixAdapter(connection, 5, read_termination="\n")
+    assert a.values("VALUES?") == [1.5, 2.5]
+    assert connection.written[-1] == b"++read eoi\n"
+
+
+def test_prologix_read_until_timeout():
+    # Without a read termination, multi-line responses are read whole
+    connection = FakeSerial()
+    connection.response = b"LINE 1\nLINE 2"
+    a = PrologixAdapter(connection, 5)
+    assert a.ask("LINES?") == "LINE 1\nLINE 2"
@@ -0,0 +1,111 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import time
+
+import numpy as np
+import pytest
+
+from pymeasure.adapters import FakeAdapter, RecordingAdapter, ReplayAdapter
+from pymeasure.instruments import Instrument
+
+
+class BinaryFakeAdapter(FakeAdapter):
+
+    def read_bytes(self, size):
+        return bytes(range(size))
+
+    def read_stb(self):
+        return 0x40
+
+    def binary_values(self, command, header_bytes=0, dtype=np.float32,
+                      ieee_header=False, is_big_endian=None):
+        return np.arange(3, dtype=dtype)
+
+
+class Fake(Instrument):
+    voltage = Instrument.control("VOLT?", "VOLT %g", "Voltage")
+
+
+def test_record_and_replay(tmpdir):
+    filename = str(tmpdir.join("session.jsonl"))
+    adapter = RecordingAdapter(BinaryFakeAdapter(), filename)
+    fake = Fake(adapter, "Fake")
+    fake.voltage = 1.5
+    fake.write("5")
+    assert fake.read() == "VOLT 1.55"
+    assert fake.values("1,2") == [1, 2]
+    data = fake.binary_values("DATA?", dtype=np.float64)
+    assert adapter.read_bytes(3) == b"\x00\x01\x02"
+    assert adapter.read_stb() == 0x40
+    assert adapter.wait_for_event(0x40) == 0x40
+    adapter.close()
+
+    fake = Fake(ReplayAdapter(filename), "Fake")
+    fake.voltage = 1.5
+    fake.write("5")
+    assert fake.read() == "VOLT 1.55"
+    assert fake.values("1,2") == [1, 2]
+    assert np.array_equal(fake.binary_values("DATA?", dtype=np.float64), data)
+    assert fake.adapter.read_bytes(3) == b"\x00\x01\x02"
+    assert fake.adapter.read_stb() == 0x40
+    assert fake.adapter.wait_for_event(0x40) == 0x40
+    assert fake.adapter.finished
+
+
+def test_replay_checks_commands(tmpdir):
+    filename = str(tmpdir.join("session.jsonl"))
+    adapter = RecordingAdapter(FakeAdapter(), filename)
+    adapter.write("VOLT 1")
+    adapter.close()
+
+    replay = ReplayAdapter(filename)
+    with pytest.raises(ValueError):
+        replay.write("VOLT 2")
+    replay.rewind()
+    replay.write("VOLT 1")
+    with pytest.raises(ValueError):
+        replay.write("VOLT 1")
+
+
+def test_replay_recorded_speed(tmpdir):
+    filename = str(tmpdir.join("session.jsonl"))
+    adapter = RecordingAdapter(FakeAdapter(), filename)
+    adapter.write("VOLT 1")
+    time.sleep(0.05)
+    adapter.write("VOLT 2")
+    adapter.close()
+
+    # The gap between the calls is played back
+    replay = ReplayAdapter(filename, realtime=True)
+    start = time.perf_counter()
+    replay.write("VOLT 1")
+    replay.write("VOLT 2")
+    assert time.perf_counter() - start >= 0.05
+
+    replay = ReplayAdapter(filename)
+    start = time.perf_counter()
+    replay.write("VOLT 1")
+    replay.write("VOLT 2")
+    assert time.perf_counter() - start < 0.05
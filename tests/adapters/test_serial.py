@@ -0,0 +1,121 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import os
+import time
+
+import numpy as np
+import pytest
+import serial
+
+from pymeasure.adapters import SerialAdapter
+from pymeasure.adapters import serial as serial_module
+from pymeasure.adapters.serial import ChunkBuffer
+
+pytestmark = pytest.mark.skipif(os.name != 'posix',
+                                reason="Requires a pseudo terminal")
+
+
+@pytest.fixture
+def terminal():
+    """ Returns the file descriptor of the instrument side, and the
+    name of the port of a pseudo terminal
+    """
+    instrument, port = os.openpty()
+    yield instrument, os.ttyname(port)
+    os.close(instrument)
+    os.close(port)
+
+
+@pytest.mark.parametrize("background_reader", [False, True])
+def test_read_returns_at_termination(terminal, background_reader):
+    instrument, port = terminal
+    adapter = SerialAdapter(port, read_termination="\n", timeout=2,
+                            background_reader=background_reader)
+    os.write(instrument, b"1.5,2.5\n3.5\n")
+    start = time.perf_counter()
+    assert adapter.values("") == [1.5, 2.5]
+    assert adapter.read() == "3.5"
+    assert time.perf_counter() - start < 1
+    adapter.connection.close()
+
+
+def test_binary_values_reads_announced_bytes(terminal):
+    instrument, port = terminal
+    adapter = SerialAdapter(port, read_termination="\n", timeout=2,
+                            background_reader=True)
+    data = np.arange(4, dtype='<f4')
+    os.write(instrument, b"#216" + data.tobytes() + b"\nOK\n")
+    values = adapter.binary_values("DATA?", dtype=np.float32,
+                                   ieee_header=True, is_big_endian=False)
+    assert np.array_equal(values, data)
+    assert adapter.read() == "OK"
+    adapter.connection.close()
+
+
+def test_background_reader_times_out(terminal):
+    instrument, port = terminal
+    adapter = SerialAdapter(port, read_termination="\n", timeout=0.1,
+                            background_reader=True)
+    os.write(instrument, b"incomplete")
+    with pytest.raises(TimeoutError):
+        adapter.read()
+    adapter.connection.close()
+
+
+def test_background_reader_is_shared(terminal):
+    instrument, port = terminal
+    connection = serial.Serial(port, timeout=2)
+    a = SerialAdapter(connection, read_termination="\n", background_reader=True)
+    b = SerialAdapter(connection, read_termination="\n", background_reader=True)
+    assert a.reader is b.reader
+    reader = a.reader
+    assert reader.users == 2
+    a.close()
+    b.close()
+    reader.thread.join(1)
+    assert not reader.thread.is_alive()
+    assert connection not in serial_module._readers
+
+
+def test_close_stops_background_reader(terminal):
+    instrument, port = terminal
+    adapter = SerialAdapter(port, read_termination="\n", timeout=None,
+                            background_reader=True)
+    reader = adapter.reader
+    adapter.close()
+    reader.thread.join(1)
+    assert not reader.thread.is_alive()
+
+
+def test_chunk_buffer():
+    buffer = ChunkBuffer()
+    for chunk in (b"ab\r", b"\ncd", b"e\r\n"):
+        buffer.append(chunk)
+    assert buffer.find(b"\r\n") == 2
+    assert buffer.find(b"\r\n", 3) == 7
+    assert buffer.take(5) == b"ab\r\nc"
+    assert buffer.find(b"\r\n") == 2
+    assert buffer.take(len(buffer)) == b"de\r\n"
+    assert buffer.find(b"\n") == -1
@@ -0,0 +1,88 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from pymeasure.adapters import SocketAdapter
+
+
+@pytest.fixture
+def server():
+    """ Serves a loopback instrument that responds to queries by
+    their command, to DATA? with a binary block, and to RAW? with
+    binary data.
+    """
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+
+    def serve():
+        connection, _ = listener.accept()
+        stream = connection.makefile('rb')
+        for line in stream:
+            command = line.strip()
+            if command == b"DATA?":
+                data = np.arange(256, dtype='<u2').tobytes()
+                connection.sendall(b"#3512" + data + b"\n")
+            elif command == b"RAW?":
+                # The data contains the termination at an odd position
+                data = np.arange(256, dtype='>u2').tobytes()
+                connection.sendall(data + b"\n")
+            elif command.endswith(b"?"):
+                # Respond in separate packets to test the buffering
+                connection.sendall(command[:1])
+                connection.sendall(command[1:-1] + b"\n")
+        connection.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield listener.getsockname()[1]
+    listener.close()
+
+
+def test_socket_adapter(server):
+    a = SocketAdapter("127.0.0.1", server, timeout=1)
+    assert a.connection.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    a.write("IGNORED")
+    assert a.ask("ABC?") == "ABC"
+    assert a.values("1,2,3?") == [1, 2, 3]
+    data = a.binary_values("DATA?", dtype='u2', ieee_header=True)
+    assert np.array_equal(data, np.arange(256))
+    data = a.binary_values("RAW?", dtype='>u2')
+    assert np.array_equal(data, np.arange(256))
+    assert a.ask("X?") == "X"
+    a.close()
+
+
+def test_socket_adapter_timeout(server):
+    a = SocketAdapter("127.0.0.1", server, timeout=1)
+    a.timeout = 0.05
+    a.write("NO RESPONSE")
+    with pytest.raises(socket.timeout):
+        a.read()
+    a.close()
@@ -0,0 +1,124 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import json
+import threading
+
+from pymeasure.adapters import FakeAdapter
+from pymeasure.adapters.stats import LatencyHistogram, enabled_stats
+
+
+def test_stats_per_command():
+    adapter = FakeAdapter()
+    stats = adapter.enable_stats()
+    adapter.write("VOLT 1.5")
+    adapter.write("VOLT 2")
+    assert adapter.read() == "VOLT 1.5VOLT 2"
+    assert adapter.ask("CURR?") == "CURR?"
+    assert adapter.values("5,6") == [5, 6]
+
+    result = stats.to_dict()
+    assert set(result) == {"VOLT", "CURR?", "5,6"}
+    assert result["VOLT"]["write"]["count"] == 2
+    assert result["VOLT"]["read"]["count"] == 1
+    assert result["VOLT"]["bytes_sent"] == 14
+    assert result["VOLT"]["bytes_received"] == 14
+    # The write and read of a query are not recorded separately
+    assert result["CURR?"]["ask"]["count"] == 1
+    assert result["CURR?"]["write"]["count"] == 0
+    assert result["CURR?"]["read"]["count"] == 0
+    assert json.loads(stats.to_json())["5,6"]["ask"]["count"] == 1
+    assert "VOLT" in stats.summary()
+    assert stats in enabled_stats()
+
+
+def test_disable_stats():
+    adapter = FakeAdapter()
+    stats = adapter.enable_stats()
+    adapter.disable_stats()
+    adapter.write("VOLT 1")
+    assert stats.commands == {}
+    assert adapter.stats is None
+    assert "write" not in adapter.__dict__
+
+
+class ReadCommandAdapter(FakeAdapter):
+    """ Writes a command of its own to read, as the Prologix adapter does """
+
+    def read(self):
+        self.write("++read eoi")
+        return "\u00b5A"
+
+
+def test_read_attributed_to_command():
+    adapter = ReadCommandAdapter()
+    stats = adapter.enable_stats()
+    adapter.write("UNIT? \u00b5")
+    assert adapter.read() == "\u00b5A"
+    result = stats.to_dict()
+    assert set(result) == {"UNIT?"}
+    assert result["UNIT?"]["read"]["count"] == 1
+    # The bytes are counted as encoded, where the micro sign takes two
+    assert result["UNIT?"]["bytes_sent"] == 8
+    assert result["UNIT?"]["bytes_received"] == 3
+
+
+class BlockingAdapter(FakeAdapter):
+    """ Blocks a query until it is released """
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def ask(self, command):
+        self.started.set()
+        self.release.wait(5)
+        return super().ask(command)
+
+
+def test_nested_calls_per_thread():
+    # A query in progress in one thread does not hide the calls of another
+    adapter = BlockingAdapter()
+    stats = adapter.enable_stats()
+    thread = threading.Thread(target=adapter.ask, args=("CURR?",))
+    thread.start()
+    adapter.started.wait(5)
+    adapter.write("VOLT 1")
+    adapter.release.set()
+    thread.join()
+    result = stats.to_dict()
+    assert result["VOLT"]["write"]["count"] == 1
+    assert result["CURR?"]["ask"]["count"] == 1
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    for latency in [1e-3] * 99 + [1.0]:
+        histogram.add(latency)
+    assert histogram.count == 100
+    assert histogram.maximum == 1.0
+    assert 1e-3 <= histogram.quantile(0.5) < 1.3e-3
+    assert histogram.quantile(1) == 1.0
+    assert sum(c for _, c in histogram.to_dict()["histogram"]) == 100
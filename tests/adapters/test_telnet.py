@@ -0,0 +1,79 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from pymeasure.adapters.telnet import TelnetAdapter
+
+
+@pytest.fixture
+def server():
+    """ Serves a loopback instrument that responds to queries by their
+    command, and to DATA? and RAW? with binary data.
+    """
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+
+    def serve():
+        connection, _ = listener.accept()
+        for line in connection.makefile('rb'):
+            command = line.strip()
+            if command == b"DATA?":
+                # The data contains the termination, but no null bytes,
+                # which Telnet discards
+                connection.sendall(b"#216" + bytes(range(1, 17)) + b"\n")
+            elif command == b"RAW?":
+                # The termination is part of the first value
+                connection.sendall(b"\x01\n\x03\x04\n")
+            elif command.endswith(b"?"):
+                connection.sendall(command[:-1] + b"\n")
+        connection.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield listener.getsockname()[1]
+    listener.close()
+
+
+def test_telnet_binary_values(server):
+    a = TelnetAdapter("127.0.0.1", server, timeout=1)
+    data = a.binary_values("DATA?\n", dtype='u1', ieee_header=True)
+    assert list(data) == list(range(1, 17))
+    assert a.ask("X?\n") == "X"
+    data = a.binary_values("RAW?\n", dtype='<u2')
+    assert list(data) == [0x0a01, 0x0403]
+    assert a.ask("Y?\n") == "Y"
+
+
+def test_telnet_timeout(server):
+    a = TelnetAdapter("127.0.0.1", server, timeout=0.05)
+    a.write("NO RESPONSE\n")
+    with pytest.raises(TimeoutError):
+        a.read()
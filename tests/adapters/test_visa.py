@@ -26,3 +26,76 @@ from pymeasure.adapters import VISAAdapter
 
 def test_visa_version():
   assert VISAAdapter.has_supported_version()
+
+
+class FakeResource(object):
+    """ Requests service after a number of waits for the event """
+    closed = False
+    waits = 3
+    enabled = False
+
+    def close(self):
+        self.closed = True
+
+    def enable_event(self, event_type, mechanism):
+        self.enabled = True
+
+    def disable_event(self, event_type, mechanism):
+        self.enabled = False
+
+    def wait_on_event(self, event_type, timeout):
+        self.waits -= 1
+        if self.waits > 0:
+            from pyvisa.errors import VisaIOError
+            from pyvisa.constants import VI_ERROR_TMO
+            raise VisaIOError(VI_ERROR_TMO)
+
+    def read_stb(self):
+        return 65 if self.waits <= 0 else 0
+
+
+class FakeResourceManager(object):
+    created = 0
+
+    def __init__(self, visa_library=''):
+        FakeResourceManager.created += 1
+
+    def get_instrument(self, resource_name, **kwargs):
+        return FakeResource()
+
+
+def test_visa_sessions_are_shared(monkeypatch):
+    import pymeasure.adapters.visa as visa_adapter
+    monkeypatch.setattr(visa_adapter.visa, 'ResourceManager', FakeResourceManager)
+    monkeypatch.setattr(visa_adapter, '_managers', {})
+    monkeypatch.setattr(visa_adapter, '_sessions', {})
+
+    a = VISAAdapter("GPIB0::1::INSTR", visa_library='@fake')
+    b = VISAAdapter(1, visa_library='@fake')
+    c = VISAAdapter(1, visa_library='@fake', timeout=100)
+    assert FakeResourceManager.created == 1
+    assert a.connection is b.connection
+    assert a.connection is not c.connection
+
+    a.close()
+    assert not b.connection.closed
+    a.close()  # Closing twice does not release the session of b
+    assert not b.connection.closed
+    b.close()
+    assert b.connection.closed
+    assert not c.connection.closed
+    c.close()
+    assert visa_adapter._sessions == {}
+
+
+def test_visa_wait_for_event(monkeypatch):
+    import pymeasure.adapters.visa as visa_adapter
+    monkeypatch.setattr(visa_adapter.visa, 'ResourceManager', FakeResourceManager)
+    monkeypatch.setattr(visa_adapter, '_managers', {})
+    monkeypatch.setattr(visa_adapter, '_sessions', {})
+
+    a = VISAAdapter("GPIB0::2::INSTR", visa_library='@fake')
+    assert a.wait_for_event(1, timeout=1) == 65
+    assert a.connection.waits == 0
+    assert not a.connection.enabled
+    a.close()
@@ -28,6 +28,7 @@ import tempfile
 from time import sleep
 from importlib.machinery import SourceFileLoader
 
+from pymeasure.adapters import FakeAdapter
 from pymeasure.experiment.workers import Worker
 from pymeasure.experiment.results import Results
 
@@ -67,3 +68,26 @@ def test_worker_finish():
 
     new_results = Results.load(file, procedure_class=RandomProcedure)
     assert new_results.data.shape == (100, 2)
+
+
+def test_worker_stats_per_run():
+    used = FakeAdapter()
+    unused = FakeAdapter()
+    used.enable_stats()
+    unused.enable_stats()
+    used.write("VOLT 1")
+    unused.write("VOLT 1")
+
+    procedure = RandomProcedure()
+    procedure.iterations = 1
+    procedure.execute = lambda: used.write("CURR 1")
+    results = Results(procedure, tempfile.mktemp())
+    worker = Worker(results)
+    worker.start()
+    worker.join(timeout=5)
+
+    # Only the calls during the run are reported
+    assert list(worker.stats) == [used.stats.name]
+    assert set(worker.stats[used.stats.name]) == {"CURR"}
+    used.disable_stats()
+    unused.disable_stats()
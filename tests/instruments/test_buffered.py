@@ -0,0 +1,184 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import numpy as np
+import pytest
+
+from pymeasure.instruments import Instrument
+from pymeasure.instruments.buffered import BufferedAcquisition
+from pymeasure.simulation import SimulatedAdapter
+
+
+class FakeAcquisition(BufferedAcquisition):
+    """ Adds three points to the buffer on each check of the count """
+
+    def __init__(self, points, incremental=True, limit=None, end=None):
+        super().__init__(Instrument(None, "Fake", includeSCPI=False),
+                         points, interval=0)
+        self.incremental = incremental
+        self.limit = limit
+        self.end = end
+        self.filled = 0
+        self.fetches = []
+        self.aborted = False
+        self.finished = False
+
+    def arm(self):
+        self.filled = 0
+
+    def count(self):
+        self.filled += 3
+        if self.limit is not None:
+            self.filled = min(self.filled, self.limit)
+        return self.filled
+
+    def fetch(self, start, stop):
+        self.fetches.append((start, stop))
+        if self.end is not None:
+            stop = min(stop, self.end)
+        return np.arange(start, stop)
+
+    def ended(self):
+        return self.end is not None and self.acquired >= self.end
+
+    def abort(self):
+        self.aborted = True
+
+    def finish(self):
+        self.finished = True
+
+
+def test_incremental_fetch():
+    acquisition = FakeAcquisition(10)
+    data = acquisition.acquire()
+    assert list(data) == list(range(10))
+    assert acquisition.fetches == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    assert acquisition.finished and not acquisition.aborted
+
+
+def test_fetch_when_complete():
+    acquisition = FakeAcquisition(10, incremental=False)
+    assert list(acquisition.acquire()) == list(range(10))
+    assert acquisition.fetches == [(0, 10)]
+
+
+def test_abort():
+    acquisition = FakeAcquisition(10)
+    data = acquisition.acquire(should_stop=lambda: acquisition.acquired >= 3)
+    assert list(data) == [0, 1, 2]
+    assert acquisition.aborted and not acquisition.finished
+
+
+def test_timeout():
+    acquisition = FakeAcquisition(10, limit=5)
+    with pytest.raises(TimeoutError):
+        acquisition.acquire(timeout=0.01)
+    assert acquisition.aborted
+    assert list(acquisition.result()) == [0, 1, 2, 3, 4]
+
+
+def test_data_ended():
+    # The count claims six points, of which the fetch only returns four
+    acquisition = FakeAcquisition(10, limit=6, end=4)
+    assert list(acquisition.acquire(timeout=1)) == [0, 1, 2, 3]
+    assert acquisition.fetches == [(0, 3), (3, 6), (4, 6)]
+    assert not acquisition.running
+
+
+def test_data_ended_stream():
+    chunks = list(FakeAcquisition(10, limit=6, end=4).stream(chunk=4))
+    assert [list(chunk) for chunk in chunks] == [[0, 1, 2, 3]]
+
+
+def test_acquisition_stream():
+    chunks = list(FakeAcquisition(10).stream(chunk=4))
+    assert [list(chunk) for chunk in chunks] == [
+        [0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_sr830_fill_buffer():
+    from pymeasure.instruments.srs import SR830
+
+    def respond(command):
+        if command == "SPTS?":
+            respond.count = min(respond.count + 2, 6)
+            return str(respond.count)
+        if command.startswith("TRCB?"):
+            channel, start, points = map(int, command[5:].split(","))
+            return channel * np.arange(start, start + points)
+    respond.count = 0
+
+    adapter = SimulatedAdapter(respond)
+    lockin = SR830(adapter)
+    ch1, ch2 = lockin.fill_buffer(6, delay=0)
+    assert list(ch1) == [0, 1, 2, 3, 4, 5]
+    assert list(ch2) == [0, 2, 4, 6, 8, 10]
+    assert "REST" not in adapter.commands
+    assert "FAST0;STRD" not in adapter.commands
+    assert adapter.commands[-1] == "PAUS"
+
+    respond.count = 0
+    ch1, ch2 = lockin.fill_buffer(6, has_aborted=lambda: respond.count >= 2,
+                                  delay=0)
+    assert len(ch1) == len(ch2) == 6
+    assert list(ch1[:2]) == [0, 1]
+    assert adapter.commands[-1] == "PAUS"
+
+    respond.count = 0
+    del adapter.commands[:]
+    assert lockin.buffer_measure(6, delay=0)[0] == 2.5
+    assert adapter.commands[0] == "FAST0;STRD"
+
+    respond.count = 0
+    del adapter.commands[:]
+    data = lockin.buffer_acquisition(6).acquire()
+    assert list(data[:, 1]) == [0, 2, 4, 6, 8, 10]
+    assert adapter.commands[:2] == ["REST", "FAST0;STRD"]
+
+
+class ConfigurableAdapter(SimulatedAdapter):
+    """ Accepts the configuration that the DSP 7265 writes on creation """
+
+    def config(self, **kwargs):
+        pass
+
+
+def test_dsp7265_curve():
+    from pymeasure.instruments.signalrecovery import DSP7265
+
+    def respond(command):
+        if command == "M":
+            return "0,1,0,3"
+        if command == "DC. 1":
+            # The curve is dumped with one value per line
+            adapter.pending.extend(["1.0", "2.0", "3.0"])
+
+    adapter = ConfigurableAdapter(respond)
+    lockin = DSP7265(adapter)
+    # The number of points is taken from the status of the curve
+    assert list(lockin.get_curve('x')) == [1., 2., 3.]
+    acquisition = lockin.buffer_acquisition(3)
+    assert acquisition.quantities == ['x']
+    assert list(acquisition.acquire()[:, 0]) == [1., 2., 3.]
@@ -22,8 +22,14 @@
 # THE SOFTWARE.
 #
 
+import threading
+import time
+import timeit
+
 import pytest
-from pymeasure.instruments.instrument import Instrument, FakeInstrument
+from pymeasure.adapters import FakeAdapter
+from pymeasure.instruments.instrument import (Instrument, FakeInstrument,
+                                              Control, Measurement, Setting)
 from pymeasure.instruments.validators import strict_discrete_set, strict_range
 
 
@@ -46,6 +52,160 @@ def test_control_doc():
     assert Fake.x.__doc__ == doc
 
 
+def test_property_metadata():
+    class Fake(FakeInstrument):
+        x = Instrument.control("X?", "X %d", "X property",
+                               validator=strict_range, values=[0, 10],
+                               cache=True)
+        y = Instrument.measurement("Y?", "Y property")
+        z = Instrument.setting("Z %d", "Z property")
+
+    assert Fake.x.name == 'x'
+    assert Fake.x.validator is strict_range
+    assert Fake.x.values == [0, 10]
+    assert Fake.x.cache is True
+    assert Fake.y.get_command == "Y?"
+    assert Fake.y.set_command is None
+    assert Fake.z.set_command == "Z %d"
+    assert Fake.z.__doc__ == "Z property"
+
+    fake = Fake()
+    Fake.x.fset(fake, 5)
+    assert fake.read() == "X 5"
+    with pytest.raises(AttributeError):
+        fake.y = 1
+    with pytest.raises(LookupError):
+        fake.z
+
+
+def test_property_types():
+    class Fake(FakeInstrument):
+        x = Instrument.control("X?", "X %d", "X property")
+        y = Instrument.measurement("Y?", "Y property")
+        z = Instrument.setting("Z %d", "Z property")
+
+    assert isinstance(Fake.x, Control)
+    assert not isinstance(Fake.x, Measurement)
+    assert isinstance(Fake.y, Measurement)
+    assert isinstance(Fake.z, Setting)
+    assert Control.__doc__ and Measurement.__doc__ and Setting.__doc__
+
+
+def test_property_name_without_set_name():
+    # Python 3.5 does not call __set_name__, as for properties added later
+    class Fake(FakeInstrument):
+        pass
+
+    Fake.x = Instrument.control("X?", "X %d", "X property")
+    assert Fake.x.name == 'x'
+
+
+class ConstantFake(Instrument):
+    """ Returns a constant response without an adapter """
+
+    voltage = Instrument.control(
+        "VOLT?", "VOLT %g", "Voltage",
+        validator=strict_range, values=[-10, 10]
+    )
+    mode = Instrument.control(
+        "MODE?", "MODE %s", "Mode",
+        validator=strict_discrete_set,
+        values={'voltage': 'VOLT', 'current': 'CURR'}, map_values=True
+    )
+
+    def __init__(self):
+        super().__init__(None, "Constant", includeSCPI=False)
+
+    def values(self, command, **kwargs):
+        return ['VOLT'] if command == "MODE?" else [1.5]
+
+    def write(self, command):
+        pass
+
+
+def closure_control(get_command, set_command, validator=lambda v, vs: v,
+                    values=(), map_values=False, get_process=lambda v: v,
+                    set_process=lambda v: v, check_set_errors=False,
+                    check_get_errors=False, **kwargs):
+    # Instrument.control as it was built from closures before the descriptors
+
+    if map_values and isinstance(values, dict):
+        inverse = {v: k for k, v in values.items()}
+
+    def fget(self):
+        vals = self.values(get_command, **kwargs)
+        if check_get_errors:
+            self.check_errors()
+        if len(vals) == 1:
+            value = get_process(vals[0])
+            if not map_values:
+                return value
+            elif isinstance(values, (list, tuple, range)):
+                return values[int(value)]
+            elif isinstance(values, dict):
+                return inverse[value]
+            else:
+                raise ValueError("Invalid values")
+        else:
+            return get_process(vals)
+
+    def fset(self, value):
+        value = set_process(validator(value, values))
+        if not map_values:
+            pass
+        elif isinstance(values, (list, tuple, range)):
+            value = values.index(value)
+        elif isinstance(values, dict):
+            value = values[value]
+        else:
+            raise ValueError("Invalid values")
+        self.write(set_command % value)
+        if check_set_errors:
+            self.check_errors()
+
+    return property(fget, fset)
+
+
+class ClosureFake(ConstantFake):
+    voltage = closure_control("VOLT?", "VOLT %g", strict_range, [-10, 10])
+    mode = closure_control(
+        "MODE?", "MODE %s", strict_discrete_set,
+        {'voltage': 'VOLT', 'current': 'CURR'}, map_values=True
+    )
+
+
+def best_times(statement, *instruments):
+    # The instruments are timed in turns, so that they share the conditions
+    times = [[] for instrument in instruments]
+    for i in range(9):
+        for instrument, results in zip(instruments, times):
+            results.append(timeit.timeit(
+                statement, globals={'instrument': instrument}, number=10000))
+    return [min(results) for results in times]
+
+
+@pytest.mark.parametrize("statement", [
+    "instrument.voltage",
+    "instrument.voltage = 1.5",
+    "instrument.mode",
+    "instrument.mode = 'current'",
+])
+def test_property_speedup(statement):
+    # A micro-benchmark of the descriptors against the closure properties,
+    # without an adapter, so that only the property overhead is measured
+    descriptor, closure = best_times(statement, ConstantFake(), ClosureFake())
+    assert descriptor < closure
+
+
+def test_control_invalid_map():
+    class Fake(FakeInstrument):
+        x = Instrument.control("", "%d", "", values={1, 2}, map_values=True)
+
+    fake = Fake()
+    with pytest.raises(ValueError):
+        fake.x = 1
+
+
 def test_control_validator():
     class Fake(FakeInstrument):
         x = Instrument.control(
@@ -179,3 +339,290 @@ def test_setting_process():
     assert fake.read() == 'OUT 0'
     fake.x = 2
     assert fake.read() == 'OUT 1'
+
+
+class CompoundAdapter(FakeAdapter):
+    """ Answers each query of a compound message with its position """
+
+    def __init__(self):
+        self.messages = []
+
+    def write(self, command):
+        self.messages.append(command)
+        queries = [c for c in command.split(";") if c.endswith("?")]
+        super().write(";".join(str(i) for i, c in enumerate(queries)))
+
+
+def test_batch_combines_writes_and_queries():
+    class Fake(Instrument):
+        x = Instrument.control("X?", "X %d", "", cast=int)
+        y = Instrument.measurement("Y?", "", values={'A': 1}, map_values=True)
+
+    errors = []
+    fake = Fake(CompoundAdapter(), "Fake", includeSCPI=False)
+    fake.check_errors = lambda: errors.append(True)
+    with fake.batch():
+        fake.x = 1
+        fake.write("W")
+        x = fake.x
+        y = fake.y
+        assert not x.done()
+    assert fake.adapter.messages == ["X 1;W;X?;Y?"]
+    assert x.result() == 0
+    assert y.result() == 'A'
+    assert errors == []
+
+
+def test_batch_checks_errors_once():
+    class Fake(Instrument):
+        x = Instrument.control("", "%d", "", check_set_errors=True)
+
+    errors = []
+    fake = Fake(CompoundAdapter(), "Fake", includeSCPI=False)
+    fake.check_errors = lambda: errors.append(True)
+    with fake.batch():
+        fake.x = 1
+        fake.x = 2
+    assert fake.adapter.messages == ["1;2"]
+    assert errors == [True]
+
+
+def test_batch_cancelled_on_error():
+    fake = Instrument(CompoundAdapter(), "Fake", includeSCPI=False)
+    with pytest.raises(KeyError):
+        with fake.batch():
+            response = fake.ask("A?")
+            raise KeyError()
+    assert response.cancelled()
+    assert fake.adapter.messages == []
+
+
+def test_batch_is_thread_local():
+    fake = Instrument(CompoundAdapter(), "Fake", includeSCPI=False)
+    responses = []
+    with fake.batch():
+        fake.write("A")
+        thread = threading.Thread(target=lambda: responses.append(
+            fake.ask("B?")))
+        thread.start()
+        thread.join()
+    assert responses == ["0"]
+    assert fake.adapter.messages == ["B?", "A"]
+
+
+def test_batch_rejects_direct_io():
+    fake = Instrument(CompoundAdapter(), "Fake", includeSCPI=False)
+    with fake.batch():
+        with pytest.raises(RuntimeError):
+            fake.read()
+        with pytest.raises(RuntimeError):
+            fake.binary_values("DATA?")
+        with pytest.raises(RuntimeError):
+            fake.adapter.write("A")
+    assert fake.adapter.messages == []
+
+
+def test_batch_with_overridden_values():
+    class Fake(Instrument):
+        x = Instrument.measurement("X?", "")
+        y = Instrument.setting("Y %d", "")
+
+        def values(self, command, **kwargs):
+            return [float(self.ask(command).strip())]
+
+    fake = Fake(CompoundAdapter(), "Fake", includeSCPI=False)
+    with pytest.raises(NotImplementedError):
+        with fake.batch():
+            pass
+    fake.set_many([('y', 1), ('y', 2)])
+    assert fake.get_many(['x']) == {'x': 0}
+    assert fake.adapter.messages == ["Y 1", "Y 2", "X?"]
+
+
+class CachedFake(Instrument):
+    x = Instrument.control("X?", "X %d", "", cast=int, cache=True)
+    y = Instrument.control("Y?", "Y %d", "", cast=int)
+
+    def __init__(self):
+        super().__init__(CompoundAdapter(), "Fake", includeSCPI=False)
+
+
+def test_cache_disabled_by_default():
+    fake = CachedFake()
+    fake.x = 5
+    assert fake.x == 0
+    assert fake.adapter.messages == ["X 5", "X?"]
+
+
+def test_cache_writes_through():
+    fake = CachedFake()
+    fake.enable_cache()
+    fake.x = 5
+    assert fake.x == 5
+    fake.y = 1
+    assert fake.y == 0
+    assert fake.y == 0
+    assert fake.x == 5
+    assert fake.adapter.messages == ["X 5", "Y 1", "Y?", "Y?"]
+
+
+def test_cache_stores_read_values():
+    fake = CachedFake()
+    fake.enable_cache()
+    assert fake.x == 0
+    assert fake.x == 0
+    fake.invalidate("x")
+    assert fake.x == 0
+    assert fake.adapter.messages == ["X?", "X?"]
+
+
+def test_cache_invalidated_by_commands():
+    fake = CachedFake()
+    fake.enable_cache()
+    fake.x = 5
+    fake.reset()
+    assert fake.x == 0
+    fake.x = 5
+    fake.clear()
+    assert fake.x == 0
+    assert fake.adapter.messages == ["X 5", "*RST", "X?", "X 5", "*CLS", "X?"]
+
+
+def test_cache_expires():
+    fake = CachedFake()
+    fake.enable_cache(ttl=0.01)
+    fake.x = 5
+    assert fake.x == 5
+    time.sleep(0.02)
+    assert fake.x == 0
+
+
+def test_cache_in_batch():
+    fake = CachedFake()
+    fake.enable_cache()
+    fake.x = 5
+    with fake.batch():
+        x = fake.x
+        y = fake.y
+    assert x.result() == 5
+    assert y.result() == 0
+    assert fake.adapter.messages == ["X 5", "Y?"]
+
+
+def test_suppress_unchanged_writes():
+    class Fake(CachedFake):
+        z = Instrument.setting("Z %d", "", check_set_errors=True)
+
+    errors = []
+    fake = Fake()
+    fake.check_errors = lambda: errors.append(True)
+    fake.enable_cache(suppress_writes=True)
+    for i in range(3):
+        fake.x = 5
+        fake.y = 1
+        fake.z = 2
+    fake.y = 3
+    assert fake.adapter.messages == ["X 5", "Y 1", "Z 2", "Y 3"]
+    assert errors == [True]
+
+
+def test_suppressed_writes_after_invalidation():
+    fake = CachedFake()
+    fake.enable_cache(suppress_writes=True)
+    fake.y = 1
+    fake.invalidate("y")
+    fake.y = 1
+    fake.write("*RST")
+    fake.y = 1
+    with fake.force_writes():
+        fake.y = 1
+    fake.y = 1
+    assert fake.adapter.messages == ["Y 1"] * 2 + ["*RST"] + ["Y 1"] * 2
+
+
+def test_get_and_set_many():
+    class Fake(Instrument):
+        x = Instrument.control("X?", "X %d", "", cast=int)
+        y = Instrument.measurement("Y?", "", values=['A', 'B'], map_values=True)
+        z = Instrument.setting("Z %d", "")
+
+    fake = Fake(CompoundAdapter(), "Fake", includeSCPI=False)
+    fake.set_many({'x': 2, 'z': 3})
+    assert fake.get_many(['y', 'x']) == {'y': 'A', 'x': 1}
+    assert fake.adapter.messages == ["X 2;Z 3", "Y?;X?"]
+
+
+class ESRAdapter(CompoundAdapter):
+    """ Reports a command error in *ESR? after the commands that fail """
+
+    def __init__(self, failing):
+        super().__init__()
+        self.failing = failing
+
+    def write(self, command):
+        self.messages.append(command)
+        responses, esr = [], 0
+        for c in command.split(";"):
+            if c in self.failing:
+                esr = 32
+            elif c == "*ESR?":
+                responses.append(str(esr))
+                esr = 0
+        FakeAdapter.write(self, ";".join(responses))
+
+
+class CheckedFake(Instrument):
+    x = Instrument.control("X?", "X %d", "", cast=int, check_set_errors=True)
+
+    def __init__(self, adapter=None):
+        super().__init__(adapter or CompoundAdapter(), "Fake",
+                         includeSCPI=False)
+        self.errors = []
+
+    def check_errors(self):
+        self.errors.append(True)
+        return []
+
+
+def test_deferred_error_check():
+    fake = CheckedFake()
+    fake.error_check = 'deferred'
+    fake.x = 1
+    fake.x = 2
+    assert fake.errors == []
+    assert fake.check_pending_errors() == []
+    assert fake.errors == [True]
+    assert fake.check_pending_errors() is None
+    with fake.batch():
+        fake.x = 3
+    assert fake.errors == [True] * 2
+
+
+def test_error_check_every_n_properties():
+    fake = CheckedFake()
+    fake.error_check = 2
+    for value in range(5):
+        fake.x = value
+    assert fake.errors == [True] * 2
+    assert fake.adapter.messages == ["X %d" % v for v in range(5)]
+
+
+def test_esr_error_check():
+    fake = CheckedFake(ESRAdapter(failing=["X 2"]))
+    fake.error_check = 'esr'
+    fake.x = 1
+    assert fake.errors == []
+    fake.x = 2
+    assert fake.errors == [True]
+    assert fake.adapter.messages == ["X 1;*ESR?", "X 2;*ESR?"]
+
+
+def test_esr_error_check_in_batch():
+    fake = CheckedFake(ESRAdapter(failing=["X 2"]))
+    fake.error_check = 'esr'
+    with fake.batch():
+        fake.x = 1
+        fake.x = 2
+        fake.x = 3
+    assert fake.adapter.messages == ["X 1;*ESR?;X 2;*ESR?;X 3;*ESR?"]
+    assert fake.errors == [True]
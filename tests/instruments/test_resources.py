@@ -0,0 +1,136 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import time
+
+import pymeasure.adapters.visa
+from pymeasure.instruments.resources import (discover_resources,
+                                             list_resources, ResourceInventory)
+
+
+class FakeResource(object):
+    def __init__(self, manager, name):
+        self.manager = manager
+        self.name = name
+        self.timeout = None
+
+    def query(self, command):
+        delay, idn = self.manager.devices[self.name]
+        time.sleep(delay)
+        if idn is None:
+            raise IOError("Timeout expired")
+        return idn + "\n"
+
+    def close(self):
+        pass
+
+
+class FakeManager(object):
+    """ Resource manager with devices given as a delay and an
+    identification, which is None for a device that does not respond """
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.opened = []
+
+    def list_resources(self):
+        return tuple(self.devices)
+
+    def open_resource(self, name, open_timeout=None):
+        if name not in self.devices:
+            raise IOError("Resource not found")
+        self.opened.append(name)
+        return FakeResource(self, name)
+
+
+def test_discover_resources():
+    manager = FakeManager({
+        "GPIB0::1::INSTR": (0, "KEITHLEY,MODEL 2000"),
+        "GPIB0::2::INSTR": (0, None),
+        "GPIB0::3::INSTR": (0, "SRS,SR830"),
+    })
+    records = discover_resources(manager=manager)
+    assert [r.resource for r in records] == list(manager.devices)
+    assert records[0].idn == "KEITHLEY,MODEL 2000"
+    assert records[0].ok and records[0].latency >= 0
+    assert not records[1].ok
+    assert "Timeout" in records[1].error
+
+
+def test_list_resources(monkeypatch, capsys):
+    manager = FakeManager({
+        "GPIB0::1::INSTR": (0, "KEITHLEY,MODEL 2000"),
+        "GPIB0::2::INSTR": (0, None),
+    })
+    resources = ("GPIB0::1::INSTR", "GPIB0::2::INSTR", "GPIB0::4::INSTR")
+    manager.list_resources = lambda: resources
+    monkeypatch.setattr(pymeasure.adapters.visa, 'get_resource_manager',
+                        lambda visa_library='': manager)
+    assert list_resources() == resources
+    lines = capsys.readouterr()[0].splitlines()
+    assert lines[0] == "0 : GPIB0::1::INSTR : KEITHLEY,MODEL 2000"
+    assert lines[1] == "1 : GPIB0::2::INSTR : Not known"
+    assert lines[2] == "2 : GPIB0::4::INSTR : Visa IO Error: check connections"
+    assert "Resource not found" in lines[3]
+
+
+def test_discover_resources_is_concurrent():
+    manager = FakeManager({"GPIB0::%d::INSTR" % i: (0.2, "DEV")
+                           for i in range(10)})
+    start = time.perf_counter()
+    records = discover_resources(manager=manager)
+    assert time.perf_counter() - start < 1
+    assert all(r.ok for r in records)
+
+
+def test_inventory_persists(tmpdir):
+    filename = str(tmpdir.join("inventory.json"))
+    manager = FakeManager({
+        "GPIB0::1::INSTR": (0, "KEITHLEY,MODEL 2000"),
+        "GPIB0::3::INSTR": (0, "SRS,SR830"),
+    })
+    inventory = ResourceInventory(filename, manager=manager)
+    assert inventory.find("sr830")[0].resource == "GPIB0::3::INSTR"
+    assert len(manager.opened) == 2
+
+    inventory = ResourceInventory(filename, manager=manager)
+    assert inventory.get("GPIB0::1::INSTR").idn == "KEITHLEY,MODEL 2000"
+    assert inventory.find("2000")[0].resource == "GPIB0::1::INSTR"
+    assert len(manager.opened) == 2
+
+
+def test_inventory_revalidates_lazily():
+    manager = FakeManager({
+        "GPIB0::1::INSTR": (0, "KEITHLEY,MODEL 2000"),
+        "GPIB0::3::INSTR": (0, "SRS,SR830"),
+    })
+    inventory = ResourceInventory(max_age=60, manager=manager)
+    inventory.scan()
+    inventory.records["GPIB0::1::INSTR"].timestamp -= 120
+    manager.devices["GPIB0::1::INSTR"] = (0, None)
+    assert inventory.find("SR830")
+    assert len(manager.opened) == 2
+    assert inventory.find("2000") == []
+    assert manager.opened[-1] == "GPIB0::1::INSTR"
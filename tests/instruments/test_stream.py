@@ -0,0 +1,168 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import asyncio
+import logging
+import time
+
+import numpy as np
+import pytest
+
+from pymeasure.instruments import Instrument
+from pymeasure.instruments.stream import RingBuffer, Stream
+
+
+class Counter(Instrument):
+    """ Returns increasing values, and fails after a number of reads """
+
+    def __init__(self, fail_after=None):
+        super().__init__(None, "Counter", includeSCPI=False)
+        self.value = 0
+        self.fail_after = fail_after
+
+    @property
+    def voltage(self):
+        if self.value == self.fail_after:
+            raise IOError("Read failed")
+        self.value += 1
+        return self.value
+
+
+class BlockSource(object):
+    """ Returns samples in blocks, as an instrument buffer would """
+
+    def __init__(self):
+        self.started = self.stopped = False
+
+    def start(self):
+        self.started = True
+
+    def fetch(self, stopped):
+        stopped.wait(0.001)
+        return np.ones((4, 2))
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(4)
+    assert buffer.write([1, 2, 3]) == 0
+    assert list(buffer.read(2)) == [1, 2]
+    assert buffer.write([4, 5, 6, 7]) == 1
+    assert buffer.overflows == 1
+    assert list(buffer.read()) == [4, 5, 6, 7]
+    assert buffer.write(range(10)) == 6
+    assert list(buffer.read()) == [6, 7, 8, 9]
+    assert len(buffer) == 0
+
+
+def test_stream_chunks():
+    counter = Counter()
+    chunks = list(counter.stream('voltage', chunk=10, count=25))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert list(np.concatenate(chunks)) == list(range(1, 26))
+    assert counter.value == 25
+
+
+def test_stream_rate():
+    start = time.perf_counter()
+    chunks = list(Counter().stream('voltage', rate=200, chunk=5, count=10))
+    assert time.perf_counter() - start >= 9 / 200
+    assert len(chunks) == 2
+
+
+class WarningCounter(logging.Handler):
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def test_stream_overflow():
+    warnings = WarningCounter()
+    logger = logging.getLogger('pymeasure.instruments.stream')
+    logger.addHandler(warnings)
+    try:
+        stream = Counter().stream('voltage', chunk=5, size=5, count=50)
+        stream._thread.join()
+    finally:
+        logger.removeHandler(warnings)
+    assert list(stream.read()) == [46, 47, 48, 49, 50]
+    assert stream.overflows == 45
+    assert stream.read() is None
+    # The overflow is only warned about when it starts
+    assert warnings.count == 1
+
+
+def test_stream_stop():
+    stream = Counter().stream('voltage', rate=1000, chunk=1000)
+    with pytest.raises(TimeoutError):
+        stream.read(timeout=0.01)
+    stream.stop()
+    assert not stream.running
+    remaining = stream.read()
+    assert 0 < len(remaining) < 1000
+    assert stream.read() is None
+
+
+def test_stream_error():
+    stream = Counter(fail_after=3).stream('voltage', chunk=2)
+    assert list(stream.read()) == [1, 2]
+    assert list(stream.read()) == [3]
+    with pytest.raises(IOError):
+        stream.read()
+
+
+def test_async_stream():
+    async def collect(stream):
+        # Asynchronous comprehensions require Python 3.6
+        chunks = []
+        iterator = stream.__aiter__()
+        while True:
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                return chunks
+            chunks.append(chunk)
+
+    stream = Counter().stream('voltage', chunk=4, count=8)
+    loop = asyncio.new_event_loop()
+    try:
+        chunks = loop.run_until_complete(collect(stream))
+    finally:
+        loop.close()
+    assert [list(chunk) for chunk in chunks] == [[1, 2, 3, 4], [5, 6, 7, 8]]
+
+
+def test_stream_source():
+    source = BlockSource()
+    with Stream(source, chunk=6) as stream:
+        chunk = stream.read()
+    assert chunk.shape == (6, 2)
+    assert source.started and source.stopped
@@ -22,12 +22,13 @@
 # THE SOFTWARE.
 #
 
+import numpy as np
 import pytest
 from pymeasure.instruments.validators import (
     strict_range, strict_discrete_set,
     truncated_range, truncated_discrete_set,
     modular_range, modular_range_bidirectional,
-    joined_validators
+    joined_validators, prepare_validator
 )
 
 
@@ -87,3 +88,40 @@ def test_joined_validators():
         tst_validator("OUT", [["ON", "OFF"], range(10)])
     with pytest.raises(ValueError) as e_info:
         tst_validator(20, [["ON", "OFF"], range(10)])
+
+
+@pytest.mark.parametrize("validator,values,tests", [
+    (strict_range, range(10), [5, 5.1, 20, -1]),
+    (truncated_range, [0, 9], [5, 5.1, 20, -10]),
+    (strict_discrete_set, range(10), [5, 5.0, 5.1, 20, "A"]),
+    (strict_discrete_set, ["ON", "OFF"], ["ON", "On", [1]]),
+    (strict_discrete_set, np.arange(0, 1.05, 0.1), [0.1, 0.15]),
+    (truncated_discrete_set, range(10), [5, 5.1, 11, -10]),
+    (truncated_discrete_set, np.arange(0, 65.1, 0.1), [12.34, 100, -1]),
+    (modular_range, range(10), [5, 11.3, -7.1]),
+    (modular_range_bidirectional, range(10), [11, -7.1, -13.2]),
+])
+def test_prepared_validators(validator, values, tests):
+    prepared = prepare_validator(validator, values)
+    for value in tests:
+        try:
+            expected = validator(value, values)
+        except ValueError:
+            with pytest.raises(ValueError):
+                prepared(value)
+        else:
+            assert prepared(value) == pytest.approx(expected)
+
+
+def test_prepared_joined_validators():
+    tst_validator = joined_validators(strict_discrete_set, strict_range)
+    prepared = prepare_validator(tst_validator, [["ON", "OFF"], range(10)])
+    assert prepared(5.1) == 5.1
+    assert prepared("ON") == "ON"
+    with pytest.raises(ValueError):
+        prepared("OUT")
+
+
+def test_prepare_without_support():
+    prepared = prepare_validator(lambda value, values: values[value], "abc")
+    assert prepared(1) == "b"
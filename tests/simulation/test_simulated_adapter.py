@@ -0,0 +1,83 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import numpy as np
+import pytest
+
+from pymeasure.instruments.keithley import Keithley2000
+from pymeasure.simulation import SimulatedAdapter, VirtualClock, keithley2000
+
+
+def test_responses_by_pattern():
+    adapter = SimulatedAdapter({
+        r"VOLT (.*)": None,
+        r"READ\?": "1.5",
+        r"ECHO (.*)": lambda match: match.group(1),
+        r"TRACE\?": np.arange(4),
+        r"BLOCK\?": b"#18" + np.arange(2, dtype='<f4').tobytes() + b"\n",
+        r"BAD\?": ValueError("Bad response"),
+    })
+    adapter.write("VOLT 1")
+    assert adapter.ask("READ?") == "1.5"
+    assert adapter.ask("ECHO abc") == "abc"
+    assert adapter.values("TRACE?") == [0, 1, 2, 3]
+    assert np.array_equal(adapter.binary_values("TRACE?", dtype=np.float64),
+                          np.arange(4))
+    assert np.array_equal(
+        adapter.binary_values("BLOCK?", ieee_header=True, is_big_endian=False),
+        [0, 1])
+    with pytest.raises(ValueError):
+        adapter.ask("BAD?")
+    with pytest.raises(TimeoutError):
+        adapter.ask("UNKNOWN?")
+    assert adapter.commands[0] == "VOLT 1"
+
+
+def test_virtual_clock_latency():
+    clock = VirtualClock()
+    adapter = SimulatedAdapter(lambda command: command, latency=0.1,
+                               jitter=0.01, clock=clock, seed=1)
+    for i in range(100):
+        assert adapter.ask(str(i)) == str(i)
+    assert clock.time() == pytest.approx(20, rel=0.02)
+
+
+def test_model_responses():
+    clock = VirtualClock()
+    model = keithley2000(latency=0.05)
+    model.state['reading'] = "2.5"
+    meter = Keithley2000(SimulatedAdapter(model, clock=clock))
+    assert meter.voltage == 2.5
+    assert clock.time() == pytest.approx(0.05)
+
+
+def test_sr830_get_many_uses_snap():
+    from pymeasure.instruments.srs import SR830
+    from pymeasure.simulation import sr830
+    adapter = SimulatedAdapter(sr830())
+    lockin = SR830(adapter)
+    values = lockin.get_many(['x', 'y', 'magnitude'])
+    assert values == {'x': 1e-3, 'y': 0, 'magnitude': 1e-3}
+    assert adapter.commands == ["SNAP?1,2,3"]
+    assert lockin.get_many(['x', 'phase']) == {'x': 1e-3, 'phase': 0}
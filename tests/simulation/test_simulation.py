@@ -0,0 +1,95 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import os
+
+import pytest
+
+from pymeasure.adapters import SocketAdapter
+from pymeasure.instruments.keithley import Keithley2400
+from pymeasure.instruments.srs import SR830
+from pymeasure.simulation import (Model, Rule, setting, PrologixController,
+                                  SocketServer, SerialServer, keithley2000,
+                                  keithley2400, sr830)
+
+
+def test_model_rules_and_state():
+    model = Model([Rule(r"READ\?", "{reading}"),
+                   *setting("SOUR:VOLT?", "SOUR:VOLT:LEV", "voltage")],
+                  state={'reading': "1.5", 'voltage': "0"}, latency=0.01)
+    assert model.handle(":SOUR:VOLT:LEV 2;:SOUR:VOLT?;READ?") == ("2;1.5", 0.03)
+    assert model.handle("*RST") == (None, 0.01)
+    assert model.handle("sour:volt?")[0] == "0"
+    assert model.handle("UNKNOWN?")[0] is None
+    assert model.handle("SYST:ERR?")[0] == '-113,"Undefined header"'
+    assert model.handle("SYST:ERR?")[0] == '0,"No error"'
+
+
+def test_prologix_controller():
+    controller = PrologixController({5: keithley2000(), 22: sr830()})
+    assert controller.handle("++addr 5") == (None, 0.)
+    assert controller.handle("*IDN?") == (None, 0.)
+    assert controller.handle("++read eoi")[0].startswith("KEITHLEY")
+    controller.handle("++addr 22")
+    controller.handle("SLVL?")
+    assert controller.handle("++read eoi")[0] == "1.000"
+    assert controller.handle("++read eoi")[0] is None
+
+
+def test_socket_server():
+    with SocketServer(keithley2400()) as server:
+        sourcemeter = Keithley2400(SocketAdapter(server.host, server.port))
+        sourcemeter.source_mode = 'voltage'
+        sourcemeter.source_voltage = 2
+        sourcemeter.enable_source()
+        assert sourcemeter.source_voltage == 2
+        assert sourcemeter.values(":READ?")[:2] == [2, 2e-3]
+        sourcemeter.adapter.close()
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="Requires a pseudo terminal")
+def test_serial_server_with_prologix():
+    from pymeasure.adapters import PrologixAdapter
+    with SerialServer(PrologixController({8: sr830()})) as server:
+        adapter = PrologixAdapter(server.port, serial_timeout=2,
+                                  read_termination="\n")
+        lockin = SR830(adapter.gpib(8))
+        lockin.sine_voltage = 0.5
+        assert lockin.sine_voltage == 0.5
+        assert lockin.x == pytest.approx(1e-3)
+        adapter.connection.close()
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="Requires a pseudo terminal")
+def test_prologix_wait_for_event():
+    from pymeasure.adapters import PrologixAdapter
+    model = keithley2000()
+    with SerialServer(PrologixController({16: model})) as server:
+        adapter = PrologixAdapter(server.port, 16, serial_timeout=2,
+                                  read_termination="\n")
+        with pytest.raises(TimeoutError):
+            adapter.wait_for_event(1, timeout=0.05)
+        model.state['status_byte'] = "65"
+        assert adapter.wait_for_event(1, timeout=1) == 65
+        adapter.connection.close()
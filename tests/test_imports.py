@@ -0,0 +1,80 @@
+#
+# This file is part of the PyMeasure package.
+#
+# Copyright (c) 2013-2019 PyMeasure Developers
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+
+import subprocess
+import sys
+
+import pytest
+
+
+def loaded_modules(statement):
+    """ Returns the modules that are loaded by a statement in a fresh
+    interpreter """
+    code = "import sys; %s; print(' '.join(sys.modules))" % statement
+    output = subprocess.check_output([sys.executable, "-c", code])
+    return set(output.decode().split())
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires module __getattr__")
+def test_instrument_import_is_lazy():
+    modules = loaded_modules("import pymeasure.instruments.keithley")
+    assert 'pymeasure.instruments.keithley.keithley2000' in modules
+    for name in ('pymeasure.instruments.srs', 'pymeasure.adapters.visa',
+                 'pymeasure.adapters.serial', 'pandas', 'asyncio'):
+        assert name not in modules
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires module __getattr__")
+def test_adapter_import_is_lazy():
+    modules = loaded_modules("import pymeasure.adapters")
+    assert 'pymeasure.adapters.socket' not in modules
+    assert 'pymeasure.adapters.aio' not in modules
+
+
+def test_attributes_are_loaded_on_demand():
+    import pymeasure.adapters
+    import pymeasure.instruments
+    from pymeasure.adapters.socket import SocketAdapter
+    from pymeasure.instruments.srs import SR830
+    assert pymeasure.adapters.SocketAdapter is SocketAdapter
+    assert pymeasure.instruments.srs.SR830 is SR830
+    assert 'SocketAdapter' in dir(pymeasure.adapters)
+    assert 'srs' in dir(pymeasure.instruments)
+    with pytest.raises(AttributeError):
+        pymeasure.adapters.MissingAdapter
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires module __getattr__")
+def test_missing_backend_is_attribute_error(monkeypatch):
+    import pymeasure.adapters
+    monkeypatch.setitem(pymeasure.adapters._modules, 'MissingAdapter',
+                        '.missing_backend')
+    assert not hasattr(pymeasure.adapters, 'MissingAdapter')
+    assert getattr(pymeasure.adapters, 'MissingAdapter', None) is None
+    with pytest.raises(AttributeError) as info:
+        pymeasure.adapters.MissingAdapter
+    assert isinstance(info.value.__cause__, ImportError)
+    with pytest.raises(ImportError):
+        from pymeasure.adapters import MissingAdapter